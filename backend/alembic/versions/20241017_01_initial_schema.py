@@ -3,6 +3,13 @@
 Revision ID: 20241017_01
 Revises: None
 Create Date: 2024-10-17 00:00:00.000000
+
+The enum types are declared with ``create_type=False`` and created explicitly
+at the start of :func:`upgrade`. This revision was edited after release:
+as first shipped, ``op.create_table`` created each type a second time, so the
+upgrade failed with ``DuplicateObject`` and PostgreSQL rolled it back. No
+database can have applied the original version, and a later revision could
+not repair a fresh install, so the fix had to go here.
 """
 
 from __future__ import annotations
@@ -18,19 +25,34 @@ branch_labels = None
 depends_on = None
 
 resume_upload_status_enum = postgresql.ENUM(
-    "pending", "processing", "completed", "failed", name="resume_upload_status"
+    "pending",
+    "processing",
+    "completed",
+    "failed",
+    name="resume_upload_status",
+    create_type=False,
 )
 resume_analysis_type_enum = postgresql.ENUM(
-    "single", "comparison", name="resume_analysis_type"
+    "single", "comparison", name="resume_analysis_type", create_type=False
 )
 resume_analysis_status_enum = postgresql.ENUM(
-    "pending", "running", "completed", "failed", name="resume_analysis_status"
+    "pending",
+    "running",
+    "completed",
+    "failed",
+    name="resume_analysis_status",
+    create_type=False,
 )
 feedback_severity_enum = postgresql.ENUM(
-    "low", "medium", "high", "critical", name="feedback_severity"
+    "low", "medium", "high", "critical", name="feedback_severity", create_type=False
 )
 comparison_batch_status_enum = postgresql.ENUM(
-    "pending", "processing", "completed", "failed", name="comparison_batch_status"
+    "pending",
+    "processing",
+    "completed",
+    "failed",
+    name="comparison_batch_status",
+    create_type=False,
 )
 
 
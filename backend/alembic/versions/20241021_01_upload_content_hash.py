@@ -0,0 +1,36 @@
+"""Add content hashes to resume uploads.
+
+Revision ID: 20241021_01
+Revises: 20241017_01
+Create Date: 2024-10-21 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20241021_01"
+down_revision = "20241017_01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "resume_uploads",
+        sa.Column("content_sha256", sa.String(length=64), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_resume_uploads_content_sha256"),
+        "resume_uploads",
+        ["content_sha256"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_resume_uploads_content_sha256"), table_name="resume_uploads")
+    op.drop_column("resume_uploads", "content_sha256")
@@ -0,0 +1,133 @@
+"""Add composite and partial indexes for hot query paths.
+
+Revision ID: 20241022_01
+Revises: 20241021_01
+Create Date: 2024-10-22 00:00:00.000000
+
+Listing pages read a user's newest rows with
+``WHERE user_id = :user ORDER BY created_at DESC, id DESC LIMIT n``, and
+workers poll for rows that have not finished yet. The composite indexes serve
+the first without a sort, and make the single-column ``user_id`` indexes
+redundant. The partial indexes only contain non-terminal rows, so they stay
+small however many finished rows accumulate. They are keyed on ``created_at``
+alone so polling for one status or for several returns rows oldest-first
+without a sort.
+
+Indexes are built with ``CREATE INDEX CONCURRENTLY`` so large tables stay
+writable during the migration.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20241022_01"
+down_revision = "20241021_01"
+branch_labels = None
+depends_on = None
+
+USER_LISTING_TABLES = ("resume_uploads", "resume_analyses", "comparison_batches")
+
+# (index name, table, status column, non-terminal statuses)
+ACTIVE_STATUS_INDEXES = (
+    (
+        "ix_resume_uploads_active_status",
+        "resume_uploads",
+        "upload_status",
+        ("pending", "processing"),
+    ),
+    (
+        "ix_resume_analyses_active_status",
+        "resume_analyses",
+        "status",
+        ("pending", "running"),
+    ),
+    (
+        "ix_comparison_batches_active_status",
+        "comparison_batches",
+        "status",
+        ("pending", "processing"),
+    ),
+)
+
+
+def _status_predicate(column: str, statuses: tuple[str, ...]) -> sa.TextClause:
+    values = ", ".join(f"'{status}'" for status in statuses)
+    return sa.text(f"{column} IN ({values})")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in USER_LISTING_TABLES:
+            op.create_index(
+                f"ix_{table}_user_id_created_at",
+                table,
+                ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+                unique=False,
+                postgresql_concurrently=True,
+            )
+        for name, table, column, statuses in ACTIVE_STATUS_INDEXES:
+            op.create_index(
+                name,
+                table,
+                ["created_at"],
+                unique=False,
+                postgresql_where=_status_predicate(column, statuses),
+                postgresql_concurrently=True,
+            )
+        op.create_index(
+            "ix_batch_members_batch_id_position",
+            "batch_members",
+            ["batch_id", "position"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+        # Leading columns of the composite indexes above.
+        for table in USER_LISTING_TABLES:
+            op.drop_index(
+                op.f(f"ix_{table}_user_id"),
+                table_name=table,
+                postgresql_concurrently=True,
+            )
+        op.drop_index(
+            op.f("ix_batch_members_batch_id"),
+            table_name="batch_members",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_batch_members_batch_id"),
+            "batch_members",
+            ["batch_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        for table in USER_LISTING_TABLES:
+            op.create_index(
+                op.f(f"ix_{table}_user_id"),
+                table,
+                ["user_id"],
+                unique=False,
+                postgresql_concurrently=True,
+            )
+
+        op.drop_index(
+            "ix_batch_members_batch_id_position",
+            table_name="batch_members",
+            postgresql_concurrently=True,
+        )
+        for name, table, _, _ in ACTIVE_STATUS_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+        for table in USER_LISTING_TABLES:
+            op.drop_index(
+                f"ix_{table}_user_id_created_at",
+                table_name=table,
+                postgresql_concurrently=True,
+            )
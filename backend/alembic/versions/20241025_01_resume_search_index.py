@@ -0,0 +1,97 @@
+"""Add the inverted index used to search resumes by job description.
+
+Revision ID: 20241025_01
+Revises: 20241022_01
+Create Date: 2024-10-25 00:00:00.000000
+
+Existing uploads are not indexed here because their text lives in the text
+store; queue ``tasks.rebuild_search_index`` once after upgrading.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20241025_01"
+down_revision = "20241022_01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "search_documents",
+        sa.Column(
+            "resume_upload_id",
+            postgresql.UUID(as_uuid=True),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("content_sha256", sa.String(length=64), nullable=False),
+        sa.Column("taxonomy_fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("term_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            server_onupdate=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["resume_upload_id"],
+            ["resume_uploads.id"],
+            ondelete="CASCADE",
+            name="fk_search_documents_resume_upload_id",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            ondelete="CASCADE",
+            name="fk_search_documents_user_id",
+        ),
+    )
+    op.create_index(
+        op.f("ix_search_documents_user_id"),
+        "search_documents",
+        ["user_id"],
+        unique=False,
+    )
+
+    op.create_table(
+        "search_postings",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("term", sa.String(length=128), nullable=False),
+        sa.Column("resume_upload_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("term_frequency", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "term", "resume_upload_id"),
+        sa.ForeignKeyConstraint(
+            ["resume_upload_id"],
+            ["search_documents.resume_upload_id"],
+            ondelete="CASCADE",
+            name="fk_search_postings_resume_upload_id",
+        ),
+    )
+    op.create_index(
+        "ix_search_postings_resume_upload_id",
+        "search_postings",
+        ["resume_upload_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_search_postings_resume_upload_id", table_name="search_postings")
+    op.drop_table("search_postings")
+    op.drop_index(op.f("ix_search_documents_user_id"), table_name="search_documents")
+    op.drop_table("search_documents")
@@ -0,0 +1,5 @@
+"""Resume analysis building blocks shared by the API and background workers."""
+
+from .matcher import KeywordMatcher, tokenize
+
+__all__ = ["KeywordMatcher", "tokenize"]
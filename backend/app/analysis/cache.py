@@ -0,0 +1,296 @@
+"""Content-addressed cache for resume analysis results.
+
+Results are keyed by a SHA-256 over the analysed text and job description in
+:func:`normalize_text` form, the scoring fingerprint and the skill taxonomy
+fingerprint, so resubmitting a resume with different spacing or line endings
+hits the same entry. Every analysis entry point analyses that normal form
+whether or not the cache is enabled, so turning the cache on or off never
+changes a result. A change to the scoring or the taxonomy produces new keys,
+so stale results are never served after a taxonomy reload or a scoring
+change; they simply age out.
+
+Two tiers are consulted in order: a bounded in-process LRU and, when
+enabled, Redis (``settings.redis_url``) shared by every API pod. Redis errors
+never fail a request; the tier is skipped for a short back-off period instead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import redis
+from loguru import logger
+
+from app.analysis.pipeline import (
+    MAX_RESUME_CHARS,
+    SCORING_FINGERPRINT,
+    analyze_text,
+    analyze_texts,
+)
+from app.analysis.taxonomy import get_taxonomy
+from app.core.config import settings
+from app.schemas.analysis import ResumeAnalyzeResponse
+
+KEY_PREFIX = "pathwise:analysis:"
+
+# Seconds to stop talking to Redis after a connection or timeout error.
+REDIS_BACKOFF_SECONDS = 30.0
+
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+# Without the entity and embedding stages every signal is read from the
+# lowercased text, so keys can ignore case as well.
+CASE_INSENSITIVE = not (
+    settings.entity_extraction_enabled or settings.semantic_scoring_enabled
+)
+
+
+def normalize_text(text: str) -> str:
+    """Return ``text`` with its spacing in a canonical form.
+
+    Line endings become ``\\n``, each line is stripped and its inner whitespace
+    runs become one space, and runs of blank lines become one blank line.
+    """
+
+    lines = "\n".join(" ".join(line.split()) for line in text.splitlines())
+    return BLANK_LINES_RE.sub("\n\n", lines).strip("\n")
+
+
+def normalize_job_description(job_description: Optional[str]) -> Optional[str]:
+    """:func:`normalize_text` for an optional job description."""
+
+    return normalize_text(job_description) if job_description else job_description
+
+
+def cache_key(
+    text: str, job_description: Optional[str], taxonomy_fingerprint: str
+) -> str:
+    """Return the cache key for analysing ``text`` against a job description.
+
+    Both texts are hashed in :func:`normalize_text` form (and lowercased when
+    scoring ignores case), so callers must analyse the normalised text too,
+    with the cache enabled or not.
+    """
+
+    text = normalize_text(text)
+    # Only the analysed prefix matters, plus whether anything was cut off.
+    truncated = len(text) > MAX_RESUME_CHARS
+    text = text[:MAX_RESUME_CHARS]
+    job_description = normalize_text(job_description or "")
+    if CASE_INSENSITIVE:
+        text = text.lower()
+        job_description = job_description.lower()
+
+    digest = hashlib.sha256()
+    digest.update(SCORING_FINGERPRINT.encode())
+    digest.update(b"\0")
+    digest.update(taxonomy_fingerprint.encode())
+    digest.update(b"\0")
+    digest.update(str(truncated).encode())
+    digest.update(text.encode("utf-8", "surrogatepass"))
+    digest.update(b"\0")
+    digest.update(job_description.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Hit/miss counters for the cache tiers."""
+
+    memory_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    redis_errors: int = 0
+
+
+class AnalysisCache:
+    """Two-tier (LRU + optional Redis) cache of analysis responses."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        redis_url: Optional[str] = None,
+        ttl_seconds: int = 86_400,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, ResumeAnalyzeResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_url = redis_url
+        self._redis_retry_at = 0.0
+        self._generation: Optional[str] = None
+
+    # -- Redis tier -----------------------------------------------------------
+
+    def _client(self):
+        if not self._redis_url or time.monotonic() < self._redis_retry_at:
+            return None
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(
+                self._redis_url, socket_timeout=0.1, socket_connect_timeout=0.1
+            )
+        return self._redis
+
+    def _redis_failed(self, exc: Exception) -> None:
+        self.stats.redis_errors += 1
+        self._redis_retry_at = time.monotonic() + REDIS_BACKOFF_SECONDS
+        logger.warning("Analysis cache Redis tier unavailable: {}", exc)
+
+    # -- LRU tier -------------------------------------------------------------
+
+    def _remember(self, key: str, value: ResumeAnalyzeResponse) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def _recall(self, key: str) -> Optional[ResumeAnalyzeResponse]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    # -- Public API -----------------------------------------------------------
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, ResumeAnalyzeResponse]:
+        """Return cached responses for whichever ``keys`` are present."""
+
+        found: Dict[str, ResumeAnalyzeResponse] = {}
+        remote: List[str] = []
+        for key in keys:
+            value = self._recall(key)
+            if value is None:
+                remote.append(key)
+            else:
+                found[key] = value
+                self.stats.memory_hits += 1
+
+        client = self._client() if remote else None
+        if client is not None:
+            try:
+                payloads = client.mget([KEY_PREFIX + key for key in remote])
+            except Exception as exc:  # redis.RedisError, OSError, ...
+                self._redis_failed(exc)
+                payloads = [None] * len(remote)
+            for key, payload in zip(remote, payloads, strict=True):
+                if payload is None:
+                    continue
+                value = ResumeAnalyzeResponse.model_validate_json(payload)
+                self._remember(key, value)
+                found[key] = value
+                self.stats.redis_hits += 1
+
+        self.stats.misses += sum(1 for key in remote if key not in found)
+        return found
+
+    def get(self, key: str) -> Optional[ResumeAnalyzeResponse]:
+        """Return the cached response for ``key`` if any."""
+
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value: ResumeAnalyzeResponse) -> None:
+        """Store ``value`` in every enabled tier."""
+
+        self._remember(key, value)
+        client = self._client()
+        if client is not None:
+            try:
+                client.set(
+                    KEY_PREFIX + key, value.model_dump_json(), ex=self.ttl_seconds
+                )
+            except Exception as exc:  # redis.RedisError, OSError, ...
+                self._redis_failed(exc)
+
+    def ensure_generation(self, generation: str) -> None:
+        """Drop in-process entries once the scoring/taxonomy generation moves.
+
+        Old entries can no longer be hit after a change because their keys
+        embed the previous fingerprints; this only frees the memory early.
+        """
+
+        if generation != self._generation:
+            with self._lock:
+                if generation != self._generation:
+                    self._entries.clear()
+                    self._generation = generation
+
+    def clear(self) -> None:
+        """Drop every in-process entry (Redis entries expire on their own)."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return counters plus the current LRU size."""
+
+        with self._lock:
+            size = len(self._entries)
+        return {**asdict(self.stats), "memory_entries": size}
+
+
+analysis_cache = AnalysisCache(
+    max_entries=settings.analysis_cache_max_entries,
+    redis_url=settings.redis_url if settings.analysis_cache_redis_enabled else None,
+    ttl_seconds=settings.analysis_cache_ttl_seconds,
+)
+
+
+def analyze_text_cached(
+    text: str, job_description: Optional[str] = None
+) -> ResumeAnalyzeResponse:
+    """Cached variant of :func:`app.analysis.pipeline.analyze_text`."""
+
+    taxonomy = get_taxonomy()
+    text = normalize_text(text)
+    job_description = normalize_job_description(job_description)
+    if not settings.analysis_cache_enabled:
+        return analyze_text(text, job_description, taxonomy=taxonomy)
+    key = cache_key(text, job_description, taxonomy.fingerprint)
+    analysis_cache.ensure_generation(f"{SCORING_FINGERPRINT}/{taxonomy.fingerprint}")
+    result = analysis_cache.get(key)
+    if result is None:
+        result = analyze_text(text, job_description, taxonomy=taxonomy)
+        analysis_cache.set(key, result)
+    return result
+
+
+def analyze_texts_cached(
+    items: Sequence[Tuple[str, Optional[str]]],
+) -> List[ResumeAnalyzeResponse]:
+    """Cached variant of :func:`app.analysis.pipeline.analyze_texts`.
+
+    The cache is read with one lookup and the misses are analysed together,
+    so the entity stage still sees them as a single batch.
+    """
+
+    taxonomy = get_taxonomy()
+    items = [
+        (normalize_text(text), normalize_job_description(job_description))
+        for text, job_description in items
+    ]
+    if not settings.analysis_cache_enabled:
+        return analyze_texts(items, taxonomy=taxonomy)
+    analysis_cache.ensure_generation(f"{SCORING_FINGERPRINT}/{taxonomy.fingerprint}")
+    keys = [
+        cache_key(text, job_description, taxonomy.fingerprint)
+        for text, job_description in items
+    ]
+    found = analysis_cache.get_many(keys)
+    missing = [index for index, key in enumerate(keys) if key not in found]
+    computed = analyze_texts([items[index] for index in missing], taxonomy=taxonomy)
+    for index, result in zip(missing, computed, strict=True):
+        analysis_cache.set(keys[index], result)
+        found[keys[index]] = result
+    return [found[key] for key in keys]
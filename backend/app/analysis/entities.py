@@ -0,0 +1,259 @@
+"""Named-entity stage: employers, job titles and dated roles.
+
+The regex pipeline only sees sections and skills. This optional stage runs
+the spaCy pipeline from ``SPACY_MODEL`` to find organisations (``ORG``) and
+dates (``DATE``), parses date entities that form a range ("Jan 2019 -
+Present") into periods, and sums the union of those periods into years of
+experience. spaCy has no job-title label, so titles are picked from the same
+lines by a pattern on capitalised words ending in a role noun.
+
+Resumes are processed in batches through ``nlp.pipe`` with every component
+the recogniser does not depend on disabled. Only lines that mention a year,
+plus the lines just above them (where employer and title usually sit), are
+sent through the model; that is typically a small fraction of the resume and
+the main reason batch throughput stays high.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import re
+from contextvars import ContextVar
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.ml.registry import SPACY, model_registry
+from app.schemas.analysis import ExperiencePeriod, ExperienceSignals
+
+MONTHS_PER_YEAR = 12
+
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+# Lines above a dated line sent along with it.
+CONTEXT_LINES = 2
+
+MONTHS: Dict[str, int] = {
+    name: number
+    for number, name in enumerate(
+        "jan feb mar apr may jun jul aug sep oct nov dec".split(), start=1
+    )
+}
+POINT = (
+    rf"(?:(?:{'|'.join(MONTHS)})[a-z]*\.?,?\s*|\d{{1,2}}\s*[/.-]\s*)?(?:19|20)\d{{2}}"
+)
+POINT_RE = re.compile(
+    r"(?:(?P<month>[a-z]{3})[a-z]*\.?,?\s*|(?P<number>\d{1,2})\s*[/.-]\s*)?"
+    r"(?P<year>(?:19|20)\d{2})",
+    re.IGNORECASE,
+)
+ONGOING = ("present", "current", "now", "today", "date")
+RANGE_RE = re.compile(
+    rf"({POINT})\s*(?:-|\u2013|\u2014|to|until|through)\s*"
+    rf"({POINT}|{'|'.join(ONGOING)})\b",
+    re.IGNORECASE,
+)
+# Characters after a DATE entity searched for the rest of its range, which
+# the recogniser often leaves out ("- Present") or tags as a second entity.
+RANGE_LOOKAHEAD = 24
+
+TITLE_HEADS = (
+    "Accountant",
+    "Administrator",
+    "Analyst",
+    "Architect",
+    "Consultant",
+    "Coordinator",
+    "Designer",
+    "Developer",
+    "Director",
+    "Engineer",
+    "Intern",
+    "Lead",
+    "Manager",
+    "Officer",
+    "Programmer",
+    "Researcher",
+    "Scientist",
+    "Specialist",
+    "Technician",
+)
+TITLE_RE = re.compile(
+    rf"\b(?:[A-Z][\w/&+.-]*[ \t]+){{0,3}}(?:{'|'.join(TITLE_HEADS)})s?\b"
+)
+
+# Upper bound on organisations and titles reported per resume.
+MAX_ENTITIES = 20
+
+# Set in analysis executor workers. Their processes are not daemonic, but
+# each starting a spaCy process pool of its own would oversubscribe the host.
+_single_process: ContextVar[bool] = ContextVar("entities_single_process", default=False)
+
+
+def use_single_process() -> None:
+    """Keep :func:`extract_entities` in the current process from now on."""
+
+    _single_process.set(True)
+
+
+def dated_lines(text: str) -> str:
+    """The lines of ``text`` that mention a year, with the lines above them."""
+
+    lines = text.splitlines()
+    keep = set()
+    for index, line in enumerate(lines):
+        if YEAR_RE.search(line):
+            keep.update(range(max(0, index - CONTEXT_LINES), index + 1))
+    return "\n".join(lines[index] for index in sorted(keep) if lines[index].strip())
+
+
+def _month_index(point: str, *, end: bool) -> Optional[int]:
+    """Months since year 0 for a parsed point.
+
+    Ends are exclusive and include the whole month or, for a year without a
+    month, the whole year, so "2021 - 2021" is twelve months.
+    """
+
+    match = POINT_RE.search(point)
+    if match is None:
+        return None
+    year = int(match["year"]) * MONTHS_PER_YEAR
+    month = None
+    if match["month"]:
+        month = MONTHS.get(match["month"].lower())
+    elif match["number"]:
+        month = int(match["number"])
+    if month is None or not 1 <= month <= MONTHS_PER_YEAR:
+        return year + (MONTHS_PER_YEAR if end else 0)
+    return year + month - 1 + (1 if end else 0)
+
+
+def _format_month(index: int) -> str:
+    return f"{index // MONTHS_PER_YEAR:04d}-{index % MONTHS_PER_YEAR + 1:02d}"
+
+
+def parse_period(text: str, today: date) -> Optional[Tuple[int, int, ExperiencePeriod]]:
+    """Parse a date range into ``[start, end)`` month indices and a period."""
+
+    match = RANGE_RE.search(text)
+    if match is None:
+        return None
+    now = today.year * MONTHS_PER_YEAR + today.month
+    start = _month_index(match[1], end=False)
+    ongoing = match[2].lower() in ONGOING
+    end = now if ongoing else _month_index(match[2], end=True)
+    if start is None or end is None:
+        return None
+    end = min(end, now)
+    if end <= start:
+        return None
+    period = ExperiencePeriod(
+        text=match.group().strip(),
+        start=_format_month(start),
+        end=None if ongoing else _format_month(end - 1),
+    )
+    return start, end, period
+
+
+def experience_years(spans: Sequence[Tuple[int, int]]) -> float:
+    """Years covered by the union of ``[start, end)`` month spans."""
+
+    months = 0
+    current_start, current_end = None, None
+    for start, end in sorted(spans):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                months += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        months += current_end - current_start
+    return round(months / MONTHS_PER_YEAR, 1)
+
+
+def _unique(values: List[str]) -> List[str]:
+    seen = set()
+    unique: List[str] = []
+    for value in values:
+        key = value.casefold()
+        if key not in seen:
+            seen.add(key)
+            unique.append(value)
+    return unique[:MAX_ENTITIES]
+
+
+def signals_from_doc(doc: Any, today: date) -> ExperienceSignals:
+    """Build experience signals from a processed spaCy ``Doc``."""
+
+    text = doc.text
+    organizations: List[str] = []
+    spans: List[Tuple[int, int]] = []
+    periods: List[ExperiencePeriod] = []
+    covered_until = -1
+    for ent in doc.ents:
+        if ent.label_ == "ORG":
+            organizations.append(ent.text.strip())
+        elif ent.label_ == "DATE" and ent.start_char >= covered_until:
+            window = text[ent.start_char : ent.end_char + RANGE_LOOKAHEAD]
+            parsed = parse_period(window.split("\n", 1)[0], today)
+            if parsed is None:
+                continue
+            start, end, period = parsed
+            offset = window.find(period.text)
+            if offset >= len(ent.text):
+                # The range belongs to text after this entity.
+                continue
+            spans.append((start, end))
+            periods.append(period)
+            # A range split over two DATE entities is counted once.
+            covered_until = ent.start_char + offset + len(period.text)
+
+    return ExperienceSignals(
+        years=experience_years(spans),
+        organizations=_unique(organizations),
+        job_titles=_unique([match.group() for match in TITLE_RE.finditer(text)]),
+        periods=periods,
+    )
+
+
+def _disabled_pipes(nlp: Any) -> List[str]:
+    """Components the entity recogniser neither is nor listens to."""
+
+    needed = {"ner"}
+    for name, pipe in nlp.pipeline:
+        if "ner" in getattr(pipe, "listening_components", ()):
+            needed.add(name)
+    return [name for name in nlp.pipe_names if name not in needed]
+
+
+def extract_entities(
+    texts: Sequence[str], *, today: Optional[date] = None
+) -> List[ExperienceSignals]:
+    """Experience signals for each of ``texts``, in input order.
+
+    Texts go through ``nlp.pipe`` in batches of ``ENTITY_BATCH_SIZE``. With
+    ``ENTITY_N_PROCESS`` above one, batches larger than a single spaCy batch
+    are spread over that many processes. Daemonic processes (Celery prefork
+    children), which cannot start them, and analysis executor workers (see
+    :func:`use_single_process`) always use one.
+    """
+
+    if not texts:
+        return []
+    today = today or date.today()
+    nlp = model_registry.get(SPACY)
+    batch_size = settings.entity_batch_size
+    n_process = settings.entity_n_process
+    if (
+        len(texts) <= batch_size
+        or _single_process.get()
+        or multiprocessing.current_process().daemon
+    ):
+        n_process = 1
+    docs = nlp.pipe(
+        (dated_lines(text) for text in texts),
+        batch_size=batch_size,
+        n_process=n_process,
+        disable=_disabled_pipes(nlp),
+    )
+    return [signals_from_doc(doc, today) for doc in docs]
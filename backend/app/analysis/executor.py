@@ -0,0 +1,512 @@
+"""Execution backends for CPU-bound analysis work.
+
+Feature extraction and scoring are pure-Python regex and dictionary work that
+holds the GIL. Running it on FastAPI's shared AnyIO threadpool lets long
+analyses starve health checks and database routes, so analysis gets its own
+executor, selected with ``ANALYSIS_BACKEND``:
+
+``inline``
+    Run on the event loop. Only sensible for tests and local debugging.
+``thread``
+    A dedicated, bounded thread pool. Isolates analysis from other sync
+    routes but still shares one core because of the GIL.
+``process``
+    A pool of worker processes started (and warmed up) with the app, so
+    analysis scales across cores.
+
+Every backend enforces a queue-depth limit: once ``ANALYSIS_MAX_PENDING``
+analyses are queued or running, new work is rejected with
+:class:`ExecutorSaturatedError` (HTTP 429) instead of letting latency grow
+without bound. Work is handed to the pool only when a worker is free, so
+``ANALYSIS_TIMEOUT_SECONDS`` limits how long it runs, not how long it waited.
+Work that does not finish in time, or a crashed worker pool, surfaces as
+:class:`ExecutorUnavailableError` (HTTP 503). A timed-out job cannot be
+stopped, so it keeps its worker and its place in the queue until it ends.
+
+:func:`run_analysis` runs the whole pipeline as one piece of work.
+:func:`stream_analysis` dispatches its stages separately and yields each
+stage's metrics and feedback as soon as that stage is done.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import enum
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import aclosing
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from fastapi.concurrency import run_in_threadpool
+from loguru import logger
+
+from app.analysis.cache import (
+    analysis_cache,
+    cache_key,
+    normalize_job_description,
+    normalize_text,
+)
+from app.analysis.entities import use_single_process
+from app.analysis.pipeline import (
+    MAX_RESUME_CHARS,
+    SCORING_FINGERPRINT,
+    analyze_text,
+    experience_feedback,
+    resume_experience,
+    resume_semantic_match,
+    scan_resume,
+    score_features,
+    semantic_metric,
+)
+from app.analysis.taxonomy import get_taxonomy
+from app.analysis.timing import (
+    StageTimer,
+    active_timer,
+    call_timed,
+    record_stages,
+    stage,
+)
+from app.core.config import Settings, settings
+from app.ml.registry import model_registry
+from app.schemas.analysis import (
+    FeedbackItem,
+    Metric,
+    ResumeAnalyzeEvent,
+    ResumeAnalyzeResponse,
+)
+
+T = TypeVar("T")
+
+
+class AnalysisBackend(enum.StrEnum):
+    """Where analysis work is executed."""
+
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when the analysis queue is full."""
+
+
+class ExecutorUnavailableError(RuntimeError):
+    """Raised when analysis cannot complete (timeout or broken pool)."""
+
+
+def _warm_up_worker() -> Dict[str, Any]:
+    """Load the taxonomy and models in a fresh worker; report what it loaded.
+
+    Doing this up front keeps the load off the first requests.
+    """
+
+    get_taxonomy()
+    model_registry.warm_up()
+    return model_registry.snapshot()
+
+
+def _init_thread_worker() -> None:
+    use_single_process()
+
+
+def _init_process_worker() -> None:
+    use_single_process()
+    _warm_up_worker()
+
+
+@dataclass(slots=True)
+class ExecutorStats:
+    """Counters describing executor load."""
+
+    completed: int = 0
+    rejected: int = 0
+    timeouts: int = 0
+    failures: int = 0
+
+
+class AnalysisExecutor:
+    """Bounded executor running analysis on the configured backend."""
+
+    def __init__(
+        self,
+        backend: AnalysisBackend,
+        workers: int,
+        max_pending: int,
+        timeout: float,
+    ) -> None:
+        self.backend = backend
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.stats = ExecutorStats()
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        # One slot per worker, so the pool never queues work of its own.
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Model registry snapshots taken by the workers when warming up.
+        self.worker_models: Dict[int, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_settings(cls, config: Settings) -> "AnalysisExecutor":
+        return cls(
+            backend=AnalysisBackend(config.analysis_backend),
+            workers=config.analysis_workers or os.cpu_count() or 1,
+            max_pending=config.analysis_max_pending,
+            timeout=config.analysis_timeout_seconds,
+        )
+
+    # -- Lifecycle ------------------------------------------------------------
+
+    def _create_pool(self) -> Optional[Executor]:
+        if self.backend is AnalysisBackend.THREAD:
+            return ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="analysis",
+                initializer=_init_thread_worker,
+            )
+        if self.backend is AnalysisBackend.PROCESS:
+            # "spawn" keeps workers from inheriting the event loop and any
+            # open sockets of the API process.
+            return ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process_worker,
+            )
+        return None
+
+    def _get_pool(self) -> Optional[Executor]:
+        if self._pool is None and self.backend is not AnalysisBackend.INLINE:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = self._create_pool()
+        return self._pool
+
+    def start(self) -> None:
+        """Create the pool and bring every worker up before serving traffic."""
+
+        pool = self._get_pool()
+        if isinstance(pool, ProcessPoolExecutor):
+            # Submitting one task per worker forces the pool to start all of
+            # its processes now rather than on the first requests.
+            snapshots = [
+                future.result()
+                for future in [
+                    pool.submit(_warm_up_worker) for _ in range(self.workers)
+                ]
+            ]
+        else:
+            snapshots = [_warm_up_worker()]
+        self.worker_models = {snapshot["pid"]: snapshot for snapshot in snapshots}
+        logger.info(
+            "Analysis {} pool warmed up ({} processes)",
+            self.backend.value,
+            len(self.worker_models),
+        )
+
+    def shutdown(self) -> None:
+        """Stop the pool, cancelling work that has not started yet."""
+
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # -- Execution ------------------------------------------------------------
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def ensure_capacity(self, count: int = 1) -> None:
+        """Raise :class:`ExecutorSaturatedError` unless ``count`` more fit."""
+
+        if self._pending + count > self.max_pending:
+            self.stats.rejected += 1
+            raise ExecutorSaturatedError("Analysis queue is full; retry shortly.")
+
+    def _add_pending(self, count: int) -> None:
+        with self._pending_lock:
+            self._pending += count
+
+    def _worker_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers)
+            self._slots_loop = loop
+        return self._slots
+
+    def _job_done(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        slots: asyncio.Semaphore,
+        _future: Future,
+    ) -> None:
+        # Runs in a pool thread once the job has really finished, timed out
+        # or not; only then are its queue entry and worker slot given back.
+        self._add_pending(-1)
+        try:
+            loop.call_soon_threadsafe(slots.release)
+        except RuntimeError:  # the loop is already closed
+            pass
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` on the backend, applying backpressure.
+
+        The timeout starts once a worker picks the job up; waiting for a free
+        worker is not counted.
+        """
+
+        self.ensure_capacity()
+        self._add_pending(1)
+        submitted = False
+        try:
+            pool = self._get_pool()
+            if pool is None:
+                result = fn(*args)
+            else:
+                slots = self._worker_slots()
+                await slots.acquire()
+                try:
+                    future = pool.submit(fn, *args)
+                except BaseException:
+                    slots.release()
+                    raise
+                submitted = True
+                future.add_done_callback(
+                    partial(self._job_done, asyncio.get_running_loop(), slots)
+                )
+                result = await asyncio.wait_for(
+                    asyncio.wrap_future(future), self.timeout
+                )
+        except asyncio.TimeoutError as exc:
+            self.stats.timeouts += 1
+            raise ExecutorUnavailableError("Analysis timed out.") from exc
+        except BrokenProcessPool as exc:
+            # A worker died (e.g. OOM-killed); replace the pool for later calls.
+            self.stats.failures += 1
+            logger.error("Analysis process pool is broken; recreating it")
+            self.shutdown()
+            raise ExecutorUnavailableError("Analysis workers restarting.") from exc
+        finally:
+            if not submitted:
+                self._add_pending(-1)
+        self.stats.completed += 1
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return configuration and load counters."""
+
+        return {
+            "backend": self.backend.value,
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            **asdict(self.stats),
+        }
+
+
+analysis_executor = AnalysisExecutor.from_settings(settings)
+
+
+async def run_analysis(
+    text: str, job_description: Optional[str] = None
+) -> ResumeAnalyzeResponse:
+    """Analyse one resume on the executor, consulting the result cache first.
+
+    When a stage timer is active (see :mod:`app.analysis.timing`), the
+    pipeline's stages are timed in the worker and added to it, together with
+    ``cache`` lookups and ``dispatch``: queueing and transfer to the worker.
+    """
+
+    with stage("cache"):
+        text, job_description, key, result = await run_in_threadpool(
+            _cache_lookup, text, job_description
+        )
+    if result is None:
+        result = await _run_pipeline(text, job_description)
+        if key is not None:
+            with stage("cache"):
+                await run_in_threadpool(analysis_cache.set, key, result)
+    return result
+
+
+def _cache_lookup(
+    text: str, job_description: Optional[str]
+) -> Tuple[str, Optional[str], Optional[str], Optional[ResumeAnalyzeResponse]]:
+    """Normalise the inputs and, with the cache enabled, look them up in it.
+
+    Normalising and hashing a long resume and the Redis round trip block, so
+    callers run this in the threadpool. Returns the normalised texts, which
+    are the ones to analyse with the cache on or off, the key (``None`` with
+    the cache off) and the cached result if there is one.
+    """
+
+    text = normalize_text(text)
+    job_description = normalize_job_description(job_description)
+    if not settings.analysis_cache_enabled:
+        return text, job_description, None, None
+    taxonomy = get_taxonomy()
+    analysis_cache.ensure_generation(f"{SCORING_FINGERPRINT}/{taxonomy.fingerprint}")
+    key = cache_key(text, job_description, taxonomy.fingerprint)
+    return text, job_description, key, analysis_cache.get(key)
+
+
+async def _run_pipeline(
+    text: str, job_description: Optional[str]
+) -> ResumeAnalyzeResponse:
+    if active_timer() is None:
+        return await analysis_executor.run(analyze_text, text, job_description)
+    started = time.perf_counter()
+    result, stages = await analysis_executor.run(
+        call_timed, analyze_text, text, job_description
+    )
+    record_stages(stages)
+    record_stages({"dispatch": time.perf_counter() - started - sum(stages.values())})
+    return result
+
+
+async def _run_stage(timer: StageTimer, fn: Callable[..., T], *args: Any) -> T:
+    """Run one pipeline stage on the executor and add its timings to ``timer``."""
+
+    started = time.perf_counter()
+    result, stages = await analysis_executor.run(call_timed, fn, *args)
+    for name, seconds in stages.items():
+        timer.add(name, seconds)
+    timer.add("dispatch", time.perf_counter() - started - sum(stages.values()))
+    return result
+
+
+def _partial_events(
+    stage_name: str, metrics: Iterable[Metric], feedback: Iterable[FeedbackItem]
+) -> Iterator[ResumeAnalyzeEvent]:
+    for metric in metrics:
+        yield ResumeAnalyzeEvent(type="metric", stage=stage_name, metric=metric)
+    for item in feedback:
+        yield ResumeAnalyzeEvent(type="feedback", stage=stage_name, feedback=item)
+
+
+async def _model_stage_events(
+    text: str,
+    job_description: Optional[str],
+    timer: StageTimer,
+    values: Dict[str, Any],
+) -> AsyncIterator[ResumeAnalyzeEvent]:
+    """Run the enabled model stages concurrently, yielding each one's events.
+
+    Each stage's value is stored in ``values`` under the stage's name
+    (``entities`` or ``semantic``) as it finishes.
+    """
+
+    async def entities() -> Tuple[str, Any]:
+        return "entities", await _run_stage(timer, resume_experience, text)
+
+    async def semantic() -> Tuple[str, Any]:
+        return "semantic", await _run_stage(
+            timer, resume_semantic_match, text, job_description
+        )
+
+    model_stages: List[asyncio.Future[Tuple[str, Any]]] = []
+    if settings.entity_extraction_enabled:
+        model_stages.append(asyncio.ensure_future(entities()))
+    if settings.semantic_scoring_enabled and job_description:
+        model_stages.append(asyncio.ensure_future(semantic()))
+    try:
+        for completed in asyncio.as_completed(model_stages):
+            stage_name, value = await completed
+            values[stage_name] = value
+            if stage_name == "entities":
+                events = _partial_events(stage_name, (), experience_feedback(value))
+            else:
+                metrics = () if value is None else (semantic_metric(value),)
+                events = _partial_events(stage_name, metrics, ())
+            for event in events:
+                yield event
+    finally:
+        # Client went away or a stage failed: drop the other stage.
+        for task in model_stages:
+            task.cancel()
+
+
+async def stream_analysis(
+    text: str, job_description: Optional[str], timer: StageTimer
+) -> AsyncIterator[ResumeAnalyzeEvent]:
+    """Analyse one resume stage by stage, yielding results as they are ready.
+
+    The feature stage runs first. The coverage, length, contact and skills
+    metrics and their feedback are yielded as soon as it returns. The
+    entity and semantic stages, when enabled, then run concurrently, each
+    yielding its feedback or metric when it finishes. The last event holds
+    the complete result, the same as :func:`run_analysis` returns, and it is
+    cached the same way. A cached result is replayed at once, as events of
+    stage ``cache``.
+
+    Stage durations are added to ``timer``. It is not made the active timer,
+    because the generator may be closed from another context.
+    """
+
+    with timer.stage("cache"):
+        text, job_description, key, cached = await run_in_threadpool(
+            _cache_lookup, text, job_description
+        )
+    if cached is not None:
+        for event in _partial_events("cache", cached.metrics.values(), cached.feedback):
+            yield event
+        yield ResumeAnalyzeEvent(type="result", result=cached)
+        return
+
+    features, job_skills, truncated = await _run_stage(
+        timer, scan_resume, text, job_description
+    )
+    with timer.stage("score"):
+        partial_result = score_features(
+            features, extra_skills=job_skills, truncated=truncated
+        )
+    for event in _partial_events(
+        "features", partial_result.metrics.values(), partial_result.feedback
+    ):
+        yield event
+
+    values: Dict[str, Any] = {}
+    async with aclosing(
+        _model_stage_events(text[:MAX_RESUME_CHARS], job_description, timer, values)
+    ) as events:
+        async for event in events:
+            yield event
+
+    with timer.stage("score"):
+        result = score_features(
+            features,
+            extra_skills=job_skills,
+            truncated=truncated,
+            experience=values.get("entities"),
+            semantic_match=values.get("semantic"),
+        )
+    if key is not None:
+        with timer.stage("cache"):
+            await run_in_threadpool(analysis_cache.set, key, result)
+    yield ResumeAnalyzeEvent(type="result", result=result)
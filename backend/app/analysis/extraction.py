@@ -0,0 +1,115 @@
+"""Text extraction from uploaded resume files.
+
+Extractors are generators yielding text a page (PDF) or paragraph (DOCX) at a
+time. :func:`extract_text` stops pulling from them once the analyzer's
+character limit is reached, so a 50-page PDF is never parsed beyond what the
+analysis can use and only one page is held in memory at a time.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import docx
+import pdfplumber
+
+from app.analysis.pipeline import MAX_RESUME_CHARS
+
+PDF_CONTENT_TYPE = "application/pdf"
+DOCX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+)
+TEXT_CONTENT_TYPE = "text/plain"
+
+# Bytes read per chunk for plaintext uploads.
+TEXT_CHUNK_SIZE = 64 * 1024
+
+
+class UnsupportedFileTypeError(ValueError):
+    """Raised for uploads we cannot extract text from."""
+
+
+def iter_pdf_text(path: Path) -> Iterator[str]:
+    """Yield the text of each PDF page, releasing parsed pages as we go."""
+
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            try:
+                yield (page.extract_text() or "") + "\n"
+            finally:
+                # Drop the page's cached layout objects before the next one.
+                page.close()
+
+
+def iter_docx_text(path: Path) -> Iterator[str]:
+    """Yield DOCX paragraphs followed by table cell text."""
+
+    document = docx.Document(str(path))
+    for paragraph in document.paragraphs:
+        yield paragraph.text + "\n"
+    for table in document.tables:
+        for row in table.rows:
+            yield "\t".join(cell.text for cell in row.cells) + "\n"
+
+
+def iter_plain_text(path: Path) -> Iterator[str]:
+    """Yield a plaintext upload in fixed-size chunks."""
+
+    with path.open("r", encoding="utf-8", errors="replace") as fh:
+        while chunk := fh.read(TEXT_CHUNK_SIZE):
+            yield chunk
+
+
+EXTRACTORS: Dict[str, Callable[[Path], Iterator[str]]] = {
+    PDF_CONTENT_TYPE: iter_pdf_text,
+    DOCX_CONTENT_TYPE: iter_docx_text,
+    TEXT_CONTENT_TYPE: iter_plain_text,
+}
+SUFFIX_CONTENT_TYPES = {
+    ".pdf": PDF_CONTENT_TYPE,
+    ".docx": DOCX_CONTENT_TYPE,
+    ".txt": TEXT_CONTENT_TYPE,
+}
+
+
+def resolve_content_type(content_type: str | None, filename: str) -> str:
+    """Return the supported content type for an upload or raise."""
+
+    base_type = (content_type or "").split(";", 1)[0].strip().lower()
+    if base_type in EXTRACTORS:
+        return base_type
+    suffix_type = SUFFIX_CONTENT_TYPES.get(Path(filename).suffix.lower())
+    if suffix_type is not None:
+        return suffix_type
+    raise UnsupportedFileTypeError(
+        "Only PDF, DOCX and plaintext resumes are supported."
+    )
+
+
+def extract_text(
+    path: Path, content_type: str, limit: int = MAX_RESUME_CHARS
+) -> Tuple[str, bool]:
+    """Extract up to ``limit`` characters; also report whether text was cut.
+
+    One character past the limit is kept so the analyzer still flags the
+    result as truncated.
+    """
+
+    extractor = EXTRACTORS.get(content_type)
+    if extractor is None:
+        raise UnsupportedFileTypeError(f"Unsupported content type {content_type}.")
+
+    parts: List[str] = []
+    remaining = limit + 1
+    pieces = extractor(path)
+    try:
+        for piece in pieces:
+            parts.append(piece[:remaining])
+            remaining -= len(parts[-1])
+            if remaining <= 0:
+                break
+    finally:
+        # Closing the generator releases the underlying document early.
+        pieces.close()
+    return "".join(parts), remaining <= 0
@@ -0,0 +1,130 @@
+"""Single-pass feature extraction for plaintext resumes.
+
+The resume is lowercased once and scanned by one combined regular expression
+whose alternatives classify every match as an email, a phone number, a word
+token or a sentence terminator. Word, sentence and contact counts, section
+keywords and the token stream for skill matching all come out of that one
+scan instead of a separate pass (and ``lower()`` call) per signal.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from app.analysis.matcher import TOKEN_PATTERN, KeywordMatcher
+from app.analysis.timing import stage
+
+EMAIL_PATTERN = r"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}"
+PHONE_PATTERN = r"(?:(?:\+?\d{1,3}[\s.-])?(?:\(?\d{3}\)?[\s.-]?)?\d{3}[\s.-]?\d{4})"
+# A terminator only ends a sentence when it follows some non-terminator text.
+STOP_PATTERN = r"(?<=[^.!?])[.!?]"
+
+# Order matters: emails and phone numbers must win over the plain word
+# alternative that would otherwise split them into pieces.
+FEATURE_RE = re.compile(
+    rf"(?P<email>{EMAIL_PATTERN})"
+    rf"|(?P<phone>{PHONE_PATTERN})"
+    rf"|(?P<word>{TOKEN_PATTERN})"
+    rf"|(?P<stop>{STOP_PATTERN})",
+    re.UNICODE,
+)
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+SECTION_NAMES = (
+    "summary",
+    "experience",
+    "education",
+    "projects",
+    "skills",
+    "certifications",
+)
+SECTION_KEYWORDS: Dict[str, str] = {
+    "summary": "summary",
+    "objective": "summary",
+    "profile": "summary",
+    "experience": "experience",
+    "employment": "experience",
+    "education": "education",
+    "project": "projects",
+    "projects": "projects",
+    "skills": "skills",
+    "technologies": "skills",
+    "certification": "certifications",
+    "certifications": "certifications",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ResumeFeatures:
+    """Raw signals extracted from a resume before scoring."""
+
+    word_count: int
+    sentence_count: int
+    email_count: int
+    phone_count: int
+    sections: FrozenSet[str]
+    skills: FrozenSet[str]
+
+
+def scan_text(text: str) -> Tuple[int, int, int, int, List[str]]:
+    """Word, sentence, email and phone counts plus the word tokens of ``text``."""
+
+    word_count = 0
+    sentence_count = 0
+    email_count = 0
+    phone_count = 0
+    tokens: List[str] = []
+    append = tokens.append
+
+    for match in FEATURE_RE.finditer(text.lower()):
+        kind = match.lastgroup
+        if kind == "word":
+            word_count += 1
+            append(match.group())
+        elif kind == "stop":
+            sentence_count += 1
+        elif kind == "email":
+            email_count += 1
+            word_count += len(WORD_RE.findall(match.group()))
+        else:
+            phone_count += 1
+            word_count += len(WORD_RE.findall(match.group()))
+    return word_count, sentence_count, email_count, phone_count, tokens
+
+
+def find_sections(tokens: Iterable[str]) -> FrozenSet[str]:
+    """The sections whose heading keywords occur among ``tokens``."""
+
+    return frozenset(
+        SECTION_KEYWORDS[token] for token in SECTION_KEYWORDS.keys() & set(tokens)
+    )
+
+
+def extract_features(text: str, matcher: KeywordMatcher) -> ResumeFeatures:
+    """Extract every scoring signal from ``text`` in one scan."""
+
+    return extract_features_and_tokens(text, matcher)[0]
+
+
+def extract_features_and_tokens(
+    text: str, matcher: KeywordMatcher
+) -> Tuple[ResumeFeatures, List[str]]:
+    """:func:`extract_features` plus the word tokens the scan produced."""
+
+    with stage("regex"):
+        word_count, sentence_count, email_count, phone_count, tokens = scan_text(text)
+    with stage("sections"):
+        sections = find_sections(tokens)
+    with stage("skills"):
+        skills = frozenset(matcher.find_tokens(tokens))
+    features = ResumeFeatures(
+        word_count=word_count,
+        sentence_count=sentence_count,
+        email_count=email_count,
+        phone_count=phone_count,
+        sections=sections,
+        skills=skills,
+    )
+    return features, tokens
@@ -0,0 +1,227 @@
+"""Incremental feature extraction for resumes that are edited and re-analysed.
+
+Users tend to re-run an analysis after every small edit. Most of the text is
+then the same as last time, so :func:`extract_features_incremental` splits it
+into chunks and caches the features of each chunk under a digest of its text.
+Only chunks that changed are scanned again, and the resume's features are
+summed from the chunks.
+
+Chunks end at newlines, which keeps the result identical to
+:func:`~app.analysis.features.extract_features`:
+
+* Only a phone number can span a newline, and only when a digit or ``)``
+  precedes it and a digit or ``(`` follows it. Such newlines never end a
+  chunk.
+* Each chunk starts with its newline, so the sentence-stop look-behind sees
+  the same character as in the whole text.
+* Multi-word skills can still span a chunk boundary. Each chunk keeps its
+  first and last ``max_tokens - 1`` tokens, and the matcher runs once more
+  over those edges.
+
+Chunks are paragraphs: they end where a blank line follows. A paragraph
+longer than :data:`MAX_PARAGRAPH_CHARS`, as in text extracted without blank
+lines, is cut further after each line whose CRC-32 is a multiple of
+:data:`CUT_MODULUS`. Either way, where a chunk ends depends only on nearby
+text. An edit therefore changes the chunk it falls in and leaves the other
+chunks as they were. A text without newlines is a single chunk.
+
+The cache is per process, like the in-process tier of
+:mod:`app.analysis.cache`. It is dropped whenever the active taxonomy
+changes, since chunk skills depend on it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from app.analysis.features import ResumeFeatures, find_sections, scan_text
+from app.analysis.taxonomy import SkillTaxonomy
+from app.analysis.timing import stage
+from app.core.config import settings
+
+# A newline followed by a blank line ends a paragraph.
+PARAGRAPH_BREAK_RE = re.compile(r"\n(?=[^\S\n]*\n)")
+# Longer paragraphs are cut after every CUT_MODULUS-th line on average.
+MAX_PARAGRAPH_CHARS = 2_000
+CUT_MODULUS = 8
+# Separates the head and tail edges of a chunk; no keyword token matches it.
+EDGE_BREAK = ""
+# Characters around a newline that a phone number can continue across.
+PHONE_BEFORE_NEWLINE = ")"
+PHONE_AFTER_NEWLINE = "("
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkFeatures:
+    """Features of one chunk, plus the tokens at its edges."""
+
+    word_count: int
+    sentence_count: int
+    email_count: int
+    phone_count: int
+    sections: FrozenSet[str]
+    skills: FrozenSet[str]
+    edges: Tuple[str, ...]
+
+
+def _phone_may_span(before: str, after: str) -> bool:
+    return (before.isdecimal() or before in PHONE_BEFORE_NEWLINE) and (
+        after.isdecimal() or after in PHONE_AFTER_NEWLINE
+    )
+
+
+def split_chunks(text: str) -> List[str]:
+    """Cut ``text`` into chunks whose features add up to those of the text."""
+
+    chunks: List[str] = []
+    start = 0
+    for match in PARAGRAPH_BREAK_RE.finditer(text):
+        if match.start() > start:
+            _split_paragraph(text[start : match.start()], chunks)
+            start = match.start()
+    _split_paragraph(text[start:], chunks)
+    return chunks
+
+
+def _split_paragraph(text: str, chunks: List[str]) -> None:
+    if len(text) <= MAX_PARAGRAPH_CHARS:
+        chunks.append(text)
+        return
+    start = 0
+    line_start = 0
+    newline = text.find("\n")
+    while newline != -1:
+        line = text[line_start:newline]
+        if (
+            newline > start
+            and zlib.crc32(line.encode("utf-8", "surrogatepass")) % CUT_MODULUS == 0
+            and not _phone_may_span(text[newline - 1], text[newline + 1 : newline + 2])
+        ):
+            chunks.append(text[start:newline])
+            start = newline
+        line_start = newline + 1
+        newline = text.find("\n", line_start)
+    chunks.append(text[start:])
+
+
+def chunk_features(chunk: str, taxonomy: SkillTaxonomy) -> ChunkFeatures:
+    """Scan one chunk, keeping the edge tokens a keyword could span from."""
+
+    word_count, sentence_count, email_count, phone_count, tokens = scan_text(chunk)
+    reach = taxonomy.matcher.max_tokens - 1
+    if reach <= 0:
+        edges: Tuple[str, ...] = ()
+    elif len(tokens) <= 2 * reach:
+        edges = tuple(tokens)
+    else:
+        edges = (*tokens[:reach], EDGE_BREAK, *tokens[len(tokens) - reach :])
+    return ChunkFeatures(
+        word_count=word_count,
+        sentence_count=sentence_count,
+        email_count=email_count,
+        phone_count=phone_count,
+        sections=find_sections(tokens),
+        skills=frozenset(taxonomy.matcher.find_tokens(tokens)),
+        edges=edges,
+    )
+
+
+def combine_chunks(
+    chunks: Iterable[ChunkFeatures], taxonomy: SkillTaxonomy
+) -> ResumeFeatures:
+    """The features of the text made of ``chunks``, in order."""
+
+    chunks = list(chunks)
+    seams = taxonomy.matcher.find_tokens(chain.from_iterable(c.edges for c in chunks))
+    return ResumeFeatures(
+        word_count=sum(c.word_count for c in chunks),
+        sentence_count=sum(c.sentence_count for c in chunks),
+        email_count=sum(c.email_count for c in chunks),
+        phone_count=sum(c.phone_count for c in chunks),
+        sections=frozenset().union(*(c.sections for c in chunks)),
+        skills=frozenset(seams.union(*(c.skills for c in chunks))),
+    )
+
+
+class ChunkCache:
+    """Bounded LRU of :class:`ChunkFeatures` keyed by chunk digest."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, ChunkFeatures] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation: Optional[str] = None
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, ChunkFeatures]:
+        """Return cached features for whichever ``keys`` are present."""
+
+        found: Dict[bytes, ChunkFeatures] = {}
+        with self._lock:
+            for key in keys:
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = value
+        return found
+
+    def set_many(self, values: Dict[bytes, ChunkFeatures]) -> None:
+        with self._lock:
+            self._entries.update(values)
+            for key in values:
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def ensure_generation(self, generation: str) -> None:
+        """Drop every entry once the taxonomy fingerprint moves."""
+
+        if generation != self._generation:
+            with self._lock:
+                if generation != self._generation:
+                    self._entries.clear()
+                    self._generation = generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+chunk_cache = ChunkCache(max_entries=settings.analysis_chunk_cache_max_entries)
+
+
+def extract_features_incremental(
+    text: str, taxonomy: SkillTaxonomy, cache: ChunkCache = chunk_cache
+) -> ResumeFeatures:
+    """Same result as ``extract_features(text, taxonomy.matcher)``.
+
+    Only the chunks that are not in ``cache`` yet are scanned.
+    """
+
+    with stage("chunks"):
+        cache.ensure_generation(taxonomy.fingerprint)
+        chunks = split_chunks(text)
+        keys = [
+            hashlib.blake2b(
+                chunk.encode("utf-8", "surrogatepass"), digest_size=16
+            ).digest()
+            for chunk in chunks
+        ]
+        found = cache.get_many(keys)
+    missing: Dict[bytes, ChunkFeatures] = {}
+    if len(found) < len(keys):
+        with stage("regex"):
+            for key, chunk in zip(keys, chunks, strict=True):
+                if key not in found and key not in missing:
+                    missing[key] = chunk_features(chunk, taxonomy)
+        cache.set_many(missing)
+    with stage("chunks"):
+        return combine_chunks(
+            (found.get(key) or missing[key] for key in keys), taxonomy
+        )
@@ -0,0 +1,153 @@
+"""Token-level Aho-Corasick automaton for keyword detection.
+
+Keywords and text are split with the same tokenizer, so a match always starts
+and ends on a word boundary ("go" never fires inside "good", "ml" never fires
+inside "html"). The automaton is compiled once and then finds every keyword in
+a single pass over the tokens of a text, independent of how many keywords it
+holds.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, List, Mapping, Set, Tuple
+
+# Words keep trailing "+"/"#" so that "c++" and "c#" stay distinct from "c".
+TOKEN_PATTERN = r"\w+[+#]*"
+TOKEN_RE = re.compile(TOKEN_PATTERN, re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Return the lowercased tokens used for keyword matching."""
+
+    return TOKEN_RE.findall(text.lower())
+
+
+class KeywordMatcher:
+    """Multi-keyword matcher compiled into an Aho-Corasick automaton.
+
+    ``keywords`` is either an iterable of keywords (each keyword is its own
+    label) or a mapping from surface form to the label reported on a match,
+    which lets several aliases resolve to one canonical keyword.
+    """
+
+    __slots__ = ("_fail", "_goto", "_out", "labels", "max_tokens")
+
+    def __init__(self, keywords: Iterable[str] | Mapping[str, str]) -> None:
+        pairs: Iterable[Tuple[str, str]]
+        if isinstance(keywords, Mapping):
+            pairs = keywords.items()
+        else:
+            pairs = ((keyword, keyword) for keyword in keywords)
+
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Set[int]] = [set()]
+        labels: List[str] = []
+        label_ids: Dict[str, int] = {}
+        max_tokens = 0
+
+        for surface, label in pairs:
+            tokens = tokenize(surface)
+            if not tokens:
+                continue
+            max_tokens = max(max_tokens, len(tokens))
+            node = 0
+            for token in tokens:
+                child = goto[node].get(token)
+                if child is None:
+                    child = len(goto)
+                    goto[node][token] = child
+                    goto.append({})
+                    out.append(set())
+                node = child
+            label_id = label_ids.get(label)
+            if label_id is None:
+                label_id = label_ids[label] = len(labels)
+                labels.append(label)
+            out[node].add(label_id)
+
+        # Breadth-first pass wiring failure links and merging suffix outputs.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and token not in goto[state]:
+                    state = fail[state]
+                fallback = goto[state].get(token, 0)
+                fail[child] = fallback
+                out[child] |= out[fallback]
+
+        self._goto = goto
+        self._fail = fail
+        self._out: List[Tuple[int, ...]] = [tuple(sorted(ids)) for ids in out]
+        self.labels: Tuple[str, ...] = tuple(labels)
+        # Tokens in the longest keyword: the most a single match can span.
+        self.max_tokens = max_tokens
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the compiled tables as plain dicts, lists, tuples and strings."""
+
+        return {
+            "labels": self.labels,
+            "max_tokens": self.max_tokens,
+            "goto": self._goto,
+            "fail": self._fail,
+            "out": self._out,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> KeywordMatcher:
+        """Rebuild a matcher from :meth:`to_dict` output without recompiling.
+
+        The tables are used as they are. Only their sizes are checked, which
+        catches a truncated or mismatched index without a pass over every
+        node; callers must only pass tables they wrote themselves.
+        """
+
+        goto = data["goto"]
+        fail = data["fail"]
+        out = data["out"]
+        if not goto or len(fail) != len(goto) or len(out) != len(goto):
+            raise ValueError("Inconsistent keyword matcher tables.")
+
+        matcher = cls.__new__(cls)
+        matcher._goto = goto
+        matcher._fail = fail
+        matcher._out = out
+        matcher.labels = tuple(data["labels"])
+        matcher.max_tokens = data["max_tokens"]
+        return matcher
+
+    def find_all(self, text: str) -> Set[str]:
+        """Return the labels of every keyword occurring in ``text``."""
+
+        return self.find_tokens(TOKEN_RE.findall(text.lower()))
+
+    def find_tokens(self, tokens: Iterable[str]) -> Set[str]:
+        """Return the labels of every keyword in already tokenized text."""
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        hits: Set[int] = set()
+        state = 0
+        for token in tokens:
+            while True:
+                nxt = goto[state].get(token)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if not state:
+                    break
+                state = fail[state]
+            if out[state]:
+                hits.update(out[state])
+        labels = self.labels
+        return {labels[i] for i in hits}
@@ -0,0 +1,165 @@
+"""Persist analysis results into the ``resume_analyses`` schema."""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.analysis.pipeline import SCORE_WEIGHTS, SCORING_VERSION
+from app.db.models import (
+    AnalysisScore,
+    FeedbackItem,
+    FeedbackSeverity,
+    ResumeAnalysis,
+    ResumeAnalysisStatus,
+)
+from app.schemas.analysis import ResumeAnalyzeResponse
+
+# Rows per executemany INSERT. SQLAlchemy's "insertmanyvalues" sends each
+# chunk as multi-row VALUES from one cached compiled statement; scores bind 11
+# parameters per row, well below PostgreSQL's 65535 bind-parameter limit.
+BULK_CHUNK_ROWS = 1000
+
+SCORE_UPSERT_COLUMNS = (
+    "metric_label",
+    "category",
+    "score_value",
+    "max_score",
+    "weight",
+    "explanation",
+)
+
+
+@dataclass(slots=True)
+class BulkWriteStats:
+    """What a bulk write touched and how many statements it needed."""
+
+    analyses: int = 0
+    scores: int = 0
+    feedback_items: int = 0
+    statements: int = 0
+
+
+def score_rows(
+    analysis_id: uuid.UUID, result: ResumeAnalyzeResponse
+) -> List[Dict[str, Any]]:
+    """Map response metrics onto ``analysis_scores`` column values."""
+
+    return [
+        {
+            "id": uuid.uuid4(),
+            "analysis_id": analysis_id,
+            "metric_key": metric.key,
+            "metric_label": metric.label,
+            "category": "heuristic",
+            "score_value": metric.value,
+            "max_score": metric.max,
+            "weight": SCORE_WEIGHTS.get(metric.key),
+            "explanation": metric.details,
+        }
+        for metric in result.metrics.values()
+    ]
+
+
+def feedback_rows(
+    analysis_id: uuid.UUID, result: ResumeAnalyzeResponse
+) -> List[Dict[str, Any]]:
+    """Map response feedback onto ``feedback_items`` column values."""
+
+    return [
+        {
+            "id": uuid.uuid4(),
+            "analysis_id": analysis_id,
+            "message": item.message,
+            "recommendation": item.recommendation,
+            "severity": FeedbackSeverity(item.severity),
+        }
+        for item in result.feedback
+    ]
+
+
+def _chunks(rows: List[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+    for start in range(0, len(rows), BULK_CHUNK_ROWS):
+        yield rows[start : start + BULK_CHUNK_ROWS]
+
+
+def bulk_record_analysis_results(
+    db: Session, results: Sequence[Tuple[uuid.UUID, ResumeAnalyzeResponse]]
+) -> BulkWriteStats:
+    """Write scores and feedback for many analyses and mark them completed.
+
+    The number of statements depends on the row count only through
+    ``BULK_CHUNK_ROWS``:
+
+    * scores go out as multi-row ``INSERT ... ON CONFLICT DO UPDATE`` on
+      ``uq_analysis_scores_analysis_metric`` with ``RETURNING``, so re-running
+      an analysis replaces its metrics instead of failing;
+    * feedback has no natural key, so earlier items of these analyses are
+      deleted with one statement and the new ones inserted in bulk;
+    * the analysis rows are completed with a single executemany ``UPDATE``.
+
+    The caller owns the transaction.
+    """
+
+    stats = BulkWriteStats(analyses=len(results))
+    if not results:
+        return stats
+
+    scores: List[Dict[str, Any]] = []
+    feedback: List[Dict[str, Any]] = []
+    for analysis_id, result in results:
+        scores.extend(score_rows(analysis_id, result))
+        feedback.extend(feedback_rows(analysis_id, result))
+
+    # Core table inserts: the ORM bulk path would emit one INSERT per row for
+    # an upsert with RETURNING.
+    upsert = insert(AnalysisScore.__table__)
+    upsert = upsert.on_conflict_do_update(
+        constraint="uq_analysis_scores_analysis_metric",
+        set_={
+            **{name: upsert.excluded[name] for name in SCORE_UPSERT_COLUMNS},
+            "updated_at": func.now(),
+        },
+    ).returning(AnalysisScore.id)
+    for chunk in _chunks(scores):
+        stats.scores += len(db.execute(upsert, chunk).all())
+        stats.statements += 1
+
+    analysis_ids = [analysis_id for analysis_id, _ in results]
+    db.execute(delete(FeedbackItem).where(FeedbackItem.analysis_id.in_(analysis_ids)))
+    stats.statements += 1
+    feedback_insert = insert(FeedbackItem.__table__).returning(FeedbackItem.id)
+    for chunk in _chunks(feedback):
+        stats.feedback_items += len(db.execute(feedback_insert, chunk).all())
+        stats.statements += 1
+
+    completed_at = datetime.now(timezone.utc)
+    db.execute(
+        update(ResumeAnalysis),
+        [
+            {
+                "id": analysis_id,
+                "overall_score": result.overall_score,
+                "model_version": SCORING_VERSION,
+                "status": ResumeAnalysisStatus.COMPLETED,
+                "completed_at": completed_at,
+            }
+            for analysis_id, result in results
+        ],
+    )
+    stats.statements += 1
+    return stats
+
+
+def record_analysis_result(
+    db: Session, analysis: ResumeAnalysis, result: ResumeAnalyzeResponse
+) -> None:
+    """Write scores and feedback for one analysis and mark it completed."""
+
+    bulk_record_analysis_results(db, [(analysis.id, result)])
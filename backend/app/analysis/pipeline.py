@@ -0,0 +1,384 @@
+"""Resume analysis pipeline shared by API routes and worker processes.
+
+The pipeline is a pure function of the resume text, the optional job
+description and the active skill taxonomy, so it can run inline, in a thread
+or in a separate process without any request state. With
+``ENTITY_EXTRACTION_ENABLED`` it also runs the spaCy entity stage of
+:mod:`app.analysis.entities`, and with ``SEMANTIC_SCORING_ENABLED`` it scores
+embedding similarity to the job description (:mod:`app.ml.embeddings`).
+:func:`analyze_texts` runs both model stages over many resumes as one batch.
+:func:`scan_resume`, :func:`resume_experience` and :func:`resume_semantic_match`
+run the stages one at a time, for callers that report each stage's output as
+soon as it is ready.
+Long resumes are scanned chunk by chunk with
+:func:`~app.analysis.incremental.extract_features_incremental`, so after an
+edit only the changed chunks are scanned again.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from app.analysis.entities import extract_entities
+from app.analysis.features import SECTION_NAMES, ResumeFeatures, extract_features
+from app.analysis.incremental import extract_features_incremental
+from app.analysis.taxonomy import SkillTaxonomy, get_taxonomy
+from app.analysis.timing import stage
+from app.core.config import settings
+from app.ml.embeddings import semantic_similarity
+from app.schemas.analysis import (
+    ContactSignals,
+    ExperienceSignals,
+    FeedbackItem,
+    Metric,
+    ResumeAnalyzeResponse,
+    SectionPresence,
+)
+
+# Inputs beyond this many characters are cut and flagged as truncated.
+MAX_RESUME_CHARS = 100_000
+
+# Bump SCORING_VERSION whenever scoring rules change; together with the
+# weights it forms the fingerprint cached results are keyed on.
+SCORING_VERSION = "2024.10.1"
+SCORE_WEIGHTS: Dict[str, float] = {
+    "coverage": 0.30,
+    "length": 0.20,
+    "contact": 0.30,
+    "skills": 0.20,
+}
+SCORING_FINGERPRINT = (
+    f"{SCORING_VERSION}:"
+    + ",".join(f"{key}={weight}" for key, weight in sorted(SCORE_WEIGHTS.items()))
+    + (
+        f";entities={settings.spacy_model}"
+        if settings.entity_extraction_enabled
+        else ""
+    )
+    + (
+        f";embeddings={settings.embedding_model}/{settings.embedding_max_tokens}"
+        if settings.semantic_scoring_enabled
+        else ""
+    )
+)
+
+
+def analyze_text(
+    text: str,
+    job_description: Optional[str] = None,
+    taxonomy: Optional[SkillTaxonomy] = None,
+    experience: Optional[ExperienceSignals] = None,
+    semantic_match: Optional[float] = None,
+) -> ResumeAnalyzeResponse:
+    """Run the full analysis for one resume.
+
+    ``taxonomy`` pins the skill taxonomy to use; by default the currently
+    active one is picked up. ``experience`` and ``semantic_match`` pass in
+    model outputs already computed for a batch; otherwise the enabled model
+    stages run here.
+    """
+
+    features, jd_skills, truncated = scan_resume(text, job_description, taxonomy)
+    text = text[:MAX_RESUME_CHARS]
+
+    if experience is None and settings.entity_extraction_enabled:
+        experience = resume_experience(text)
+    if semantic_match is None and settings.semantic_scoring_enabled:
+        semantic_match = resume_semantic_match(text, job_description)
+
+    with stage("score"):
+        return score_features(
+            features,
+            extra_skills=jd_skills,
+            truncated=truncated,
+            experience=experience,
+            semantic_match=semantic_match,
+        )
+
+
+def scan_resume(
+    text: str,
+    job_description: Optional[str] = None,
+    taxonomy: Optional[SkillTaxonomy] = None,
+) -> Tuple[ResumeFeatures, FrozenSet[str], bool]:
+    """The feature stage of :func:`analyze_text`, without the model stages.
+
+    Returns the resume's features, the skills found in the job description
+    and whether the text was truncated.
+    """
+
+    # Guardrail: enforce max size and mark truncated state if we cut input.
+    truncated = len(text) > MAX_RESUME_CHARS
+    if truncated:
+        text = text[:MAX_RESUME_CHARS]
+
+    # Core signals, sections and skills from a single pass over the text
+    taxonomy = taxonomy or get_taxonomy()
+    matcher = taxonomy.matcher
+    if (
+        settings.analysis_incremental_enabled
+        and len(text) >= settings.analysis_incremental_min_chars
+    ):
+        features = extract_features_incremental(text, taxonomy)
+    else:
+        features = extract_features(text, matcher)
+
+    # If a job description is available, also surface any overlaps
+    jd_skills: FrozenSet[str] = frozenset()
+    if job_description:
+        with stage("skills"):
+            jd_skills = frozenset(matcher.find_all(job_description))
+    return features, jd_skills, truncated
+
+
+def analyze_texts(
+    items: Sequence[Tuple[str, Optional[str]]],
+    taxonomy: Optional[SkillTaxonomy] = None,
+) -> List[ResumeAnalyzeResponse]:
+    """Analyse ``(text, job_description)`` pairs, in input order.
+
+    Same results as :func:`analyze_text` per item, but the entity stage
+    processes all resumes in one ``nlp.pipe`` run and resumes sharing a job
+    description are embedded together.
+    """
+
+    taxonomy = taxonomy or get_taxonomy()
+    texts = [text[:MAX_RESUME_CHARS] for text, _ in items]
+    experiences = experience_signals(texts)
+
+    semantic: List[Optional[float]] = [None] * len(items)
+    by_job: Dict[str, List[int]] = {}
+    for index, (_, job_description) in enumerate(items):
+        if job_description:
+            by_job.setdefault(job_description, []).append(index)
+    for job_description, indices in by_job.items():
+        scores = semantic_scores([texts[index] for index in indices], job_description)
+        for index, score in zip(indices, scores, strict=True):
+            semantic[index] = score
+
+    return [
+        analyze_text(
+            text,
+            job_description,
+            taxonomy=taxonomy,
+            experience=experience,
+            semantic_match=score,
+        )
+        for (text, job_description), experience, score in zip(
+            items, experiences, semantic, strict=True
+        )
+    ]
+
+
+def resume_experience(text: str) -> Optional[ExperienceSignals]:
+    """The entity stage of :func:`analyze_text` on its own."""
+
+    with stage("entities"):
+        return experience_signals([text])[0]
+
+
+def resume_semantic_match(text: str, job_description: Optional[str]) -> Optional[float]:
+    """The semantic stage of :func:`analyze_text` on its own."""
+
+    with stage("semantic"):
+        return semantic_scores([text], job_description)[0]
+
+
+def experience_signals(texts: Sequence[str]) -> List[Optional[ExperienceSignals]]:
+    """Entity-stage signals per text, or ``None`` each when the stage is off."""
+
+    if not settings.entity_extraction_enabled:
+        return [None] * len(texts)
+    return extract_entities(texts)
+
+
+def semantic_scores(
+    texts: Sequence[str], job_description: Optional[str]
+) -> List[Optional[float]]:
+    """Embedding similarity (0-100) of each text to the job description.
+
+    ``None`` each when semantic scoring is off or there is no job description.
+    """
+
+    if not settings.semantic_scoring_enabled or not job_description:
+        return [None] * len(texts)
+    similarity = semantic_similarity(texts, job_description)
+    return [round(float(value) * 100.0, 1) for value in similarity]
+
+
+def score_features(
+    features: ResumeFeatures,
+    *,
+    extra_skills: Iterable[str] = (),
+    truncated: bool = False,
+    experience: Optional[ExperienceSignals] = None,
+    semantic_match: Optional[float] = None,
+) -> ResumeAnalyzeResponse:
+    """Turn extracted features into scores, metrics and feedback."""
+
+    word_count = features.word_count
+    sentence_count = max(1, features.sentence_count)
+
+    sections = SectionPresence(
+        **{name: name in features.sections for name in SECTION_NAMES}
+    )
+
+    # Keyword detection
+    detected_skills = sorted(features.skills.union(extra_skills))
+
+    # Metrics (0-100)
+    coverage_hits = sum(
+        1
+        for flag in [
+            sections.summary,
+            sections.experience,
+            sections.education,
+            sections.projects,
+            sections.skills,
+        ]
+        if flag
+    )
+    coverage_score = (coverage_hits / 5) * 100.0
+
+    length_optimal_low, length_optimal_high = 250, 900
+    if word_count < length_optimal_low:
+        length_score = max(0.0, (word_count / length_optimal_low) * 100.0)
+    elif word_count > length_optimal_high:
+        # Penalize overly long resumes.
+        over = min(2_000, word_count)
+        length_score = max(
+            20.0,
+            100.0
+            - ((over - length_optimal_high) / (2_000 - length_optimal_high)) * 80.0,
+        )
+    else:
+        length_score = 100.0
+
+    contact = ContactSignals(
+        has_email=features.email_count > 0,
+        has_phone=features.phone_count > 0,
+        email_count=features.email_count,
+        phone_count=features.phone_count,
+    )
+    contact_score = (
+        100.0
+        if (contact.has_email and contact.has_phone)
+        else 50.0 if contact.has_email else 0.0
+    )
+
+    skills_score = min(100.0, (len(detected_skills) / 10) * 100.0)
+
+    # Weighted aggregate
+    overall = (
+        SCORE_WEIGHTS["coverage"] * coverage_score
+        + SCORE_WEIGHTS["length"] * length_score
+        + SCORE_WEIGHTS["contact"] * contact_score
+        + SCORE_WEIGHTS["skills"] * skills_score
+    )
+    overall = round(overall, 1)
+
+    metrics = {
+        "coverage": Metric(
+            key="coverage", label="Section coverage", value=round(coverage_score, 1)
+        ),
+        "length": Metric(
+            key="length",
+            label="Length appropriateness",
+            value=round(length_score, 1),
+            details=f"{word_count} words, {sentence_count} sentences",
+        ),
+        "contact": Metric(
+            key="contact",
+            label="Contact details present",
+            value=round(contact_score, 1),
+        ),
+        "skills": Metric(
+            key="skills",
+            label="Skills & keywords",
+            value=round(skills_score, 1),
+            details=f"{len(detected_skills)} detected",
+        ),
+    }
+    if semantic_match is not None:
+        metrics["semantic_match"] = semantic_metric(semantic_match)
+
+    # Feedback generation
+    feedback: List[FeedbackItem] = []
+    if not contact.has_email:
+        feedback.append(
+            FeedbackItem(
+                severity="high",
+                message="No email address detected.",
+                recommendation="Add a professional email to the header section.",
+            )
+        )
+    if not contact.has_phone:
+        feedback.append(
+            FeedbackItem(
+                severity="medium",
+                message="No phone number detected.",
+                recommendation="Consider adding a mobile number for recruiter outreach.",
+            )
+        )
+    if coverage_hits < 4:
+        feedback.append(
+            FeedbackItem(
+                severity="medium",
+                message="Some core sections are missing (summary, experience, education, projects, skills).",
+                recommendation="Add the missing sections to improve scanning and ATS parsing.",
+            )
+        )
+    if word_count < length_optimal_low:
+        feedback.append(
+            FeedbackItem(
+                severity="low",
+                message="Resume appears too short.",
+                recommendation="Expand experience bullets with measurable outcomes and impact.",
+            )
+        )
+    elif word_count > 1200:
+        feedback.append(
+            FeedbackItem(
+                severity="low",
+                message="Resume may be overly long.",
+                recommendation="Trim older roles or consolidate repetitive bullets.",
+            )
+        )
+    feedback.extend(experience_feedback(experience))
+
+    with stage("response"):
+        return ResumeAnalyzeResponse(
+            overall_score=overall,
+            metrics=metrics,
+            sections=sections,
+            contact=contact,
+            detected_skills=detected_skills,
+            word_count=word_count,
+            sentence_count=sentence_count,
+            truncated=truncated,
+            feedback=feedback,
+            experience=experience,
+        )
+
+
+def semantic_metric(semantic_match: float) -> Metric:
+    # Informational: not part of the weighted overall score.
+    return Metric(
+        key="semantic_match",
+        label="Semantic match with job description",
+        value=semantic_match,
+    )
+
+
+def experience_feedback(experience: Optional[ExperienceSignals]) -> List[FeedbackItem]:
+    """Feedback on the entity stage's signals; none when the stage is off."""
+
+    if experience is None or experience.periods:
+        return []
+    return [
+        FeedbackItem(
+            severity="low",
+            message="No dated roles detected.",
+            recommendation="Give each role a date range, e.g. 'Jan 2020 - Present'.",
+        )
+    ]
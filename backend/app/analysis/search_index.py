@@ -0,0 +1,308 @@
+"""BM25 search over an inverted index of extracted resume text.
+
+Each user's resumes are indexed into ``search_documents`` (one row per
+upload, with its length in terms) and ``search_postings`` (one row per term
+and upload, with the term frequency). Besides the words of the resume, every
+skill the taxonomy detects is indexed as a ``skill:<name>`` pseudo-term, so
+aliases of a skill in the resume and in the job description meet on one term.
+Documents record the fingerprint of the taxonomy they were indexed with, and
+are re-indexed when it changes (see :func:`stale_taxonomy_uploads`).
+
+A query reads only the postings of the job description's terms and scores
+them with Okapi BM25 inside PostgreSQL; the cost grows with the number of
+resumes containing those terms, not with the size of the collection.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Float,
+    Integer,
+    Select,
+    String,
+    bindparam,
+    case,
+    cast,
+    delete,
+    func,
+    or_,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert
+from sqlalchemy.orm import Session
+
+from app.analysis.matcher import KeywordMatcher, tokenize
+from app.analysis.pipeline import MAX_RESUME_CHARS
+from app.analysis.taxonomy import get_taxonomy
+from app.db.models import ResumeUpload, SearchDocument, SearchPosting
+from app.storage.text_store import text_store
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+SKILL_TERM_PREFIX = "skill:"
+# Query-side weight of skill pseudo-terms relative to plain words.
+SKILL_TERM_BOOST = 2.0
+
+# Longer tokens are almost always noise (hashes, URLs) and are not indexed.
+MAX_TERM_LENGTH = 64
+# Skill pseudo-terms longer than the ``term`` column are not indexed either.
+MAX_SKILL_TERM_LENGTH = SearchPosting.__table__.c.term.type.length
+
+# Postings sent per INSERT. They travel as four array parameters, so the
+# chunk size is bounded by memory rather than by bind-parameter limits.
+POSTING_CHUNK_ROWS = 50_000
+
+# Frequent English function words; they would only add long posting lists.
+STOPWORDS = frozenset("""
+    a about above after all also an and any are as at be been before being
+    below between both but by can did do does doing down during each few for
+    from further had has have having he her here hers him his how i if in
+    into is it its itself just me more most my no nor not now of off on once
+    only or other our ours out over own same she should so some such than
+    that the their theirs them then there these they this those through to
+    too under until up very was we were what when where which while who whom
+    why will with you your yours
+    """.split())
+
+
+def _postings_insert():
+    """``INSERT ... SELECT FROM unnest(...)`` taking each column as an array.
+
+    One statement carries a whole chunk; an executemany would send one
+    statement per posting.
+    """
+
+    rows = (
+        func.unnest(
+            bindparam("user_ids", type_=ARRAY(UUID(as_uuid=True))),
+            bindparam("terms", type_=ARRAY(String)),
+            bindparam("upload_ids", type_=ARRAY(UUID(as_uuid=True))),
+            bindparam("frequencies", type_=ARRAY(Integer)),
+        )
+        .table_valued("user_id", "term", "resume_upload_id", "term_frequency")
+        .render_derived()
+    )
+    statement = insert(SearchPosting.__table__).from_select(
+        ["user_id", "term", "resume_upload_id", "term_frequency"],
+        select(
+            rows.c.user_id, rows.c.term, rows.c.resume_upload_id, rows.c.term_frequency
+        ),
+    )
+    # A concurrent indexer may have written the same postings.
+    return statement.on_conflict_do_update(
+        index_elements=["user_id", "term", "resume_upload_id"],
+        set_={"term_frequency": statement.excluded.term_frequency},
+    )
+
+
+POSTINGS_INSERT = _postings_insert()
+
+
+def document_terms(text: str, matcher: KeywordMatcher) -> Tuple[Counter, int]:
+    """Return term frequencies for ``text`` and its length in indexed words."""
+
+    tokens = tokenize(text)
+    words = [
+        token
+        for token in tokens
+        if token not in STOPWORDS and len(token) <= MAX_TERM_LENGTH
+    ]
+    terms = Counter(words)
+    for skill in matcher.find_tokens(tokens):
+        term = SKILL_TERM_PREFIX + skill
+        if len(term) <= MAX_SKILL_TERM_LENGTH:
+            terms[term] += 1
+    return terms, len(words)
+
+
+def query_terms(job_description: str, matcher: KeywordMatcher) -> List[str]:
+    """Distinct terms of a job description, skill pseudo-terms included."""
+
+    terms, _ = document_terms(job_description, matcher)
+    return sorted(terms)
+
+
+def index_uploads(db: Session, upload_ids: Sequence[uuid.UUID]) -> int:
+    """Index the extracted text of uploads not yet indexed at their content.
+
+    Uploads whose document already carries the current ``content_sha256`` and
+    taxonomy fingerprint are skipped, so calling this after every completed
+    analysis is cheap. The
+    statements per call do not grow with the number of uploads beyond
+    ``POSTING_CHUNK_ROWS`` postings per insert. Returns the number of uploads
+    (re)indexed; the caller owns the transaction.
+    """
+
+    if not upload_ids:
+        return 0
+    taxonomy = get_taxonomy()
+    stale = db.execute(
+        select(ResumeUpload.id, ResumeUpload.user_id, ResumeUpload.content_sha256)
+        .outerjoin(SearchDocument, SearchDocument.resume_upload_id == ResumeUpload.id)
+        .where(
+            ResumeUpload.id.in_(upload_ids),
+            ResumeUpload.content_sha256.is_not(None),
+            or_(
+                SearchDocument.content_sha256.is_(None),
+                SearchDocument.content_sha256 != ResumeUpload.content_sha256,
+                SearchDocument.taxonomy_fingerprint != taxonomy.fingerprint,
+            ),
+        )
+    ).all()
+
+    documents: List[Dict[str, Any]] = []
+    postings: Dict[str, List[Any]] = {
+        "user_ids": [],
+        "terms": [],
+        "upload_ids": [],
+        "frequencies": [],
+    }
+    for upload_id, user_id, digest in stale:
+        text = text_store.read(digest)
+        if text is None:
+            continue
+        terms, term_count = document_terms(text[:MAX_RESUME_CHARS], taxonomy.matcher)
+        documents.append(
+            {
+                "resume_upload_id": upload_id,
+                "user_id": user_id,
+                "content_sha256": digest,
+                "taxonomy_fingerprint": taxonomy.fingerprint,
+                "term_count": term_count,
+            }
+        )
+        postings["user_ids"].extend([user_id] * len(terms))
+        postings["terms"].extend(terms.keys())
+        postings["upload_ids"].extend([upload_id] * len(terms))
+        postings["frequencies"].extend(terms.values())
+    if not documents:
+        return 0
+
+    indexed_ids = [document["resume_upload_id"] for document in documents]
+    db.execute(
+        delete(SearchPosting).where(SearchPosting.resume_upload_id.in_(indexed_ids))
+    )
+    upsert = insert(SearchDocument.__table__)
+    db.execute(
+        upsert.on_conflict_do_update(
+            index_elements=["resume_upload_id"],
+            set_={
+                "content_sha256": upsert.excluded.content_sha256,
+                "taxonomy_fingerprint": upsert.excluded.taxonomy_fingerprint,
+                "term_count": upsert.excluded.term_count,
+                "updated_at": func.now(),
+            },
+        ),
+        documents,
+    )
+    for start in range(0, len(postings["terms"]), POSTING_CHUNK_ROWS):
+        db.execute(
+            POSTINGS_INSERT,
+            {
+                name: values[start : start + POSTING_CHUNK_ROWS]
+                for name, values in postings.items()
+            },
+        )
+    return len(documents)
+
+
+def stale_taxonomy_uploads(
+    db: Session,
+    fingerprint: str,
+    after: Optional[uuid.UUID],
+    limit: int,
+) -> List[uuid.UUID]:
+    """Lock and return uploads indexed under a taxonomy other than ``fingerprint``.
+
+    Up to ``limit`` ids after ``after`` are returned in order. Rows another
+    transaction has locked are skipped, so several workers re-indexing at
+    once share out the documents instead of repeating each other's work.
+    """
+
+    statement = (
+        select(SearchDocument.resume_upload_id)
+        .where(SearchDocument.taxonomy_fingerprint != fingerprint)
+        .order_by(SearchDocument.resume_upload_id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    if after is not None:
+        statement = statement.where(SearchDocument.resume_upload_id > after)
+    return list(db.scalars(statement))
+
+
+def search_statement(user_id: uuid.UUID, terms: Sequence[str], limit: int) -> Select:
+    """Top ``limit`` uploads of ``user_id`` for ``terms`` by BM25 score.
+
+    Rows carry ``resume_upload_id``, ``original_filename``, ``score`` and
+    ``matched_skills``. Corpus size, average length and document frequencies
+    are computed per query from the user's own documents, as floats: numeric
+    arithmetic over every matching posting is several times slower.
+    """
+
+    corpus = (
+        select(
+            cast(func.count(), Float).label("documents"),
+            cast(func.avg(SearchDocument.term_count), Float).label("average_length"),
+        )
+        .where(SearchDocument.user_id == user_id)
+        .cte("corpus")
+    )
+    frequencies = (
+        select(SearchPosting.term, cast(func.count(), Float).label("documents"))
+        .where(SearchPosting.user_id == user_id, SearchPosting.term.in_(terms))
+        .group_by(SearchPosting.term)
+        .cte("document_frequency")
+    )
+
+    idf = func.ln(
+        1
+        + (corpus.c.documents - frequencies.c.documents + 0.5)
+        / (frequencies.c.documents + 0.5)
+    )
+    tf = SearchPosting.term_frequency
+    length_norm = BM25_K1 * (
+        1 - BM25_B + BM25_B * SearchDocument.term_count / corpus.c.average_length
+    )
+    is_skill = SearchPosting.term.startswith(SKILL_TERM_PREFIX)
+    boost = case((is_skill, SKILL_TERM_BOOST), else_=1.0)
+    score = func.sum(boost * idf * tf * (BM25_K1 + 1) / (tf + length_norm)).label(
+        "score"
+    )
+
+    hits = (
+        select(
+            SearchPosting.resume_upload_id,
+            score,
+            func.array_remove(
+                func.array_agg(case((is_skill, SearchPosting.term))), None
+            ).label("matched_skills"),
+        )
+        .join(frequencies, frequencies.c.term == SearchPosting.term)
+        .join(
+            SearchDocument,
+            SearchDocument.resume_upload_id == SearchPosting.resume_upload_id,
+        )
+        .join(corpus, true())
+        .where(SearchPosting.user_id == user_id, SearchPosting.term.in_(terms))
+        .group_by(SearchPosting.resume_upload_id)
+        .order_by(score.desc(), SearchPosting.resume_upload_id)
+        .limit(limit)
+        .subquery("hits")
+    )
+    return (
+        select(
+            hits.c.resume_upload_id,
+            ResumeUpload.original_filename,
+            hits.c.score,
+            hits.c.matched_skills,
+        )
+        .join(ResumeUpload, ResumeUpload.id == hits.c.resume_upload_id)
+        .order_by(hits.c.score.desc(), hits.c.resume_upload_id)
+    )
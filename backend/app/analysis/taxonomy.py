@@ -0,0 +1,310 @@
+"""Versioned skill taxonomy compiled into a shared matching index.
+
+The taxonomy lives in a JSON file of the form::
+
+    {
+      "version": "2024.10.0",
+      "skills": [
+        {"name": "kubernetes", "aliases": ["k8s"]},
+        {"name": "postgres", "aliases": ["postgresql"]},
+        "rust"
+      ]
+    }
+
+Compiling tens of thousands of entries into a :class:`KeywordMatcher` is too
+slow to repeat in every worker, so the compiled automaton tables are written
+with :mod:`marshal` next to a fingerprint of the source file and re-used on the
+next start. Loading them takes a fraction of the compile time. The files hold
+only plain lists, dicts and strings, and are only read from a directory
+private to the process user; anything else is ignored and rebuilt. Since
+nobody else can write them, they are trusted as written and not re-validated.
+The :class:`TaxonomyRegistry` watches the source file and compiles a changed
+taxonomy in a background thread, serving the old one until the new one is
+ready; readers always see either the old or the new index, never a partially
+built one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import marshal
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from app.analysis.matcher import KeywordMatcher
+from app.core.config import settings
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).parent / "data" / "skills.json"
+
+# Bump when the serialised layout of SkillTaxonomy/KeywordMatcher changes.
+INDEX_FORMAT = 4
+
+# Index files and their directory must not be writable by anyone else.
+UNSAFE_MODE_BITS = stat.S_IWGRP | stat.S_IWOTH
+
+
+class TaxonomyError(ValueError):
+    """Raised when a taxonomy file cannot be parsed."""
+
+
+@dataclass(frozen=True, slots=True)
+class SkillTaxonomy:
+    """Compiled taxonomy ready for matching."""
+
+    version: str
+    fingerprint: str
+    matcher: KeywordMatcher
+
+    @property
+    def skills(self) -> tuple[str, ...]:
+        """Canonical skill names known to the taxonomy."""
+
+        return self.matcher.labels
+
+
+def compile_taxonomy(data: Dict[str, Any], fingerprint: str) -> SkillTaxonomy:
+    """Build a :class:`SkillTaxonomy` from parsed taxonomy JSON."""
+
+    entries = data.get("skills")
+    if not isinstance(entries, list):
+        raise TaxonomyError("Taxonomy must define a 'skills' list.")
+
+    surfaces: Dict[str, str] = {}
+    for entry in entries:
+        if isinstance(entry, str):
+            name, aliases = entry, []
+        elif isinstance(entry, dict) and isinstance(entry.get("name"), str):
+            name, aliases = entry["name"], entry.get("aliases") or []
+        else:
+            raise TaxonomyError(f"Invalid taxonomy entry: {entry!r}")
+        canonical = name.strip().lower()
+        surfaces.setdefault(canonical, canonical)
+        for alias in aliases:
+            surfaces.setdefault(str(alias).strip().lower(), canonical)
+
+    return SkillTaxonomy(
+        version=str(data.get("version", "unversioned")),
+        fingerprint=fingerprint,
+        matcher=KeywordMatcher(surfaces),
+    )
+
+
+def _index_path(index_dir: Path, fingerprint: str) -> Path:
+    # The marshal format may change between Python versions.
+    tag = sys.implementation.cache_tag
+    return index_dir / f"skills-{INDEX_FORMAT}-{tag}-{fingerprint[:16]}.marshal"
+
+
+def _is_private(info: os.stat_result) -> bool:
+    """Whether a file is owned by this process user and writable only by it."""
+
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        return False
+    return not info.st_mode & UNSAFE_MODE_BITS
+
+
+def _read_index(index_path: Path, fingerprint: str) -> Optional[SkillTaxonomy]:
+    flags = os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0)
+    fd = os.open(index_path, flags)
+    with os.fdopen(fd, "rb") as fh:
+        if not _is_private(os.fstat(fh.fileno())):
+            logger.warning(
+                "Ignoring taxonomy index {} with unsafe ownership or mode", index_path
+            )
+            return None
+        # marshal.load() reads a file object in small pieces; this is faster.
+        data = marshal.loads(fh.read())
+    if (
+        not isinstance(data, dict)
+        or data.get("format") != INDEX_FORMAT
+        or data.get("fingerprint") != fingerprint
+    ):
+        return None
+    return SkillTaxonomy(
+        version=str(data["version"]),
+        fingerprint=fingerprint,
+        matcher=KeywordMatcher.from_dict(data["matcher"]),
+    )
+
+
+def _write_index(index_path: Path, taxonomy: SkillTaxonomy) -> None:
+    payload = {
+        "format": INDEX_FORMAT,
+        "fingerprint": taxonomy.fingerprint,
+        "version": taxonomy.version,
+        "matcher": taxonomy.matcher.to_dict(),
+    }
+    # Write to a temporary file first so concurrent workers never read a
+    # half-written index. mkstemp creates it readable by the owner only.
+    fd, tmp_name = tempfile.mkstemp(dir=index_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            marshal.dump(payload, fh)
+        os.replace(tmp_name, index_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _prepare_index_dir(index_dir: Path) -> bool:
+    """Create ``index_dir`` (mode 0700) and check nobody else can write to it."""
+
+    try:
+        index_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        info = index_dir.stat()
+    except OSError:
+        logger.warning("Could not create taxonomy index directory {}", index_dir)
+        return False
+    if not _is_private(info):
+        logger.warning(
+            "Not using taxonomy index directory {}: it must belong to this user "
+            "and not be group or world writable",
+            index_dir,
+        )
+        return False
+    return True
+
+
+def load_taxonomy(source: Path, index_dir: Path) -> SkillTaxonomy:
+    """Load a taxonomy, preferring a previously serialised index."""
+
+    raw = source.read_bytes()
+    fingerprint = hashlib.sha256(raw).hexdigest()
+    index_path = _index_path(index_dir, fingerprint)
+    use_index = _prepare_index_dir(index_dir)
+
+    if use_index:
+        try:
+            taxonomy = _read_index(index_path, fingerprint)
+            if taxonomy is not None:
+                return taxonomy
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # A corrupt or incompatible index is simply rebuilt below.
+            logger.warning("Discarding unreadable taxonomy index {}", index_path)
+
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError as exc:
+        raise TaxonomyError(f"Taxonomy {source} is not valid JSON: {exc}") from exc
+    taxonomy = compile_taxonomy(data, fingerprint)
+
+    if use_index:
+        try:
+            _write_index(index_path, taxonomy)
+        except OSError:
+            logger.warning("Could not persist taxonomy index to {}", index_dir)
+
+    return taxonomy
+
+
+class TaxonomyRegistry:
+    """Process-wide holder of the active taxonomy with hot reloading."""
+
+    def __init__(
+        self,
+        source: Path,
+        index_dir: Path,
+        reload_interval: float = 30.0,
+    ) -> None:
+        self.source = source
+        self.index_dir = index_dir
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._current: Optional[SkillTaxonomy] = None
+        self._stat_key: Optional[tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._listeners: List[Callable[[SkillTaxonomy], None]] = []
+        self._reloading = threading.Lock()
+
+    def add_listener(self, listener: Callable[[SkillTaxonomy], None]) -> None:
+        """Call ``listener`` with the new taxonomy whenever a reload changes it."""
+
+        self._listeners.append(listener)
+
+    def _stat(self) -> tuple[int, int]:
+        stat = self.source.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self, force: bool = False) -> SkillTaxonomy:
+        """Recompile the taxonomy if the source changed (or ``force``)."""
+
+        with self._lock:
+            stat_key = self._stat()
+            self._checked_at = time.monotonic()
+            if not force and self._current is not None and stat_key == self._stat_key:
+                return self._current
+            taxonomy = load_taxonomy(self.source, self.index_dir)
+            previous = self._current
+            # A single reference assignment is the atomic swap point.
+            self._current = taxonomy
+            self._stat_key = stat_key
+        if previous is not None and previous.fingerprint != taxonomy.fingerprint:
+            logger.info(
+                "Skill taxonomy reloaded: {} -> {} ({} skills)",
+                previous.version,
+                taxonomy.version,
+                len(taxonomy.skills),
+            )
+            for listener in self._listeners:
+                try:
+                    listener(taxonomy)
+                except Exception:
+                    logger.exception("Skill taxonomy listener failed")
+        return taxonomy
+
+    def get(self) -> SkillTaxonomy:
+        """Return the active taxonomy, checking the file in the background.
+
+        Only the first call loads the taxonomy in the calling thread. Later,
+        once every ``reload_interval`` seconds, a background thread checks
+        the file and compiles a changed taxonomy, and callers keep getting
+        the current one meanwhile.
+        """
+
+        current = self._current
+        if current is None:
+            return self.reload()
+        if (
+            self.reload_interval > 0
+            and time.monotonic() - self._checked_at >= self.reload_interval
+            and self._reloading.acquire(blocking=False)
+        ):
+            self._checked_at = time.monotonic()
+            threading.Thread(
+                target=self._reload_in_background, name="taxonomy-reload", daemon=True
+            ).start()
+        return current
+
+    def _reload_in_background(self) -> None:
+        try:
+            self.reload()
+        except (OSError, TaxonomyError):
+            # Keep serving the last good taxonomy if the file is mid-edit.
+            logger.exception("Skill taxonomy reload failed")
+        finally:
+            self._reloading.release()
+
+
+taxonomy_registry = TaxonomyRegistry(
+    source=Path(settings.skill_taxonomy_path or DEFAULT_TAXONOMY_PATH),
+    index_dir=Path(settings.skill_taxonomy_index_dir),
+    reload_interval=settings.skill_taxonomy_reload_seconds,
+)
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """Return the process-wide active skill taxonomy."""
+
+    return taxonomy_registry.get()
@@ -0,0 +1,111 @@
+"""Per-stage timers for the analysis hot path.
+
+Pipeline code marks its stages with ``with stage("skills"): ...``. The time
+goes to the :class:`StageTimer` active in the current context, if any. With
+no active timer, :func:`stage` returns one shared no-op context manager, so
+instrumented code costs a context-variable lookup per stage when metrics are
+off.
+
+Analyses often run in another thread or process, where the caller's context
+is not visible. :func:`call_timed` therefore runs a function under a fresh
+timer in the worker and returns the stage durations with the result, and the
+caller adds them to its own timer with :func:`record_stages`.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, ContextManager, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_NOOP = nullcontext()
+
+
+class StageTimer:
+    """Accumulated seconds per stage name, in the order stages first ran.
+
+    Stages may nest; each records its exclusive time, so the durations add
+    up to the time covered by the outermost stages.
+    """
+
+    __slots__ = ("open", "stages")
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, float] = {}
+        self.open: Optional[_Span] = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def stage(self, name: str) -> _Span:
+        return _Span(self, name)
+
+
+class _Span:
+    __slots__ = ("name", "parent", "started", "timer")
+
+    def __init__(self, timer: StageTimer, name: str) -> None:
+        self.timer = timer
+        self.name = name
+        self.started = 0.0
+        self.parent: Optional[_Span] = None
+
+    def __enter__(self) -> None:
+        self.parent, self.timer.open = self.timer.open, self
+        self.started = time.perf_counter()
+
+    def __exit__(self, *_: object) -> None:
+        elapsed = time.perf_counter() - self.started
+        self.timer.add(self.name, elapsed)
+        if self.parent is not None:
+            self.timer.add(self.parent.name, -elapsed)
+        self.timer.open = self.parent
+
+
+_current_timer: ContextVar[Optional[StageTimer]] = ContextVar(
+    "analysis_stage_timer", default=None
+)
+
+
+def stage(name: str) -> ContextManager[None]:
+    """Time the enclosed block as ``name`` on the active timer, if any."""
+
+    timer = _current_timer.get()
+    return _NOOP if timer is None else timer.stage(name)
+
+
+def active_timer() -> Optional[StageTimer]:
+    return _current_timer.get()
+
+
+def start_timer() -> Tuple[StageTimer, Any]:
+    """Make a new timer active; pass the token to :func:`stop_timer`."""
+
+    timer = StageTimer()
+    return timer, _current_timer.set(timer)
+
+
+def stop_timer(token: Any) -> None:
+    _current_timer.reset(token)
+
+
+def record_stages(stages: Dict[str, float]) -> None:
+    """Add stage durations measured elsewhere to the active timer."""
+
+    timer = _current_timer.get()
+    if timer is not None:
+        for name, seconds in stages.items():
+            timer.add(name, seconds)
+
+
+def call_timed(fn: Callable[..., T], *args: Any) -> Tuple[T, Dict[str, float]]:
+    """Run ``fn(*args)`` under a fresh timer; return its result and stages."""
+
+    timer, token = start_timer()
+    try:
+        return fn(*args), timer.stages
+    finally:
+        stop_timer(token)
@@ -1,7 +1,14 @@
 """Health check endpoints."""
 
+from typing import Any
+
+from anyio import to_thread
 from fastapi import APIRouter
 
+from app.analysis.executor import analysis_executor
+from app.db.session import pool_status
+from app.ml.registry import model_registry
+
 router = APIRouter()
 
 
@@ -9,3 +16,37 @@ router = APIRouter()
 def read_health() -> dict[str, str]:
     """Return a simple status response used by container orchestrators."""
     return {"status": "ok"}
+
+
+@router.get("/db-pool", tags=["health"], summary="Database pool statistics")
+def read_db_pool() -> dict[str, dict[str, Any]]:
+    """Return connection pool occupancy plus checkout latency and wait counts."""
+    return pool_status()
+
+
+@router.get("/threadpool", tags=["health"], summary="Threadpool occupancy")
+async def read_threadpool() -> dict[str, int]:
+    """Return how many of the threads serving sync routes are busy.
+
+    ``waiting`` counts calls queued for a free thread. This route is async so
+    it still answers when every thread is taken.
+    """
+    limiter = to_thread.current_default_thread_limiter()
+    statistics = limiter.statistics()
+    return {
+        "size": int(limiter.total_tokens),
+        "busy": statistics.borrowed_tokens,
+        "waiting": statistics.tasks_waiting,
+    }
+
+
+@router.get("/models", tags=["health"], summary="NLP model load statistics")
+def read_models() -> dict[str, Any]:
+    """Return model load times and memory for the API and analysis workers.
+
+    Worker figures are those reported when the workers warmed up.
+    """
+    return {
+        "api": model_registry.snapshot(),
+        "analysis_workers": list(analysis_executor.worker_models.values()),
+    }
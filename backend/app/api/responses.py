@@ -0,0 +1,143 @@
+"""JSON responses serialised straight from pydantic models.
+
+For a route with ``response_model``, FastAPI does three things with the
+returned value:
+
+1. validates it against the response model;
+2. turns it into plain Python data in JSON mode;
+3. encodes that with :func:`json.dumps` in ``JSONResponse``.
+
+For a model the application has already built and validated, this repeats
+work. Writing an analysis result this way takes about four times as long as
+pydantic-core serialising the model to JSON bytes directly.
+
+The module also holds the helpers for conditional reads: weak ETags built
+from a row's id and ``updated_at``, and ``304 Not Modified`` answers.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from app.core.config import settings
+
+# Clients may keep a copy but must revalidate it before every use.
+CACHE_CONTROL = "private, no-cache"
+
+
+class ModelJSONResponse(Response):
+    """JSON written by pydantic-core, from a model or plain data."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return to_json(content)
+
+
+class TrustedModelRoute(APIRoute):
+    """Route that sends instances of its response model without re-validation.
+
+    With ``FAST_JSON_RESPONSES`` enabled, an endpoint result whose type is
+    the route's ``response_model`` (or its generic origin, as ``Page`` is for
+    ``Page[ResumeUploadSummary]``) is written as a :class:`ModelJSONResponse`.
+    Other results, ORM objects and subclasses with extra fields included, are
+    validated and encoded by FastAPI as usual. Either way the JSON is the
+    same.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        if settings.fast_json_responses:
+            endpoint = self._send_trusted(endpoint, kwargs.get("status_code"))
+        super().__init__(path, endpoint, **kwargs)
+
+    def _is_trusted(self, result: Any) -> bool:
+        model = self.response_model
+        if not (isinstance(model, type) and issubclass(model, BaseModel)):
+            return False
+        return type(result) in (model, model.__pydantic_generic_metadata__["origin"])
+
+    def _respond(
+        self, result: Any, status_code: Optional[int], kwargs: Dict[str, Any]
+    ) -> Any:
+        if not self._is_trusted(result):
+            return result
+        response = ModelJSONResponse(result, status_code=status_code or 200)
+        # Carry over what the endpoint set on an injected ``response: Response``;
+        # FastAPI only merges that into responses it builds itself.
+        for value in kwargs.values():
+            if isinstance(value, Response):
+                response.headers.raw.extend(value.headers.raw)
+                if value.status_code:
+                    response.status_code = value.status_code
+        return response
+
+    def _send_trusted(
+        self, endpoint: Callable[..., Any], status_code: Optional[int]
+    ) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(endpoint):
+
+            @functools.wraps(endpoint)
+            async def send(*args: Any, **kwargs: Any) -> Any:
+                result = await endpoint(*args, **kwargs)
+                return self._respond(result, status_code, kwargs)
+
+        else:
+
+            @functools.wraps(endpoint)
+            def send(*args: Any, **kwargs: Any) -> Any:
+                return self._respond(endpoint(*args, **kwargs), status_code, kwargs)
+
+        # FastAPI reads dependencies from the signature and resolves string
+        # annotations in the function's own module, which is not the
+        # endpoint's; hand it the endpoint's signature already evaluated.
+        send.__signature__ = inspect.signature(endpoint, eval_str=True)
+        return send
+
+
+def weak_etag(resource_id: uuid.UUID, updated_at: datetime, *parts: Any) -> str:
+    """A weak ETag for the current version of a row-backed resource.
+
+    Every write bumps the row's ``updated_at``. Resources that embed other
+    rows pass ``parts`` describing those too, such as their latest
+    ``updated_at`` and count. The tag is weak because the compression
+    middleware sends the same version as identity, gzip or br bytes.
+    """
+
+    key = repr((resource_id, updated_at.isoformat(), *parts)).encode()
+    return f'W/"{hashlib.blake2b(key, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether ``If-None-Match`` names ``etag`` (weak comparison, RFC 9110)."""
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -2,12 +2,16 @@
 
 from fastapi import APIRouter
 
-from . import analyze
+from . import analyses, analyze, comparisons, search, uploads
 
 router = APIRouter()
 
 # Mount sub-routers
 router.include_router(analyze.router)
+router.include_router(analyses.router)
+router.include_router(uploads.router)
+router.include_router(comparisons.router)
+router.include_router(search.router)
 
 
 @router.get("/status", tags=["meta"], summary="API status")
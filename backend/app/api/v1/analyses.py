@@ -0,0 +1,300 @@
+"""Endpoints for persisted, asynchronously processed resume analyses."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, List, Sequence, Tuple
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from loguru import logger
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from app.api.responses import (
+    TrustedModelRoute,
+    etag_matches,
+    not_modified,
+    set_etag,
+    weak_etag,
+)
+from app.db.models import (
+    ResumeAnalysis,
+    ResumeAnalysisStatus,
+    ResumeUpload,
+    ResumeUploadStatus,
+)
+from app.db.pagination import (
+    InvalidCursorError,
+    keyset_paginate,
+    projection,
+    split_page,
+)
+from app.db.session import AsyncSessionLocal, get_async_db, get_db
+from app.schemas.pagination import Page
+from app.schemas.resume import (
+    ResumeAnalysisBatchCreate,
+    ResumeAnalysisCreate,
+    ResumeAnalysisRead,
+    ResumeAnalysisSummary,
+)
+from app.tasks.analysis import (
+    TERMINAL_STATUSES,
+    run_resume_analysis,
+    run_resume_analysis_batch,
+)
+
+router = APIRouter(prefix="/analyses", tags=["analysis"], route_class=TrustedModelRoute)
+
+# How often a long-poll request re-checks the analysis status.
+POLL_INTERVAL_SECONDS = 0.5
+
+
+def _check_upload(
+    upload: ResumeUpload | None,
+    payload: ResumeAnalysisCreate,
+    index: int | None = None,
+) -> None:
+    where = "" if index is None else f" (item {index})"
+    if upload is None or upload.user_id != payload.user_id:
+        raise HTTPException(status_code=404, detail=f"Resume upload not found{where}.")
+    if payload.text is None and (
+        upload.upload_status is not ResumeUploadStatus.COMPLETED
+        or upload.content_sha256 is None
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Resume upload has no extracted text yet{where}.",
+        )
+
+
+def _queue(
+    db: Session, analysis_ids: Sequence[uuid.UUID], send: Callable[[], Any]
+) -> None:
+    """Call ``send`` to queue the task for committed ``PENDING`` analyses.
+
+    If the broker call fails the analyses are marked ``FAILED``, so they do
+    not stay pending with no task to finish them and long-poll readers
+    return, and the client gets ``503``.
+    """
+
+    try:
+        send()
+    except Exception as exc:
+        logger.exception("Could not queue {} analyses", len(analysis_ids))
+        db.rollback()
+        db.execute(
+            update(ResumeAnalysis)
+            .where(ResumeAnalysis.id.in_(analysis_ids))
+            .values(status=ResumeAnalysisStatus.FAILED)
+        )
+        db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not queue the analysis; try again later.",
+        ) from exc
+
+
+@router.post(
+    "",
+    response_model=ResumeAnalysisRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a resume analysis",
+)
+def create_analysis(
+    payload: ResumeAnalysisCreate, db: Session = Depends(get_db)
+) -> ResumeAnalysis:
+    """Create a ``PENDING`` analysis row and hand the work to a Celery worker.
+
+    Without ``text`` the worker analyses the text already extracted from the
+    upload, read from the text store; the file itself is not parsed again.
+    """
+
+    _check_upload(db.get(ResumeUpload, payload.resume_upload_id), payload)
+
+    analysis = ResumeAnalysis(
+        **payload.model_dump(exclude={"text"}),
+        status=ResumeAnalysisStatus.PENDING,
+    )
+    db.add(analysis)
+    db.commit()
+    db.refresh(analysis)
+
+    _queue(
+        db,
+        [analysis.id],
+        lambda: run_resume_analysis.delay(str(analysis.id), payload.text),
+    )
+    return analysis
+
+
+@router.post(
+    ":batch",
+    response_model=List[ResumeAnalysisRead],
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue many resume analyses",
+)
+def create_analysis_batch(
+    payload: ResumeAnalysisBatchCreate, db: Session = Depends(get_db)
+) -> List[ResumeAnalysis]:
+    """Create ``PENDING`` rows for every item and process them in one task.
+
+    The worker persists the whole batch with a constant number of statements,
+    see :func:`app.analysis.persistence.bulk_record_analysis_results`.
+    """
+
+    upload_ids = {item.resume_upload_id for item in payload.analyses}
+    uploads = {
+        upload.id: upload
+        for upload in db.scalars(
+            select(ResumeUpload).where(ResumeUpload.id.in_(upload_ids))
+        )
+    }
+    for index, item in enumerate(payload.analyses):
+        _check_upload(uploads.get(item.resume_upload_id), item, index)
+
+    analyses = [
+        ResumeAnalysis(
+            **item.model_dump(exclude={"text"}),
+            status=ResumeAnalysisStatus.PENDING,
+        )
+        for item in payload.analyses
+    ]
+    db.add_all(analyses)
+    db.flush()
+    analysis_ids = [analysis.id for analysis in analyses]
+    texts = {
+        str(analysis_id): item.text
+        for analysis_id, item in zip(analysis_ids, payload.analyses, strict=True)
+        if item.text is not None
+    }
+    db.commit()
+
+    _queue(
+        db,
+        analysis_ids,
+        lambda: run_resume_analysis_batch.delay(
+            [str(value) for value in analysis_ids], texts
+        ),
+    )
+
+    # Reload the committed rows with one query instead of one refresh each.
+    loaded = {
+        analysis.id: analysis
+        for analysis in db.scalars(
+            select(ResumeAnalysis)
+            .where(ResumeAnalysis.id.in_(analysis_ids))
+            .options(
+                selectinload(ResumeAnalysis.scores),
+                selectinload(ResumeAnalysis.feedback_items),
+            )
+        )
+    }
+    return [loaded[analysis_id] for analysis_id in analysis_ids]
+
+
+@router.get(
+    "",
+    response_model=Page[ResumeAnalysisSummary],
+    summary="List a user's analyses, newest first",
+)
+async def list_analyses(
+    user_id: uuid.UUID = Query(...),
+    status_filter: ResumeAnalysisStatus | None = Query(default=None, alias="status"),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+) -> Page[ResumeAnalysisSummary]:
+    """Page through analyses without loading scores, feedback or job text."""
+
+    statement = select(*projection(ResumeAnalysis, ResumeAnalysisSummary)).where(
+        ResumeAnalysis.user_id == user_id
+    )
+    if status_filter is not None:
+        statement = statement.where(ResumeAnalysis.status == status_filter)
+    try:
+        statement = keyset_paginate(
+            statement, ResumeAnalysis.created_at, ResumeAnalysis.id, cursor, limit
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    rows = (await db.execute(statement)).all()
+    items, next_cursor = split_page(rows, limit, ResumeAnalysisSummary.model_validate)
+    return Page(items=items, next_cursor=next_cursor)
+
+
+async def _read_status(
+    analysis_id: uuid.UUID,
+) -> Tuple[ResumeAnalysisStatus, datetime] | None:
+    async with AsyncSessionLocal() as db:
+        row = (
+            await db.execute(
+                select(ResumeAnalysis.status, ResumeAnalysis.updated_at).where(
+                    ResumeAnalysis.id == analysis_id
+                )
+            )
+        ).one_or_none()
+        return None if row is None else tuple(row)
+
+
+async def _load_analysis(analysis_id: uuid.UUID) -> ResumeAnalysisRead | None:
+    async with AsyncSessionLocal() as db:
+        analysis = await db.scalar(
+            select(ResumeAnalysis)
+            .where(ResumeAnalysis.id == analysis_id)
+            .options(
+                selectinload(ResumeAnalysis.scores),
+                selectinload(ResumeAnalysis.feedback_items),
+            )
+        )
+        return None if analysis is None else ResumeAnalysisRead.model_validate(analysis)
+
+
+@router.get(
+    "/{analysis_id}",
+    response_model=ResumeAnalysisRead,
+    summary="Read (or long-poll) an analysis",
+)
+async def read_analysis(
+    analysis_id: uuid.UUID,
+    response: Response,
+    wait: float = Query(
+        default=0.0,
+        ge=0.0,
+        le=30.0,
+        description="Seconds to wait for the analysis to finish before answering.",
+    ),
+    if_none_match: str | None = Header(default=None),
+) -> ResumeAnalysisRead | Response:
+    """Return an analysis, optionally waiting until it reaches a final state.
+
+    While waiting only the status column is polled, each time on a short-lived
+    async session so no connection or thread is held between polls; the full
+    object graph is loaded once, when answering. If ``If-None-Match`` already
+    names the current version, the answer is ``304 Not Modified`` and the
+    graph is not loaded at all.
+    """
+
+    deadline = time.monotonic() + wait
+    while True:
+        current = await _read_status(analysis_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Analysis not found.")
+        current_status, updated_at = current
+        if current_status in TERMINAL_STATUSES or time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    etag = weak_etag(analysis_id, updated_at)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    analysis = await _load_analysis(analysis_id)
+    if analysis is None:
+        raise HTTPException(status_code=404, detail="Analysis not found.")
+    # Tag what is actually sent, which may be newer than the polled version.
+    set_etag(response, weak_etag(analysis_id, analysis.updated_at))
+    return analysis
@@ -7,224 +7,215 @@ runs entirely with Python standard libraries for predictable, free hosting.
 
 from __future__ import annotations
 
-import math
-import re
-from typing import Iterable, List, Set
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter
-
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from loguru import logger
+
+from app.analysis.cache import (
+    analysis_cache,
+    cache_key,
+    normalize_job_description,
+    normalize_text,
+)
+from app.analysis.executor import analysis_executor, run_analysis, stream_analysis
+from app.analysis.pipeline import SCORING_FINGERPRINT, analyze_text
+from app.analysis.taxonomy import get_taxonomy
+from app.analysis.timing import StageTimer, stage, start_timer, stop_timer
+from app.api.responses import ModelJSONResponse, TrustedModelRoute
+from app.core.config import settings
+from app.core.metrics import observe_analysis, server_timing
 from app.schemas.analysis import (
-    ContactSignals,
-    FeedbackItem,
-    Metric,
+    ResumeAnalyzeEvent,
     ResumeAnalyzeRequest,
     ResumeAnalyzeResponse,
-    SectionPresence,
+    ResumeBatchAnalyzeRequest,
+    ResumeBatchItem,
+    ResumeBatchResult,
 )
 
-router = APIRouter(prefix="/analyze", tags=["analysis"])
+router = APIRouter(prefix="/analyze", tags=["analysis"], route_class=TrustedModelRoute)
+
+
+def _render(result: ResumeAnalyzeResponse) -> Response:
+    """Write ``result`` directly with ``FAST_JSON_RESPONSES``, else as FastAPI would."""
+
+    if settings.fast_json_responses:
+        return ModelJSONResponse(result)
+    return JSONResponse(jsonable_encoder(result))
 
 
-EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
-PHONE_RE = re.compile(
-    r"(?:(?:\+?\d{1,3}[\s.-])?(?:\(?\d{3}\)?[\s.-]?)?\d{3}[\s.-]?\d{4})"
+@router.post(
+    "/resume", response_model=ResumeAnalyzeResponse, summary="Analyze resume text"
 )
-WORD_RE = re.compile(r"\b\w+\b", re.UNICODE)
-SENTENCE_RE = re.compile(r"[^.!?]+[.!?]", re.UNICODE)
-
-# Basic, representative skills/keywords. This can be extended safely without external deps.
-DEFAULT_SKILLS: Set[str] = {
-    "python",
-    "java",
-    "javascript",
-    "typescript",
-    "sql",
-    "postgres",
-    "mysql",
-    "aws",
-    "azure",
-    "gcp",
-    "docker",
-    "kubernetes",
-    "react",
-    "node",
-    "django",
-    "flask",
-    "fastapi",
-    "c++",
-    "c#",
-    "go",
-    "rust",
-    "html",
-    "css",
-    "graphql",
-    "tensorflow",
-    "pytorch",
-    "nlp",
-    "machine learning",
-    "ml",
-    "ai",
-}
-
-
-def _word_count(text: str) -> int:
-    return len(WORD_RE.findall(text))
-
-
-def _sentence_count(text: str) -> int:
-    return max(1, len(SENTENCE_RE.findall(text)))
-
-
-def _contains_any(text: str, keys: Iterable[str]) -> List[str]:
-    keys_norm = [k.lower() for k in keys]
-    text_norm = text.lower()
-    found: List[str] = []
-    for k in keys_norm:
-        if k in text_norm:
-            found.append(k)
-    return found
-
-
-@router.post("/resume", response_model=ResumeAnalyzeResponse, summary="Analyze resume text")
-def analyze_resume(payload: ResumeAnalyzeRequest) -> ResumeAnalyzeResponse:
-    # Guardrail: enforce max size and mark truncated state if we cut input.
-    original_text = payload.text
-    truncated = False
-    if len(original_text) > 100_000:
-        text = original_text[:100_000]
-        truncated = True
-    else:
-        text = original_text
-
-    # Core signals
-    word_count = _word_count(text)
-    sentence_count = _sentence_count(text)
-    emails = EMAIL_RE.findall(text)
-    phones = PHONE_RE.findall(text)
-
-    sections = SectionPresence(
-        summary=any(s in text.lower() for s in ["summary", "objective", "profile"]),
-        experience="experience" in text.lower() or "employment" in text.lower(),
-        education="education" in text.lower(),
-        projects="project" in text.lower() or "projects" in text.lower(),
-        skills="skills" in text.lower() or "technologies" in text.lower(),
-        certifications="certification" in text.lower() or "certifications" in text.lower(),
-    )
-
-    # Keyword detection
-    detected_skills = sorted(set(_contains_any(text, DEFAULT_SKILLS)))
-
-    # If a job description is available, also surface any overlaps
-    if payload.job_description:
-        jd_hits = _contains_any(payload.job_description, DEFAULT_SKILLS)
-        for hit in jd_hits:
-            if hit not in detected_skills:
-                detected_skills.append(hit)
-        detected_skills.sort()
-
-    # Metrics (0-100)
-    coverage_hits = sum(
-        1
-        for flag in [
-            sections.summary,
-            sections.experience,
-            sections.education,
-            sections.projects,
-            sections.skills,
-        ]
-        if flag
-    )
-    coverage_score = (coverage_hits / 5) * 100.0
-
-    length_optimal_low, length_optimal_high = 250, 900
-    if word_count < length_optimal_low:
-        length_score = max(0.0, (word_count / length_optimal_low) * 100.0)
-    elif word_count > length_optimal_high:
-        # Penalize overly long resumes.
-        over = min(2_000, word_count)
-        length_score = max(
-            20.0, 100.0 - ((over - length_optimal_high) / (2_000 - length_optimal_high)) * 80.0
-        )
-    else:
-        length_score = 100.0
-
-    contact = ContactSignals(
-        has_email=len(emails) > 0,
-        has_phone=len(phones) > 0,
-        email_count=len(emails),
-        phone_count=len(phones),
-    )
-    contact_score = 100.0 if (contact.has_email and contact.has_phone) else 50.0 if contact.has_email else 0.0
-
-    skills_score = min(100.0, (len(detected_skills) / 10) * 100.0)
-
-    # Weighted aggregate
-    overall = (
-        0.30 * coverage_score
-        + 0.20 * length_score
-        + 0.30 * contact_score
-        + 0.20 * skills_score
-    )
-    overall = round(overall, 1)
-
-    metrics = {
-        "coverage": Metric(key="coverage", label="Section coverage", value=round(coverage_score, 1)),
-        "length": Metric(key="length", label="Length appropriateness", value=round(length_score, 1), details=f"{word_count} words, {sentence_count} sentences"),
-        "contact": Metric(key="contact", label="Contact details present", value=round(contact_score, 1)),
-        "skills": Metric(key="skills", label="Skills & keywords", value=round(skills_score, 1), details=f"{len(detected_skills)} detected"),
-    }
-
-    # Feedback generation
-    feedback: List[FeedbackItem] = []
-    if not contact.has_email:
-        feedback.append(
-            FeedbackItem(
-                severity="high",
-                message="No email address detected.",
-                recommendation="Add a professional email to the header section.",
-            )
-        )
-    if not contact.has_phone:
-        feedback.append(
-            FeedbackItem(
-                severity="medium",
-                message="No phone number detected.",
-                recommendation="Consider adding a mobile number for recruiter outreach.",
-            )
-        )
-    if coverage_hits < 4:
-        feedback.append(
-            FeedbackItem(
-                severity="medium",
-                message="Some core sections are missing (summary, experience, education, projects, skills).",
-                recommendation="Add the missing sections to improve scanning and ATS parsing.",
+async def analyze_resume(payload: ResumeAnalyzeRequest) -> Response:
+    """Analyse one resume; time its stages when metrics are enabled.
+
+    Stage timings feed ``/metrics`` and, with ``SERVER_TIMING_ENABLED``, the
+    ``Server-Timing`` response header.
+    """
+
+    if not settings.metrics_enabled:
+        return _render(await run_analysis(payload.text, payload.job_description))
+
+    started = time.perf_counter()
+    timer, token = start_timer()
+    try:
+        result = await run_analysis(payload.text, payload.job_description)
+        with stage("serialize"):
+            response = _render(result)
+    finally:
+        stop_timer(token)
+    total = time.perf_counter() - started
+
+    observe_analysis(len(payload.text), result, timer.stages, total)
+    if settings.server_timing_enabled:
+        response.headers["Server-Timing"] = server_timing(timer.stages, total)
+    return response
+
+
+@router.post(
+    "/resume:stream",
+    response_class=StreamingResponse,
+    summary="Analyze resume text, streaming results stage by stage",
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": (
+                "One ResumeAnalyzeEvent JSON object per line: metrics and "
+                "feedback as their stage finishes, then the full result."
+            ),
+        }
+    },
+)
+async def analyze_resume_stream(payload: ResumeAnalyzeRequest) -> StreamingResponse:
+    """Analyse one resume and stream partial results as NDJSON.
+
+    Clients can render the core metrics once the feature scan is done,
+    without waiting for the entity and semantic stages. The final line has
+    the same result as ``POST /analyze/resume``. A failure after the stream
+    has started is reported as a last ``error`` line.
+    """
+
+    # Answer 429 now, while a status code can still be sent.
+    analysis_executor.ensure_capacity()
+
+    async def stream() -> AsyncIterator[bytes]:
+        started = time.perf_counter()
+        timer = StageTimer()
+        result: Optional[ResumeAnalyzeResponse] = None
+        try:
+            async for event in stream_analysis(
+                payload.text, payload.job_description, timer
+            ):
+                result = event.result or result
+                yield event.__pydantic_serializer__.to_json(event) + b"\n"
+        except Exception as exc:  # the status line is already sent
+            logger.exception("Streamed analysis failed")
+            event = ResumeAnalyzeEvent(
+                type="error", error=str(exc) or exc.__class__.__name__
             )
-        )
-    if word_count < length_optimal_low:
-        feedback.append(
-            FeedbackItem(
-                severity="low",
-                message="Resume appears too short.",
-                recommendation="Expand experience bullets with measurable outcomes and impact.",
+            yield event.__pydantic_serializer__.to_json(event) + b"\n"
+            return
+        if settings.metrics_enabled and result is not None:
+            total = time.perf_counter() - started
+            observe_analysis(len(payload.text), result, timer.stages, total)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/resumes:batch",
+    response_class=StreamingResponse,
+    summary="Analyze a batch of resumes",
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": (
+                "One ResumeBatchResult JSON object per line, emitted in "
+                "completion order."
+            ),
+        }
+    },
+)
+async def analyze_resume_batch(
+    payload: ResumeBatchAnalyzeRequest,
+) -> StreamingResponse:
+    """Score many resumes on the analysis executor and stream the results."""
+
+    job_description = payload.job_description
+    texts = [item.text for item in payload.resumes]
+
+    def lookup() -> Tuple[List[str], List[str], Dict[str, ResumeAnalyzeResponse]]:
+        # Normalising and hashing hundreds of large resumes is kept off the
+        # event loop. The normalised texts are the ones analysed, with the
+        # cache on or off, so the cache never changes a result.
+        normalized = [normalize_text(text) for text in texts]
+        if not settings.analysis_cache_enabled:
+            return normalized, [], {}
+        fingerprint = get_taxonomy().fingerprint
+        analysis_cache.ensure_generation(f"{SCORING_FINGERPRINT}/{fingerprint}")
+        keys = [cache_key(text, job_description, fingerprint) for text in normalized]
+        return normalized, keys, analysis_cache.get_many(keys)
+
+    job_description = normalize_job_description(job_description)
+    texts, keys, cached = await run_in_threadpool(lookup)
+
+    # Reject the whole batch up front rather than failing items mid-stream.
+    misses = len(payload.resumes) - sum(1 for key in keys if key in cached)
+    analysis_executor.ensure_capacity(misses)
+
+    async def run(index: int, item: ResumeBatchItem) -> ResumeBatchResult:
+        key: Optional[str] = keys[index] if keys else None
+        hit = cached.get(key) if key else None
+        if hit is not None:
+            return ResumeBatchResult(index=index, id=item.id, result=hit)
+        try:
+            result = await analysis_executor.run(
+                analyze_text, texts[index], job_description
             )
-        )
-    elif word_count > 1200:
-        feedback.append(
-            FeedbackItem(
-                severity="low",
-                message="Resume may be overly long.",
-                recommendation="Trim older roles or consolidate repetitive bullets.",
+        except Exception as exc:  # reported per item, batch continues
+            logger.exception("Batch analysis failed for item {}", index)
+            return ResumeBatchResult(
+                index=index, id=item.id, error=str(exc) or exc.__class__.__name__
             )
-        )
-
-    return ResumeAnalyzeResponse(
-        overall_score=overall,
-        metrics=metrics,
-        sections=sections,
-        contact=contact,
-        detected_skills=detected_skills,
-        word_count=word_count,
-        sentence_count=sentence_count,
-        truncated=truncated,
-        feedback=feedback,
-    )
+        if key:
+            await run_in_threadpool(analysis_cache.set, key, result)
+        return ResumeBatchResult(index=index, id=item.id, result=result)
+
+    async def stream() -> AsyncIterator[bytes]:
+        tasks = [
+            asyncio.ensure_future(run(index, item))
+            for index, item in enumerate(payload.resumes)
+        ]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                # Models are written by pydantic-core as they are, with no
+                # dict round trip or re-validation.
+                line = await completed
+                yield line.__pydantic_serializer__.to_json(line) + b"\n"
+        finally:
+            # Client went away or we are done: drop work that has not started.
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.get("/cache", summary="Analysis cache statistics")
+def read_analysis_cache_stats() -> Dict[str, int]:
+    """Return hit/miss counters for the analysis result cache."""
+
+    return analysis_cache.snapshot()
+
+
+@router.get("/executor", summary="Analysis executor statistics")
+def read_analysis_executor_stats() -> Dict[str, Any]:
+    """Return backend configuration and queue depth for analysis work."""
+
+    return analysis_executor.snapshot()
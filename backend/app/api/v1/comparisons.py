@@ -0,0 +1,224 @@
+"""Endpoints listing, reading and ranking comparison batches."""
+
+from __future__ import annotations
+
+import uuid
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from loguru import logger
+from sqlalchemy import func, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from app.api.responses import (
+    TrustedModelRoute,
+    etag_matches,
+    not_modified,
+    set_etag,
+    weak_etag,
+)
+from app.db.models import (
+    BatchMember,
+    ComparisonBatch,
+    ComparisonBatchStatus,
+    ResumeAnalysis,
+    ResumeUpload,
+)
+from app.db.pagination import (
+    InvalidCursorError,
+    keyset_paginate,
+    projection,
+    split_page,
+)
+from app.db.session import get_async_db, get_db
+from app.schemas.comparison import (
+    ComparisonBatchRankRequest,
+    ComparisonBatchRead,
+    ComparisonBatchSummary,
+)
+from app.schemas.pagination import Page
+from app.tasks.comparisons import rank_comparison_batch
+
+router = APIRouter(
+    prefix="/comparison-batches", tags=["comparisons"], route_class=TrustedModelRoute
+)
+
+
+def _analysis_children(path):
+    """Loader options for the scores and feedback below an analysis path."""
+
+    return (
+        path.selectinload(ResumeAnalysis.scores),
+        path.selectinload(ResumeAnalysis.feedback_items),
+    )
+
+
+def _member_count():
+    return (
+        select(func.count())
+        .where(BatchMember.batch_id == ComparisonBatch.id)
+        .correlate(ComparisonBatch)
+        .scalar_subquery()
+        .label("member_count")
+    )
+
+
+def _graph_version(batch_id: uuid.UUID):
+    """Latest ``updated_at`` and row count over everything a batch read returns.
+
+    Scores and feedback are not listed: writing them also bumps their
+    analysis. A count of zero means the batch does not exist.
+    """
+
+    members = select(BatchMember).where(BatchMember.batch_id == batch_id).subquery()
+    rows = union_all(
+        select(ComparisonBatch.updated_at).where(ComparisonBatch.id == batch_id),
+        select(members.c.updated_at),
+        select(ResumeUpload.updated_at).join(
+            members, members.c.resume_upload_id == ResumeUpload.id
+        ),
+        select(ResumeAnalysis.updated_at).join(
+            members, members.c.resume_upload_id == ResumeAnalysis.resume_upload_id
+        ),
+        select(ResumeAnalysis.updated_at).join(
+            members, members.c.resume_analysis_id == ResumeAnalysis.id
+        ),
+        select(ResumeAnalysis.updated_at).where(
+            ResumeAnalysis.comparison_batch_id == batch_id
+        ),
+    ).subquery()
+    return select(func.max(rows.c.updated_at), func.count())
+
+
+@router.get(
+    "",
+    response_model=Page[ComparisonBatchSummary],
+    summary="List a user's comparison batches, newest first",
+)
+async def list_comparison_batches(
+    user_id: uuid.UUID = Query(...),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+) -> Page[ComparisonBatchSummary]:
+    """Page through batches with a member count instead of nested members."""
+
+    try:
+        statement = keyset_paginate(
+            select(
+                *projection(ComparisonBatch, ComparisonBatchSummary), _member_count()
+            ).where(ComparisonBatch.user_id == user_id),
+            ComparisonBatch.created_at,
+            ComparisonBatch.id,
+            cursor,
+            limit,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    rows = (await db.execute(statement)).all()
+    items, next_cursor = split_page(rows, limit, ComparisonBatchSummary.model_validate)
+    return Page(items=items, next_cursor=next_cursor)
+
+
+@router.get(
+    "/{batch_id}",
+    response_model=ComparisonBatchRead,
+    summary="Read a comparison batch with its members and analyses",
+)
+async def read_comparison_batch(
+    batch_id: uuid.UUID,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> ComparisonBatch | Response:
+    """Load the whole nested graph with one ``SELECT ... IN`` per relationship.
+
+    Every relationship the response serialises is listed here; anything
+    missing would fail under the async session instead of lazy loading.
+    A client sending the current ETag in ``If-None-Match`` gets ``304`` after
+    a single aggregate query, see :func:`_graph_version`.
+    """
+
+    updated_at, row_count = (await db.execute(_graph_version(batch_id))).one()
+    if not row_count:
+        raise HTTPException(status_code=404, detail="Comparison batch not found.")
+    etag = weak_etag(batch_id, updated_at, row_count)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    members = selectinload(ComparisonBatch.members)
+    member_upload_analyses = members.selectinload(
+        BatchMember.resume_upload
+    ).selectinload(ResumeUpload.analyses)
+    member_analysis = members.selectinload(BatchMember.resume_analysis)
+    batch_analyses = selectinload(ComparisonBatch.analyses)
+    batch = await db.scalar(
+        select(ComparisonBatch)
+        .where(ComparisonBatch.id == batch_id)
+        .options(
+            *_analysis_children(member_upload_analyses),
+            *_analysis_children(member_analysis),
+            *_analysis_children(batch_analyses),
+        )
+    )
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Comparison batch not found.")
+    set_etag(response, etag)
+    return batch
+
+
+@router.post(
+    "/{batch_id}/rank",
+    response_model=ComparisonBatchSummary,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Rank a batch's members against a job description",
+)
+def rank_batch(
+    batch_id: uuid.UUID,
+    payload: ComparisonBatchRankRequest,
+    db: Session = Depends(get_db),
+) -> ComparisonBatchSummary:
+    """Queue a ranking of every member in one worker task.
+
+    Progress is visible on the batch status; once it is ``completed`` each
+    member's ``position`` holds its rank and ``resume_analysis`` the
+    comparison analysis. See :func:`app.analysis.ranking.rank_resumes`.
+
+    The batch is marked ``processing`` under its row lock before the task is
+    queued, so a second request racing this one gets ``409`` instead of
+    queueing another ranking.
+    """
+
+    batch = db.get(ComparisonBatch, batch_id, with_for_update=True)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Comparison batch not found.")
+    if batch.status is ComparisonBatchStatus.PROCESSING:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Comparison batch is already being ranked.",
+        )
+
+    previous_status = batch.status
+    if payload.job_title is not None:
+        batch.job_title = payload.job_title
+    batch.status = ComparisonBatchStatus.PROCESSING
+    db.commit()
+
+    try:
+        rank_comparison_batch.delay(str(batch_id), payload.job_description)
+    except Exception as exc:
+        logger.exception("Could not queue ranking of comparison batch {}", batch_id)
+        # Release the batch so the client can retry once the broker is back.
+        batch.status = previous_status
+        db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not queue the ranking; try again later.",
+        ) from exc
+
+    row = db.execute(
+        select(
+            *projection(ComparisonBatch, ComparisonBatchSummary), _member_count()
+        ).where(ComparisonBatch.id == batch_id)
+    ).one()
+    return ComparisonBatchSummary.model_validate(row)
@@ -0,0 +1,64 @@
+"""Endpoints searching a user's stored resumes."""
+
+from __future__ import annotations
+
+from typing import List
+
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.analysis.search_index import (
+    SKILL_TERM_PREFIX,
+    query_terms,
+    search_statement,
+)
+from app.analysis.taxonomy import get_taxonomy
+from app.api.responses import TrustedModelRoute
+from app.db.session import get_async_db
+from app.schemas.search import (
+    ResumeSearchHit,
+    ResumeSearchRequest,
+    ResumeSearchResponse,
+)
+
+router = APIRouter(prefix="/search", tags=["search"], route_class=TrustedModelRoute)
+
+
+def _job_terms(job_description: str) -> List[str]:
+    # A taxonomy reload recompiles the matcher and a long job description
+    # takes a while to tokenise; both run in the threadpool.
+    return query_terms(job_description, get_taxonomy().matcher)
+
+
+@router.post(
+    "/resumes",
+    response_model=ResumeSearchResponse,
+    summary="Find the stored resumes that best match a job description",
+)
+async def search_resumes(
+    payload: ResumeSearchRequest, db: AsyncSession = Depends(get_async_db)
+) -> ResumeSearchResponse:
+    """Rank the user's indexed resumes with BM25 over the job's terms.
+
+    Resumes are indexed once an analysis of them completes; see
+    :mod:`app.analysis.search_index`.
+    """
+
+    terms = await run_in_threadpool(_job_terms, payload.job_description)
+    if not terms:
+        return ResumeSearchResponse(items=[])
+    rows = await db.execute(search_statement(payload.user_id, terms, payload.limit))
+    return ResumeSearchResponse(
+        items=[
+            ResumeSearchHit(
+                resume_upload_id=row.resume_upload_id,
+                original_filename=row.original_filename,
+                score=row.score,
+                matched_skills=sorted(
+                    term.removeprefix(SKILL_TERM_PREFIX) for term in row.matched_skills
+                ),
+            )
+            for row in rows
+        ]
+    )
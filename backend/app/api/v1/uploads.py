@@ -0,0 +1,235 @@
+"""Endpoints accepting resume files and reporting their processing status."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.analysis.extraction import UnsupportedFileTypeError, resolve_content_type
+from app.api.responses import (
+    TrustedModelRoute,
+    etag_matches,
+    not_modified,
+    set_etag,
+    weak_etag,
+)
+from app.core.config import settings
+from app.db.models import ResumeAnalysis, ResumeUpload, ResumeUploadStatus, User
+from app.db.pagination import (
+    InvalidCursorError,
+    keyset_paginate,
+    projection,
+    split_page,
+)
+from app.db.session import SessionLocal, get_async_db
+from app.schemas.pagination import Page
+from app.schemas.resume import ResumeUploadRead, ResumeUploadSummary
+from app.storage.files import UploadTooLargeError, save_stream, upload_path
+from app.storage.text_store import text_store
+from app.tasks.uploads import extract_resume_text
+
+router = APIRouter(prefix="/uploads", tags=["uploads"], route_class=TrustedModelRoute)
+
+
+def _user_exists(user_id: uuid.UUID) -> bool:
+    with SessionLocal() as db:
+        return db.get(User, user_id) is not None
+
+
+def _create_upload(values: dict, extracted: bool) -> ResumeUploadRead:
+    with SessionLocal() as db:
+        if extracted:
+            upload = ResumeUpload(
+                **values,
+                upload_status=ResumeUploadStatus.COMPLETED,
+                processed_at=datetime.now(timezone.utc),
+            )
+        else:
+            upload = ResumeUpload(**values, upload_status=ResumeUploadStatus.PENDING)
+        db.add(upload)
+        db.commit()
+        db.refresh(upload)
+        return ResumeUploadRead.model_validate(upload)
+
+
+@router.post(
+    "",
+    response_model=ResumeUploadRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Upload a resume file",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/pdf": {"schema": {"type": "string", "format": "binary"}},
+                "application/vnd.openxmlformats-officedocument."
+                "wordprocessingml.document": {
+                    "schema": {"type": "string", "format": "binary"}
+                },
+                "text/plain": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def create_upload(
+    request: Request,
+    user_id: uuid.UUID = Query(...),
+    filename: str = Query(..., min_length=1, max_length=512),
+) -> ResumeUploadRead:
+    """Stream the raw request body to storage and queue text extraction.
+
+    The file is sent as the request body (not multipart) so it can be written
+    to disk chunk by chunk as it arrives; memory use does not depend on the
+    file size.
+    """
+
+    try:
+        content_type = resolve_content_type(
+            request.headers.get("content-type"), filename
+        )
+    except UnsupportedFileTypeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(exc)
+        ) from exc
+
+    declared_size = request.headers.get("content-length")
+    if (
+        declared_size
+        and declared_size.isdigit()
+        and int(declared_size) > settings.upload_max_bytes
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Upload exceeds the {settings.upload_max_bytes} byte limit.",
+        )
+
+    if not await run_in_threadpool(_user_exists, user_id):
+        raise HTTPException(status_code=404, detail="User not found.")
+
+    stored_filename = f"{uuid.uuid4().hex}{Path(filename).suffix.lower()}"
+    try:
+        size, content_sha256 = await save_stream(
+            request.stream(), upload_path(stored_filename), settings.upload_max_bytes
+        )
+    except UploadTooLargeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)
+        ) from exc
+    if size == 0:
+        upload_path(stored_filename).unlink(missing_ok=True)
+        raise HTTPException(status_code=400, detail="Uploaded file is empty.")
+
+    # Identical bytes were extracted before (possibly for another user).
+    already_extracted = await run_in_threadpool(text_store.exists, content_sha256)
+    upload = await run_in_threadpool(
+        _create_upload,
+        {
+            "user_id": user_id,
+            "original_filename": Path(filename).name,
+            "stored_filename": stored_filename,
+            "content_type": content_type,
+            "file_size_bytes": size,
+            "content_sha256": content_sha256,
+        },
+        already_extracted,
+    )
+    if not already_extracted:
+        extract_resume_text.delay(str(upload.id))
+    return upload
+
+
+@router.get(
+    "",
+    response_model=Page[ResumeUploadSummary],
+    summary="List a user's uploads, newest first",
+)
+async def list_uploads(
+    user_id: uuid.UUID = Query(...),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+) -> Page[ResumeUploadSummary]:
+    try:
+        statement = keyset_paginate(
+            select(*projection(ResumeUpload, ResumeUploadSummary)).where(
+                ResumeUpload.user_id == user_id
+            ),
+            ResumeUpload.created_at,
+            ResumeUpload.id,
+            cursor,
+            limit,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    rows = (await db.execute(statement)).all()
+    items, next_cursor = split_page(rows, limit, ResumeUploadSummary.model_validate)
+    return Page(items=items, next_cursor=next_cursor)
+
+
+@router.get(
+    "/{upload_id}",
+    response_model=ResumeUploadRead,
+    summary="Read an upload and its processing status",
+)
+async def read_upload(
+    upload_id: uuid.UUID,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> ResumeUpload | Response:
+    """Read an upload with its analyses, or ``304`` if ``If-None-Match`` is current.
+
+    The ETag covers the upload row and the latest change to any of its
+    analyses, which a single aggregate query reads before the graph is loaded.
+    """
+
+    version = (
+        await db.execute(
+            select(
+                ResumeUpload.updated_at,
+                func.max(ResumeAnalysis.updated_at),
+                func.count(ResumeAnalysis.id),
+            )
+            .outerjoin(
+                ResumeAnalysis, ResumeAnalysis.resume_upload_id == ResumeUpload.id
+            )
+            .where(ResumeUpload.id == upload_id)
+            .group_by(ResumeUpload.id)
+        )
+    ).one_or_none()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Resume upload not found.")
+    etag = weak_etag(upload_id, *version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    upload = await db.scalar(
+        select(ResumeUpload)
+        .where(ResumeUpload.id == upload_id)
+        .options(
+            selectinload(ResumeUpload.analyses).selectinload(ResumeAnalysis.scores),
+            selectinload(ResumeUpload.analyses).selectinload(
+                ResumeAnalysis.feedback_items
+            ),
+        )
+    )
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Resume upload not found.")
+    set_etag(response, etag)
+    return upload
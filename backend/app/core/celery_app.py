@@ -1,13 +1,25 @@
 """Celery application instance."""
 
+from typing import Optional
+
 from celery import Celery
+from celery.signals import worker_init, worker_ready
 
+from app.analysis.taxonomy import SkillTaxonomy, get_taxonomy, taxonomy_registry
 from app.core.config import settings
+from app.ml.registry import model_registry
 
 celery_app = Celery(
     "pathwise",
     broker=settings.celery_broker_url,
     backend=settings.celery_result_backend,
+    include=[
+        "app.tasks.analysis",
+        "app.tasks.comparisons",
+        "app.tasks.example",
+        "app.tasks.search",
+        "app.tasks.uploads",
+    ],
 )
 
 celery_app.conf.update(
@@ -17,3 +29,31 @@ celery_app.conf.update(
 )
 
 celery_app.autodiscover_tasks(["app.tasks"])
+
+
+@worker_init.connect
+def preload_models(**_: object) -> None:
+    """Load the taxonomy and models before the prefork pool forks.
+
+    The children then share them copy-on-write instead of each loading its
+    own copy.
+    """
+
+    get_taxonomy()
+    taxonomy_registry.add_listener(queue_search_reindex)
+    model_registry.warm_up()
+    model_registry.freeze()
+
+
+@worker_ready.connect
+def reindex_search_on_start(**_: object) -> None:
+    """Catch the search index up with a taxonomy changed while no worker ran."""
+
+    queue_search_reindex()
+
+
+def queue_search_reindex(_: Optional[SkillTaxonomy] = None) -> None:
+    """Queue re-indexing of search documents built with another taxonomy."""
+
+    # By name: the task modules import this one.
+    celery_app.send_task("tasks.reindex_search_taxonomy")
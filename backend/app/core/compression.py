@@ -0,0 +1,157 @@
+"""Brotli and gzip compression of HTTP responses.
+
+Starlette's ``GZipMiddleware`` only speaks gzip. It also holds streamed
+bodies back until zlib has filled a block, which would delay NDJSON batch
+results. :class:`CompressionMiddleware` negotiates ``br`` or ``gzip`` from
+``Accept-Encoding``. It compresses whole bodies of at least ``minimum_size``
+bytes, and flushes the encoder after every chunk of a streamed body, so each
+chunk reaches the client as soon as it is produced.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Callable, Dict, Optional
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Preferred first when the client accepts both with the same q-value.
+ENCODINGS = ("br", "gzip")
+# Responses that never carry a body worth compressing.
+BODILESS_STATUSES = frozenset({204, 304})
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """The supported coding ``accept_encoding`` ranks highest, if any."""
+
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                continue
+        weights[name.strip().lower()] = weight
+    best: Optional[str] = None
+    best_weight = 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class _Encoder:
+    """One response body's compressor, gzip or Brotli behind one interface."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=brotli_quality)
+            self.compress: Callable[[bytes], bytes] = compressor.process
+            self.flush: Callable[[], bytes] = compressor.flush
+            self.finish: Callable[[], bytes] = compressor.finish
+        else:
+            # wbits 31: zlib stream with a gzip header and trailer.
+            compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self.compress = compressor.compress
+            self.flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+            self.finish = compressor.flush
+
+
+class CompressionMiddleware:
+    """Compress responses for clients that accept ``br`` or ``gzip``."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressingResponder(self, encoding, send).run(scope, receive)
+
+
+class _CompressingResponder:
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: str, send: Send
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Message = {}
+        # None until the first body message decides whether to compress.
+        self.encoder: Optional[_Encoder] = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body message shows how to set headers.
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers or message["status"] in BODILESS_STATUSES
+            )
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if self.passthrough:
+            await self._send_start()
+            await self.send(message)
+            return
+        if self.encoder is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._send_start()
+                await self.send(message)
+                return
+            self.encoder = _Encoder(
+                self.encoding,
+                self.middleware.gzip_level,
+                self.middleware.brotli_quality,
+            )
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self.encoder.compress(body) + self.encoder.finish()
+                headers["Content-Length"] = str(len(body))
+                await self._send_start()
+                await self.send({**message, "body": body})
+                return
+            await self._send_start()
+
+        chunk = self.encoder.compress(body)
+        chunk += self.encoder.flush() if more_body else self.encoder.finish()
+        await self.send({**message, "body": chunk})
+
+    async def _send_start(self) -> None:
+        if self.start:
+            await self.send(self.start)
+            self.start = {}
@@ -1,6 +1,7 @@
 """Application configuration using environment variables."""
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -24,6 +25,15 @@ class Settings(BaseSettings):
         default="postgresql+psycopg://pathwise:pathwise@db:5432/pathwise",
         alias="DATABASE_URL",
     )
+    db_pool_size: int = Field(default=10, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=20, alias="DB_MAX_OVERFLOW")
+    db_pool_recycle_seconds: int = Field(default=1800, alias="DB_POOL_RECYCLE_SECONDS")
+    db_pool_timeout_seconds: float = Field(
+        default=30.0, alias="DB_POOL_TIMEOUT_SECONDS"
+    )
+    db_statement_timeout_ms: int = Field(
+        default=30_000, alias="DB_STATEMENT_TIMEOUT_MS"
+    )
     redis_url: str = Field(default="redis://redis:6379/0", alias="REDIS_URL")
     celery_broker_url: str = Field(
         default="redis://redis:6379/1", alias="CELERY_BROKER_URL"
@@ -34,6 +44,85 @@ class Settings(BaseSettings):
 
     # ML configuration
     spacy_model: str = Field(default="en_core_web_sm", alias="SPACY_MODEL")
+    embedding_model: str = Field(
+        default="sentence-transformers/all-MiniLM-L6-v2", alias="EMBEDDING_MODEL"
+    )
+    ml_preload_models: str = Field(default="", alias="ML_PRELOAD_MODELS")
+    semantic_scoring_enabled: bool = Field(
+        default=False, alias="SEMANTIC_SCORING_ENABLED"
+    )
+    embedding_batch_size: int = Field(default=32, alias="EMBEDDING_BATCH_SIZE")
+    embedding_max_tokens: int = Field(default=256, alias="EMBEDDING_MAX_TOKENS")
+    embedding_cache_dir: str = Field(
+        default="storage/embeddings", alias="EMBEDDING_CACHE_DIR"
+    )
+    embedding_cache_max_entries: int = Field(
+        default=200_000, alias="EMBEDDING_CACHE_MAX_ENTRIES"
+    )
+    entity_extraction_enabled: bool = Field(
+        default=False, alias="ENTITY_EXTRACTION_ENABLED"
+    )
+    entity_batch_size: int = Field(default=64, alias="ENTITY_BATCH_SIZE")
+    entity_n_process: int = Field(default=1, alias="ENTITY_N_PROCESS")
+
+    # Analysis configuration
+    skill_taxonomy_path: str | None = Field(default=None, alias="SKILL_TAXONOMY_PATH")
+    skill_taxonomy_index_dir: str = Field(
+        default="storage/taxonomy", alias="SKILL_TAXONOMY_INDEX_DIR"
+    )
+    skill_taxonomy_reload_seconds: float = Field(
+        default=30.0, alias="SKILL_TAXONOMY_RELOAD_SECONDS"
+    )
+    analysis_backend: Literal["inline", "thread", "process"] = Field(
+        default="process", alias="ANALYSIS_BACKEND"
+    )
+    analysis_workers: int | None = Field(default=None, alias="ANALYSIS_WORKERS")
+    analysis_max_pending: int = Field(default=512, alias="ANALYSIS_MAX_PENDING")
+    analysis_timeout_seconds: float = Field(
+        default=30.0, alias="ANALYSIS_TIMEOUT_SECONDS"
+    )
+    analysis_warm_up: bool = Field(default=True, alias="ANALYSIS_WARM_UP")
+    analysis_cache_enabled: bool = Field(default=True, alias="ANALYSIS_CACHE_ENABLED")
+    analysis_cache_max_entries: int = Field(
+        default=2048, alias="ANALYSIS_CACHE_MAX_ENTRIES"
+    )
+    analysis_cache_redis_enabled: bool = Field(
+        default=False, alias="ANALYSIS_CACHE_REDIS_ENABLED"
+    )
+    analysis_cache_ttl_seconds: int = Field(
+        default=86_400, alias="ANALYSIS_CACHE_TTL_SECONDS"
+    )
+    analysis_incremental_enabled: bool = Field(
+        default=True, alias="ANALYSIS_INCREMENTAL_ENABLED"
+    )
+    analysis_incremental_min_chars: int = Field(
+        default=8_000, alias="ANALYSIS_INCREMENTAL_MIN_CHARS"
+    )
+    analysis_chunk_cache_max_entries: int = Field(
+        default=8_192, alias="ANALYSIS_CHUNK_CACHE_MAX_ENTRIES"
+    )
+
+    # Observability
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
+    server_timing_enabled: bool = Field(default=False, alias="SERVER_TIMING_ENABLED")
+
+    # Responses
+    fast_json_responses: bool = Field(default=False, alias="FAST_JSON_RESPONSES")
+    compression_enabled: bool = Field(default=True, alias="COMPRESSION_ENABLED")
+    compression_minimum_bytes: int = Field(
+        default=1024, alias="COMPRESSION_MINIMUM_BYTES"
+    )
+    compression_gzip_level: int = Field(default=6, alias="COMPRESSION_GZIP_LEVEL")
+    compression_brotli_quality: int = Field(
+        default=4, alias="COMPRESSION_BROTLI_QUALITY"
+    )
+
+    # Resume uploads
+    upload_storage_dir: str = Field(
+        default="storage/uploads", alias="UPLOAD_STORAGE_DIR"
+    )
+    extracted_text_dir: str = Field(default="storage/text", alias="EXTRACTED_TEXT_DIR")
+    upload_max_bytes: int = Field(default=10 * 1024 * 1024, alias="UPLOAD_MAX_BYTES")
 
     # Frontend origin used for CORS
     frontend_url: str = Field(default="http://localhost:3000", alias="FRONTEND_URL")
@@ -0,0 +1,115 @@
+"""Prometheus metrics for the analysis endpoints.
+
+Stage durations come from :mod:`app.analysis.timing` and are observed in the
+API process, including analyses that ran in executor worker processes.
+Analyses run by Celery workers are not exported. The truncation rate is
+``pathwise_analyses_truncated_total / pathwise_analyses_total``.
+
+Each process keeps its own registry, so with several API processes
+(``uvicorn --workers N``) a scrape would only see the process that answered
+it. Set ``PROMETHEUS_MULTIPROC_DIR`` in the environment of the server to an
+empty, writable directory before it starts: every process then writes its
+samples there and :func:`render_latest` merges them all.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Dict
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.schemas.analysis import ResumeAnalyzeResponse
+
+SECONDS_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+ANALYSIS_STAGE_SECONDS = Histogram(
+    "pathwise_analysis_stage_seconds",
+    "Time spent in each stage of a resume analysis.",
+    ["stage"],
+    buckets=SECONDS_BUCKETS,
+)
+ANALYSIS_SECONDS = Histogram(
+    "pathwise_analysis_seconds",
+    "Time to answer an analysis request, all stages included.",
+    buckets=SECONDS_BUCKETS,
+)
+ANALYSIS_INPUT_CHARS = Histogram(
+    "pathwise_analysis_input_chars",
+    "Characters of resume text submitted for analysis.",
+    buckets=(500, 1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000),
+)
+ANALYSIS_SKILLS_MATCHED = Histogram(
+    "pathwise_analysis_skills_matched",
+    "Skills detected per analysis.",
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+ANALYSES = Counter("pathwise_analyses", "Analyses answered.")
+ANALYSES_TRUNCATED = Counter(
+    "pathwise_analyses_truncated", "Analyses whose input was truncated."
+)
+
+
+def observe_analysis(
+    input_chars: int,
+    result: ResumeAnalyzeResponse,
+    stages: Dict[str, float],
+    total_seconds: float,
+) -> None:
+    """Record one answered analysis."""
+
+    for name, seconds in stages.items():
+        ANALYSIS_STAGE_SECONDS.labels(name).observe(max(seconds, 0.0))
+    ANALYSIS_SECONDS.observe(total_seconds)
+    ANALYSIS_INPUT_CHARS.observe(input_chars)
+    ANALYSIS_SKILLS_MATCHED.observe(len(result.detected_skills))
+    ANALYSES.inc()
+    if result.truncated:
+        ANALYSES_TRUNCATED.inc()
+
+
+def server_timing(stages: Dict[str, float], total_seconds: float) -> str:
+    """A ``Server-Timing`` header value with per-stage milliseconds."""
+
+    entries = [
+        f"{name};dur={max(seconds, 0.0) * 1000:.3f}" for name, seconds in stages.items()
+    ]
+    entries.append(f"total;dur={total_seconds * 1000:.3f}")
+    return ", ".join(entries)
+
+
+def render_latest() -> tuple[bytes, str]:
+    """The metrics in the Prometheus text format, with its type.
+
+    In multiprocess mode these are the samples of every API process, merged;
+    otherwise the default registry of this process.
+    """
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import enum
 import uuid
 from datetime import datetime
 
@@ -11,6 +12,12 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.sql import func
 
 
+def enum_values(enum_cls: type[enum.Enum]) -> list[str]:
+    """Persist enum members by value, matching the labels in the migrations."""
+
+    return [member.value for member in enum_cls]
+
+
 class Base(DeclarativeBase):
     """Declarative base for SQLAlchemy models."""
 
@@ -11,6 +11,7 @@ from .resume import (
     ResumeUpload,
     ResumeUploadStatus,
 )
+from .search import SearchDocument, SearchPosting
 from .user import User
 
 __all__ = [
@@ -25,5 +26,7 @@ __all__ = [
     "AnalysisScore",
     "FeedbackItem",
     "FeedbackSeverity",
+    "SearchDocument",
+    "SearchPosting",
     "User",
 ]
@@ -4,20 +4,27 @@ from __future__ import annotations
 
 import enum
 import uuid
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 
 from sqlalchemy import (
     Boolean,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base_class import Base, TimestampMixin, UUIDPrimaryKeyMixin
+from app.db.base_class import (
+    Base,
+    TimestampMixin,
+    UUIDPrimaryKeyMixin,
+    enum_values,
+)
 
 if TYPE_CHECKING:
     from .resume import ResumeAnalysis, ResumeUpload
@@ -37,6 +44,19 @@ class ComparisonBatch(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     """Groups of resume uploads processed together for comparison."""
 
     __tablename__ = "comparison_batches"
+    __table_args__ = (
+        Index(
+            "ix_comparison_batches_user_id_created_at",
+            "user_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_comparison_batches_active_status",
+            "created_at",
+            postgresql_where=text("status IN ('pending', 'processing')"),
+        ),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False
@@ -47,7 +67,11 @@ class ComparisonBatch(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     job_posting_url: Mapped[str | None] = mapped_column(String(1024), nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[ComparisonBatchStatus] = mapped_column(
-        Enum(ComparisonBatchStatus, name="comparison_batch_status"),
+        Enum(
+            ComparisonBatchStatus,
+            name="comparison_batch_status",
+            values_callable=enum_values,
+        ),
         default=ComparisonBatchStatus.PENDING,
         nullable=False,
     )
@@ -75,6 +99,7 @@ class BatchMember(UUIDPrimaryKeyMixin, TimestampMixin, Base):
             "resume_analysis_id",
             name="uq_batch_members_resume_analysis",
         ),
+        Index("ix_batch_members_batch_id_position", "batch_id", "position"),
     )
 
     batch_id: Mapped[uuid.UUID] = mapped_column(
@@ -93,6 +118,6 @@ class BatchMember(UUIDPrimaryKeyMixin, TimestampMixin, Base):
 
     batch: Mapped["ComparisonBatch"] = relationship(back_populates="members")
     resume_upload: Mapped["ResumeUpload"] = relationship(back_populates="batch_members")
-    resume_analysis: Mapped["ResumeAnalysis" | None] = relationship(
+    resume_analysis: Mapped[Optional["ResumeAnalysis"]] = relationship(
         back_populates="batch_member"
     )
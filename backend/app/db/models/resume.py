@@ -12,14 +12,21 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base_class import Base, TimestampMixin, UUIDPrimaryKeyMixin
+from app.db.base_class import (
+    Base,
+    TimestampMixin,
+    UUIDPrimaryKeyMixin,
+    enum_values,
+)
 
 if TYPE_CHECKING:
     from .comparison import BatchMember, ComparisonBatch
@@ -55,6 +62,19 @@ class ResumeUpload(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     """Metadata about resume file uploads."""
 
     __tablename__ = "resume_uploads"
+    __table_args__ = (
+        Index(
+            "ix_resume_uploads_user_id_created_at",
+            "user_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_resume_uploads_active_status",
+            "created_at",
+            postgresql_where=text("upload_status IN ('pending', 'processing')"),
+        ),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False
@@ -64,8 +84,13 @@ class ResumeUpload(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     storage_bucket: Mapped[str | None] = mapped_column(String(255), nullable=True)
     content_type: Mapped[str | None] = mapped_column(String(128), nullable=True)
     file_size_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    content_sha256: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True
+    )
     upload_status: Mapped[ResumeUploadStatus] = mapped_column(
-        Enum(ResumeUploadStatus, name="resume_upload_status"),
+        Enum(
+            ResumeUploadStatus, name="resume_upload_status", values_callable=enum_values
+        ),
         default=ResumeUploadStatus.PENDING,
         nullable=False,
     )
@@ -87,6 +112,19 @@ class ResumeAnalysis(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     """Analysis results referencing a resume upload."""
 
     __tablename__ = "resume_analyses"
+    __table_args__ = (
+        Index(
+            "ix_resume_analyses_user_id_created_at",
+            "user_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_resume_analyses_active_status",
+            "created_at",
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+    )
 
     resume_upload_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("resume_uploads.id", ondelete="CASCADE"), nullable=False
@@ -98,12 +136,18 @@ class ResumeAnalysis(UUIDPrimaryKeyMixin, TimestampMixin, Base):
         ForeignKey("comparison_batches.id", ondelete="SET NULL"), nullable=True
     )
     analysis_type: Mapped[ResumeAnalysisType] = mapped_column(
-        Enum(ResumeAnalysisType, name="resume_analysis_type"),
+        Enum(
+            ResumeAnalysisType, name="resume_analysis_type", values_callable=enum_values
+        ),
         default=ResumeAnalysisType.SINGLE,
         nullable=False,
     )
     status: Mapped[ResumeAnalysisStatus] = mapped_column(
-        Enum(ResumeAnalysisStatus, name="resume_analysis_status"),
+        Enum(
+            ResumeAnalysisStatus,
+            name="resume_analysis_status",
+            values_callable=enum_values,
+        ),
         default=ResumeAnalysisStatus.PENDING,
         nullable=False,
     )
@@ -180,7 +224,7 @@ class FeedbackItem(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     message: Mapped[str] = mapped_column(Text, nullable=False)
     recommendation: Mapped[str | None] = mapped_column(Text, nullable=True)
     severity: Mapped[FeedbackSeverity] = mapped_column(
-        Enum(FeedbackSeverity, name="feedback_severity"),
+        Enum(FeedbackSeverity, name="feedback_severity", values_callable=enum_values),
         default=FeedbackSeverity.MEDIUM,
         nullable=False,
     )
@@ -0,0 +1,51 @@
+"""Inverted index over extracted resume text for job-description search."""
+
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base, TimestampMixin
+
+
+class SearchDocument(TimestampMixin, Base):
+    """One indexed resume upload and its length in indexed terms.
+
+    ``taxonomy_fingerprint`` names the taxonomy whose skills were indexed as
+    pseudo-terms; documents indexed under another one are re-indexed.
+    """
+
+    __tablename__ = "search_documents"
+
+    resume_upload_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("resume_uploads.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    content_sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    taxonomy_fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    term_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class SearchPosting(Base):
+    """Occurrences of one term in one indexed resume.
+
+    The primary key leads with ``(user_id, term)``, so the postings for a
+    query term are one contiguous index range per user. ``user_id`` is copied
+    from the document; rows go away with it.
+    """
+
+    __tablename__ = "search_postings"
+    __table_args__ = (Index("ix_search_postings_resume_upload_id", "resume_upload_id"),)
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    term: Mapped[str] = mapped_column(String(128), primary_key=True)
+    resume_upload_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("search_documents.resume_upload_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    term_frequency: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,90 @@
+"""Keyset (cursor) pagination over ``(created_at, id)``.
+
+Pages are ordered newest first. Each page is fetched with
+``WHERE (created_at, id) < (:created_at, :id) ORDER BY created_at DESC, id DESC``
+so the ``(user_id, created_at DESC, id DESC)`` indexes answer every page with
+one short index range scan, however deep the client has paged. ``OFFSET``
+would instead read and discard every earlier row.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor we did not issue."""
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Return an opaque cursor pointing just past ``(created_at, row_id)``."""
+
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Reverse :func:`encode_cursor`."""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor.") from exc
+
+
+def projection(model: type, schema: type[BaseModel]) -> List[Any]:
+    """Columns of ``model`` backing the fields of ``schema``.
+
+    Selecting only these columns keeps listing queries from loading large
+    text columns or triggering relationship loads.
+    """
+
+    return [
+        getattr(model, name) for name in schema.model_fields if hasattr(model, name)
+    ]
+
+
+def keyset_paginate(
+    statement: Select[Any],
+    created_at: InstrumentedAttribute[datetime],
+    row_id: InstrumentedAttribute[uuid.UUID],
+    cursor: Optional[str],
+    limit: int,
+) -> Select[Any]:
+    """Restrict ``statement`` to the page after ``cursor``.
+
+    One extra row is requested so :func:`split_page` can tell whether another
+    page follows without a separate ``COUNT``.
+    """
+
+    if cursor:
+        after_created_at, after_id = decode_cursor(cursor)
+        statement = statement.where(
+            tuple_(created_at, row_id) < tuple_(after_created_at, after_id)
+        )
+    return statement.order_by(created_at.desc(), row_id.desc()).limit(limit + 1)
+
+
+def split_page(
+    rows: Sequence[R], limit: int, convert: Callable[[R], T]
+) -> Tuple[List[T], Optional[str]]:
+    """Convert up to ``limit`` rows and build the cursor for the next page."""
+
+    items = [convert(row) for row in rows[:limit]]
+    if len(rows) <= limit:
+        return items, None
+    last = rows[limit - 1]
+    return items, encode_cursor(last.created_at, last.id)
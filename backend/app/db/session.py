@@ -1,13 +1,122 @@
-"""Database session management."""
+"""Database session management.
+
+Two engines share one configuration: the synchronous engine used by Celery
+workers, migrations and sync routes, and an asyncio engine (psycopg 3 async)
+for routes that should not hold a threadpool thread for the whole query
+round-trip. Both pools record how long checkouts take and how often callers
+had to wait for a connection; see :func:`pool_status`.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict
 
 from sqlalchemy import create_engine
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+
+@dataclass(slots=True)
+class PoolStats:
+    """Checkout counters for one connection pool."""
+
+    checkouts: int = 0
+    waits: int = 0
+    timeouts: int = 0
+    checkout_seconds_total: float = 0.0
+    checkout_seconds_max: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, seconds: float, waited: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.waits += waited
+            self.checkout_seconds_total += seconds
+            self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            checkouts = self.checkouts
+            return {
+                "checkouts": checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "checkout_ms_avg": (
+                    self.checkout_seconds_total * 1000 / checkouts if checkouts else 0.0
+                ),
+                "checkout_ms_max": self.checkout_seconds_max * 1000,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Time ``_do_get`` and count checkouts that found the pool exhausted.
+
+    Stats live on the class rather than the instance because SQLAlchemy
+    replaces pool instances on ``dispose()`` and invalidation.
+    """
+
+    stats: PoolStats
+
+    def _do_get(self):
+        # Same condition QueuePool uses to decide it must block; a negative
+        # max_overflow means unbounded overflow, which never blocks.
+        waited = (
+            self._max_overflow >= 0
+            and self.checkedin() == 0
+            and self.overflow() >= self._max_overflow
+        )
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except sa_exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        self.stats.record(time.perf_counter() - start, waited)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    stats = PoolStats()
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    stats = PoolStats()
+
+
+def engine_options() -> Dict[str, Any]:
+    """Keyword arguments shared by the sync and async engines."""
+
+    options: Dict[str, Any] = {
+        "pool_pre_ping": True,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+    }
+    if settings.db_statement_timeout_ms > 0:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={settings.db_statement_timeout_ms}"
+        }
+    return options
+
+
+engine = create_engine(
+    settings.database_url, poolclass=InstrumentedQueuePool, **engine_options()
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+async_engine = create_async_engine(
+    settings.database_url, poolclass=InstrumentedAsyncQueuePool, **engine_options()
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 def get_db():
     """Yield a database session for FastAPI dependencies."""
@@ -17,3 +126,26 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Yield an ``AsyncSession`` for FastAPI dependencies."""
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_status() -> Dict[str, Dict[str, Any]]:
+    """Return occupancy and checkout statistics for both pools."""
+
+    status: Dict[str, Dict[str, Any]] = {}
+    for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        status[name] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            **type(pool).stats.snapshot(),
+        }
+    return status
@@ -1,12 +1,60 @@
 """Application entrypoint."""
 
-from fastapi import FastAPI
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 
+from app.analysis.executor import (
+    ExecutorSaturatedError,
+    ExecutorUnavailableError,
+    analysis_executor,
+)
 from app.api.routes import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.metrics import render_latest
+from app.db.session import async_engine
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Warm up shared resources before serving and release them on exit."""
+
+    if settings.analysis_warm_up:
+        await run_in_threadpool(analysis_executor.start)
+    yield
+    analysis_executor.shutdown()
+    await async_engine.dispose()
+
+
+app = FastAPI(title=settings.project_name, lifespan=lifespan)
+
+
+@app.exception_handler(ExecutorSaturatedError)
+async def handle_executor_saturated(
+    _: Request, exc: ExecutorSaturatedError
+) -> JSONResponse:
+    """Tell clients to back off when the analysis queue is full."""
+
+    return JSONResponse(
+        status_code=429, content={"detail": str(exc)}, headers={"Retry-After": "1"}
+    )
+
+
+@app.exception_handler(ExecutorUnavailableError)
+async def handle_executor_unavailable(
+    _: Request, exc: ExecutorUnavailableError
+) -> JSONResponse:
+    """Report timeouts and crashed workers as a temporary outage."""
+
+    return JSONResponse(
+        status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "5"}
+    )
 
-app = FastAPI(title=settings.project_name)
 
 # CORS configuration to allow the frontend to call the API
 app.add_middleware(
@@ -17,6 +65,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_bytes,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+    )
+
 app.include_router(api_router, prefix=settings.api_v1_prefix)
 
 
@@ -25,3 +81,13 @@ def read_root() -> dict[str, str]:
     """Return a simple payload describing the API."""
 
     return {"message": "Welcome to Pathwise"}
+
+
+if settings.metrics_enabled:
+
+    @app.get("/metrics", tags=["meta"], summary="Prometheus metrics")
+    def read_metrics() -> Response:
+        """Expose process and analysis metrics in the Prometheus text format."""
+
+        body, content_type = render_latest()
+        return Response(body, media_type=content_type)
@@ -0,0 +1 @@
+"""Lazily loaded NLP models shared by the API and background workers."""
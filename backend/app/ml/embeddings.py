@@ -0,0 +1,136 @@
+"""Sentence embeddings from the registry's transformers model, cached on disk.
+
+Texts longer than the model's context window are split into overlapping
+windows of ``EMBEDDING_MAX_TOKENS`` tokens by the fast tokenizer. Texts are
+tokenised ``EMBEDDING_BATCH_SIZE`` at a time, and each group's windows are run
+through the model in batches of ``EMBEDDING_BATCH_SIZE``, so memory does not
+grow with the number of texts in a call. A text's embedding is the
+token-weighted mean of its windows' mean-pooled states, L2-normalised, so a
+cosine is a dot product.
+
+Embeddings are cached in a :class:`~app.ml.vector_cache.VectorCache` keyed
+by the SHA-256 of the text and capped at ``EMBEDDING_CACHE_MAX_ENTRIES``.
+Once a resume has been embedded, scoring it against another job description
+only embeds the job description.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.ml.registry import EMBEDDINGS, model_registry
+from app.ml.vector_cache import VectorCache
+
+# Tokens shared by consecutive windows of a long text.
+WINDOW_OVERLAP_TOKENS = 32
+
+
+def text_digest(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).digest()
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def embed_texts(texts: Sequence[str]) -> np.ndarray:
+    """Embed ``texts`` without the cache; one float32 row per text."""
+
+    # torch comes with the transformers install and is only needed with
+    # SEMANTIC_SCORING_ENABLED; importing it costs seconds.
+    import torch  # noqa: PLC0415
+
+    tokenizer, model = model_registry.get(EMBEDDINGS)
+    max_tokens = min(settings.embedding_max_tokens, tokenizer.model_max_length)
+    batch_size = settings.embedding_batch_size
+    vectors = np.zeros((len(texts), model.config.hidden_size), dtype=np.float32)
+    with torch.inference_mode():
+        for first in range(0, len(texts), batch_size):
+            encoded = tokenizer(
+                list(texts[first : first + batch_size]),
+                max_length=max_tokens,
+                stride=WINDOW_OVERLAP_TOKENS,
+                truncation=True,
+                padding=True,
+                return_overflowing_tokens=True,
+                return_tensors="pt",
+            )
+            owners = encoded.pop("overflow_to_sample_mapping").numpy() + first
+            _add_windows(model, encoded, owners, vectors, batch_size)
+    return _normalise(vectors)
+
+
+def _add_windows(
+    model: Any,
+    encoded: Dict[str, Any],
+    owners: np.ndarray,
+    vectors: np.ndarray,
+    batch_size: int,
+) -> None:
+    """Add each window's pooled state, weighted by its tokens, to its text's row."""
+
+    for start in range(0, len(owners), batch_size):
+        batch = {
+            name: value[start : start + batch_size] for name, value in encoded.items()
+        }
+        hidden = model(**batch).last_hidden_state
+        mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+        tokens = mask.sum(dim=1)
+        pooled = ((hidden * mask).sum(dim=1) / tokens.clamp(min=1)).float().numpy()
+        weights = tokens.float().numpy()
+        np.add.at(vectors, owners[start : start + batch_size], pooled * weights)
+
+
+@lru_cache
+def vector_cache() -> VectorCache:
+    """The process's cache for the configured model, created on first use."""
+
+    _, model = model_registry.get(EMBEDDINGS)
+    identity = f"{settings.embedding_model}\0{settings.embedding_max_tokens}"
+    return VectorCache(
+        Path(settings.embedding_cache_dir)
+        / hashlib.sha256(identity.encode()).hexdigest()[:16],
+        dim=model.config.hidden_size,
+        max_entries=settings.embedding_cache_max_entries,
+    )
+
+
+def cached_embeddings(texts: Sequence[str]) -> np.ndarray:
+    """Embed ``texts``, reading and filling the on-disk cache.
+
+    Fresh embeddings are rounded through float16 like cached ones, so a
+    text's vector does not depend on whether it was cached.
+    """
+
+    digests = [text_digest(text) for text in texts]
+    cache = vector_cache()
+    found = cache.get_many(set(digests))
+
+    missing: Dict[bytes, str] = {}
+    for digest, text in zip(digests, texts, strict=True):
+        if digest not in found:
+            missing.setdefault(digest, text)
+    if missing:
+        embedded = embed_texts(list(missing.values())).astype(np.float16)
+        fresh = dict(zip(missing, embedded, strict=True))
+        cache.put_many(fresh)
+        found.update(
+            (digest, vector.astype(np.float32)) for digest, vector in fresh.items()
+        )
+    return _normalise(np.stack([found[digest] for digest in digests]))
+
+
+def semantic_similarity(texts: Sequence[str], job_description: str) -> np.ndarray:
+    """Cosine similarity of each of ``texts`` to ``job_description``, 0 to 1."""
+
+    if not texts:
+        return np.zeros(0, dtype=np.float32)
+    vectors = cached_embeddings([*texts, job_description])
+    return np.clip(vectors[:-1] @ vectors[-1], 0.0, 1.0)
@@ -0,0 +1,205 @@
+"""Process-wide registry of lazily loaded NLP models.
+
+Importing spaCy or transformers and loading a model takes seconds and
+hundreds of megabytes, so nothing is loaded at import time. A model is loaded
+the first time :meth:`ModelRegistry.get` asks for it, at most once per process
+even when several threads ask at the same time.
+
+Processes that serve traffic pre-load the models listed in
+``ML_PRELOAD_MODELS`` instead of paying for the load on their first request:
+the analysis executor while warming up its workers, and Celery in
+``worker_init``. Under Celery's
+prefork pool ``worker_init`` runs in the parent before the children are
+forked, so the children share the loaded weights copy-on-write; the registry
+then calls :func:`gc.freeze` so that garbage collection passes in the
+children do not write to, and thereby copy, the pages holding those objects.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import resource
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+
+SPACY = "spacy"
+EMBEDDINGS = "embeddings"
+
+
+class UnknownModelError(KeyError):
+    """Raised when asking for a model that was never registered."""
+
+
+class TransformerModel(NamedTuple):
+    """A Hugging Face tokenizer with its model, ready for inference."""
+
+    tokenizer: Any
+    model: Any
+
+
+@dataclass(slots=True)
+class ModelStats:
+    """How long a model took to load and how much memory it added."""
+
+    load_seconds: float
+    rss_bytes_added: int
+    loaded_at: float
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process."""
+
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # No procfs: fall back to the peak RSS (kilobytes, bytes on macOS).
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ModelRegistry:
+    """Named model loaders whose results are created once and cached."""
+
+    def __init__(self) -> None:
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, ModelStats] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """Register ``loader``; replacing a loader drops its loaded model."""
+
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+            self._models.pop(name, None)
+            self._stats.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Return the model called ``name``, loading it on first use."""
+
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        try:
+            lock = self._locks[name]
+        except KeyError:
+            raise UnknownModelError(name) from None
+        with lock:
+            model = self._models.get(name)
+            if model is None:
+                model = self._load(name)
+        return model
+
+    def _load(self, name: str) -> Any:
+        rss_before = rss_bytes()
+        started = time.perf_counter()
+        model = self._loaders[name]()
+        stats = ModelStats(
+            load_seconds=time.perf_counter() - started,
+            rss_bytes_added=max(rss_bytes() - rss_before, 0),
+            loaded_at=time.time(),
+        )
+        self._stats[name] = stats
+        self._models[name] = model
+        logger.info(
+            "Loaded model {} in {:.2f}s (+{:.0f} MiB RSS, pid {})",
+            name,
+            stats.load_seconds,
+            stats.rss_bytes_added / 2**20,
+            os.getpid(),
+        )
+        return model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> List[str]:
+        """Load ``names`` (default: ``ML_PRELOAD_MODELS``) now.
+
+        Returns the names that loaded. A model that fails to load is logged
+        and skipped, so a missing optional package cannot keep the process
+        from starting; it will raise again when first used.
+        """
+
+        if names is None:
+            names = preload_model_names()
+        loaded: List[str] = []
+        for name in names:
+            try:
+                self.get(name)
+            except Exception:
+                logger.exception("Pre-loading model {} failed", name)
+            else:
+                loaded.append(name)
+        return loaded
+
+    def freeze(self) -> None:
+        """Move every object allocated so far out of the collector's reach.
+
+        Call once in a parent process after :meth:`warm_up` and before
+        forking, so children keep sharing the model pages.
+        """
+
+        gc.collect()
+        gc.freeze()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-model load state, time and memory, plus this process's RSS."""
+
+        models: Dict[str, Any] = {}
+        for name in sorted(self._loaders):
+            stats = self._stats.get(name)
+            models[name] = {
+                "loaded": stats is not None,
+                "load_seconds": stats.load_seconds if stats else None,
+                "rss_bytes_added": stats.rss_bytes_added if stats else None,
+                "loaded_at": stats.loaded_at if stats else None,
+            }
+        return {
+            "pid": os.getpid(),
+            "rss_bytes": rss_bytes(),
+            "gc_frozen_objects": gc.get_freeze_count(),
+            "models": models,
+        }
+
+
+def preload_model_names() -> List[str]:
+    """Model names listed, comma separated, in ``ML_PRELOAD_MODELS``."""
+
+    return [
+        name.strip() for name in settings.ml_preload_models.split(",") if name.strip()
+    ]
+
+
+def _load_spacy() -> Any:
+    # Deferred like the model itself: importing spaCy takes over a second in
+    # every process, including those that never run the entity stage.
+    import spacy  # noqa: PLC0415
+
+    return spacy.load(settings.spacy_model)
+
+
+def _load_embeddings() -> TransformerModel:
+    # Same for transformers, which pulls in torch.
+    from transformers import AutoModel, AutoTokenizer  # noqa: PLC0415
+
+    tokenizer = AutoTokenizer.from_pretrained(settings.embedding_model)
+    model = AutoModel.from_pretrained(settings.embedding_model)
+    model.eval()
+    return TransformerModel(tokenizer=tokenizer, model=model)
+
+
+model_registry = ModelRegistry()
+model_registry.register(SPACY, _load_spacy)
+model_registry.register(EMBEDDINGS, _load_embeddings)
@@ -0,0 +1,216 @@
+"""On-disk cache of embedding vectors shared by every process on a host.
+
+Vectors are stored as float16 rows of one memory-mapped file
+(``vectors.f16``). Row ``i`` belongs to the ``i``-th 32-byte key (a SHA-256
+digest of the embedded text) in the append-only ``keys.bin``. Readers map the
+file and copy rows out without any locking. Writers take an exclusive
+``fcntl`` lock, grow the vector file when needed, write the rows and only then
+append the keys, so a key never becomes visible before its vector.
+
+The files live in numbered generation directories (``gen-1``, ``gen-2``, ...)
+of at most half of ``max_entries`` rows each. When the newest generation is
+full a writer starts the next one and deletes all but the two newest, so the
+cache holds between half and all of ``max_entries`` vectors, on disk and in
+each process's key index, and the oldest half is dropped first.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+KEY_BYTES = 32
+# Rows allocated when the vector file is created; it doubles when full.
+INITIAL_ROWS = 1024
+GENERATION_PREFIX = "gen-"
+# Generations kept: the one being filled and the full one before it.
+LIVE_GENERATIONS = 2
+
+
+class _Generation:
+    """One generation directory: append-only keys and their vector rows."""
+
+    def __init__(self, directory: Path, dim: int, max_rows: int) -> None:
+        self.directory = directory
+        self.dim = dim
+        self.max_rows = max_rows
+        self._keys_path = directory / "keys.bin"
+        self._vectors_path = directory / "vectors.f16"
+        self._row_bytes = dim * np.dtype(np.float16).itemsize
+        self.rows: Dict[bytes, int] = {}
+        self._keys_read = 0
+        self._vectors: Optional[np.memmap] = None
+
+    @property
+    def free(self) -> int:
+        return self.max_rows - self._keys_read // KEY_BYTES
+
+    def refresh(self) -> None:
+        """Pick up keys appended since the last call, by any process."""
+
+        try:
+            size = self._keys_path.stat().st_size
+            # A writer that died mid-append can leave a partial record behind.
+            whole = (size - self._keys_read) // KEY_BYTES * KEY_BYTES
+            if whole <= 0:
+                return
+            with open(self._keys_path, "rb") as keys:
+                keys.seek(self._keys_read)
+                data = keys.read(whole)
+        except FileNotFoundError:  # not written yet, or rotated away
+            return
+        first_row = self._keys_read // KEY_BYTES
+        for row, offset in enumerate(range(0, len(data), KEY_BYTES), start=first_row):
+            self.rows.setdefault(data[offset : offset + KEY_BYTES], row)
+        self._keys_read += len(data)
+
+    def _mapped(self, rows: int) -> np.memmap:
+        """The vector file mapped with at least ``rows`` rows."""
+
+        if self._vectors is None or self._vectors.shape[0] < rows:
+            capacity = self._vectors_path.stat().st_size // self._row_bytes
+            self._vectors = np.memmap(
+                self._vectors_path,
+                dtype=np.float16,
+                mode="r+",
+                shape=(capacity, self.dim),
+            )
+        return self._vectors
+
+    def read(self, digests: Iterable[bytes]) -> Dict[bytes, np.ndarray]:
+        rows = {digest: self.rows[digest] for digest in digests if digest in self.rows}
+        if not rows:
+            return {}
+        try:
+            vectors = self._mapped(max(rows.values()) + 1)
+        except FileNotFoundError:  # rotated away by another process
+            return {}
+        return {digest: vectors[row].astype(np.float32) for digest, row in rows.items()}
+
+    def write(self, vectors: Mapping[bytes, np.ndarray], new: List[bytes]) -> None:
+        """Append ``new`` digests, which must fit in :attr:`free`."""
+
+        if self._keys_path.exists():
+            size = self._keys_path.stat().st_size
+            if size % KEY_BYTES:
+                os.truncate(self._keys_path, size - size % KEY_BYTES)
+        first = self._keys_read // KEY_BYTES
+        needed = first + len(new)
+        try:
+            capacity = self._vectors_path.stat().st_size // self._row_bytes
+        except FileNotFoundError:
+            capacity = 0
+        if needed > capacity:
+            capacity = min(max(needed, capacity * 2, INITIAL_ROWS), self.max_rows)
+            with open(self._vectors_path, "ab") as handle:
+                handle.truncate(capacity * self._row_bytes)
+            self._vectors = None
+
+        mapped = self._mapped(needed)
+        mapped[first:needed] = np.stack([vectors[digest] for digest in new])
+        mapped.flush()
+        with open(self._keys_path, "ab") as keys:
+            keys.write(b"".join(new))
+        self.refresh()
+
+
+class VectorCache:
+    """Bounded map from text digests to float16 vectors of ``dim`` values."""
+
+    def __init__(self, directory: Path, dim: int, max_entries: int) -> None:
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self.directory = directory
+        self.dim = dim
+        self.max_entries = max_entries
+        self._generation_rows = max(1, max_entries // LIVE_GENERATIONS)
+        self._lock_path = directory / "write.lock"
+        # Live generations by number, newest first.
+        self._generations: Dict[int, _Generation] = {}
+        self._mutex = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._mutex:
+            return sum(len(generation.rows) for generation in self._sync())
+
+    def _numbers(self) -> List[int]:
+        numbers = []
+        for path in self.directory.glob(f"{GENERATION_PREFIX}*"):
+            suffix = path.name[len(GENERATION_PREFIX) :]
+            if suffix.isdigit():
+                numbers.append(int(suffix))
+        return sorted(numbers, reverse=True)
+
+    def _sync(self) -> List[_Generation]:
+        """The live generations, newest first, with keys read up to date."""
+
+        live = self._numbers()[:LIVE_GENERATIONS]
+        self._generations = {
+            number: self._generations.get(number)
+            or _Generation(
+                self.directory / f"{GENERATION_PREFIX}{number}",
+                self.dim,
+                self._generation_rows,
+            )
+            for number in live
+        }
+        generations = list(self._generations.values())
+        for generation in generations:
+            generation.refresh()
+        return generations
+
+    def _rotate(self) -> None:
+        """Start the next generation and delete the ones no longer live."""
+
+        numbers = self._numbers()
+        newest = numbers[0] + 1 if numbers else 1
+        (self.directory / f"{GENERATION_PREFIX}{newest}").mkdir(
+            mode=0o700, exist_ok=True
+        )
+        # Readers that still map a deleted file keep their mapping.
+        for number in numbers[LIVE_GENERATIONS - 1 :]:
+            shutil.rmtree(
+                self.directory / f"{GENERATION_PREFIX}{number}", ignore_errors=True
+            )
+
+    def get_many(self, digests: Iterable[bytes]) -> Dict[bytes, np.ndarray]:
+        """Return float32 copies of the cached vectors among ``digests``."""
+
+        wanted = set(digests)
+        found: Dict[bytes, np.ndarray] = {}
+        with self._mutex:
+            for generation in self._sync():
+                found.update(generation.read(wanted - found.keys()))
+        return found
+
+    def put_many(self, vectors: Mapping[bytes, np.ndarray]) -> None:
+        """Store ``vectors`` whose digests are not cached yet."""
+
+        with self._mutex, open(self._lock_path, "ab") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._write(vectors)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _write(self, vectors: Mapping[bytes, np.ndarray]) -> None:
+        generations = self._sync()
+        new = [
+            digest
+            for digest in vectors
+            if not any(digest in generation.rows for generation in generations)
+        ]
+        # Only the newest rows could survive a rotation anyway.
+        new = new[-self._generation_rows :]
+        while new:
+            if not generations or generations[0].free <= 0:
+                self._rotate()
+                generations = self._sync()
+            current = generations[0]
+            batch, new = new[: current.free], new[current.free :]
+            current.write(vectors, batch)
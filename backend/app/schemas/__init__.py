@@ -1,20 +1,37 @@
 """Pydantic schemas exposed by the Pathwise backend."""
 
-from .comparison import BatchMemberRead, ComparisonBatchRead
+from .comparison import (
+    BatchMemberRead,
+    ComparisonBatchRankRequest,
+    ComparisonBatchRead,
+    ComparisonBatchSummary,
+)
+from .pagination import Page
 from .resume import (
     AnalysisScoreRead,
     FeedbackItemRead,
     ResumeAnalysisRead,
+    ResumeAnalysisSummary,
     ResumeUploadRead,
+    ResumeUploadSummary,
 )
+from .search import ResumeSearchHit, ResumeSearchRequest, ResumeSearchResponse
 from .user import UserRead
 
 __all__ = [
     "BatchMemberRead",
+    "ComparisonBatchRankRequest",
     "ComparisonBatchRead",
+    "ComparisonBatchSummary",
     "AnalysisScoreRead",
     "FeedbackItemRead",
+    "Page",
     "ResumeAnalysisRead",
+    "ResumeAnalysisSummary",
+    "ResumeSearchHit",
+    "ResumeSearchRequest",
+    "ResumeSearchResponse",
     "ResumeUploadRead",
+    "ResumeUploadSummary",
     "UserRead",
 ]
@@ -2,14 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import Field, StringConstraints
 from typing_extensions import Annotated
 
 from app.schemas.base import SchemaBase
 
-
 ResumeText = Annotated[str, StringConstraints(min_length=50, max_length=100_000)]
 
 
@@ -58,6 +57,23 @@ class FeedbackItem(SchemaBase):
     recommendation: Optional[str] = None
 
 
+class ExperiencePeriod(SchemaBase):
+    """A dated role, as ``YYYY-MM`` months; ``end`` is ``None`` when ongoing."""
+
+    text: str
+    start: str
+    end: Optional[str] = None
+
+
+class ExperienceSignals(SchemaBase):
+    """Employers, titles and dated roles found by the entity stage."""
+
+    years: float = Field(ge=0.0)
+    organizations: List[str] = Field(default_factory=list)
+    job_titles: List[str] = Field(default_factory=list)
+    periods: List[ExperiencePeriod] = Field(default_factory=list)
+
+
 class ResumeAnalyzeResponse(SchemaBase):
     overall_score: float = Field(ge=0.0, le=100.0)
     metrics: Dict[str, Metric]
@@ -68,3 +84,54 @@ class ResumeAnalyzeResponse(SchemaBase):
     sentence_count: int
     truncated: bool = False
     feedback: List[FeedbackItem] = Field(default_factory=list)
+    experience: Optional[ExperienceSignals] = None
+
+
+class ResumeBatchItem(SchemaBase):
+    """Single resume inside a batch analysis request."""
+
+    id: Optional[str] = Field(
+        default=None,
+        max_length=255,
+        description="Optional client identifier echoed back with the result.",
+    )
+    text: ResumeText
+
+
+class ResumeBatchAnalyzeRequest(SchemaBase):
+    """Request payload for scoring many resumes against one job."""
+
+    resumes: List[ResumeBatchItem] = Field(..., min_length=1, max_length=500)
+    job_description: Optional[str] = Field(
+        default=None,
+        description="Optional job description shared by all resumes.",
+    )
+
+
+class ResumeBatchResult(SchemaBase):
+    """One streamed line of a batch analysis response."""
+
+    index: int
+    id: Optional[str] = None
+    result: Optional[ResumeAnalyzeResponse] = None
+    error: Optional[str] = None
+
+
+class ResumeAnalyzeEvent(SchemaBase):
+    """One streamed line of a progressive resume analysis.
+
+    ``metric`` and ``feedback`` lines arrive as soon as the stage producing
+    them finishes. The last line holds the complete ``result``, or an
+    ``error``.
+    """
+
+    type: Literal["metric", "feedback", "result", "error"]
+    stage: Optional[str] = Field(
+        default=None,
+        description="Stage behind a metric or feedback line: features, "
+        "entities, semantic, or cache for a cached result.",
+    )
+    metric: Optional[Metric] = None
+    feedback: Optional[FeedbackItem] = None
+    result: Optional[ResumeAnalyzeResponse] = None
+    error: Optional[str] = None
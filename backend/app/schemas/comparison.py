@@ -46,6 +46,22 @@ class ComparisonBatchBase(SchemaBase):
     status: ComparisonBatchStatus = ComparisonBatchStatus.PENDING
 
 
+class ComparisonBatchSummary(ComparisonBatchBase):
+    """Listing projection of a batch with a member count instead of members."""
+
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+    member_count: int = 0
+
+
+class ComparisonBatchRankRequest(SchemaBase):
+    """Request payload for ranking a batch's members against a job."""
+
+    job_description: str = Field(..., min_length=1, max_length=100_000)
+    job_title: str | None = Field(default=None, max_length=255)
+
+
 class ComparisonBatchRead(ComparisonBatchBase):
     """Read schema for comparison batches."""
 
@@ -60,13 +76,13 @@ class ComparisonBatchRead(ComparisonBatchBase):
 from app.schemas.resume import ResumeAnalysisRead, ResumeUploadRead
 
 BatchMemberRead.model_rebuild(
-    update_locals={
+    _types_namespace={
         "ResumeUploadRead": ResumeUploadRead,
         "ResumeAnalysisRead": ResumeAnalysisRead,
     }
 )
 ComparisonBatchRead.model_rebuild(
-    update_locals={
+    _types_namespace={
         "BatchMemberRead": BatchMemberRead,
         "ResumeAnalysisRead": ResumeAnalysisRead,
     }
@@ -0,0 +1,19 @@
+"""Envelope for cursor-paginated listings."""
+
+from __future__ import annotations
+
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of results plus the cursor for the next page."""
+
+    items: List[T]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Pass as ``cursor`` to fetch the next page; null on the last.",
+    )
@@ -14,6 +14,7 @@ from app.db.models import (
     ResumeAnalysisType,
     ResumeUploadStatus,
 )
+from app.schemas.analysis import ResumeText
 from app.schemas.base import SchemaBase
 
 
@@ -74,6 +75,47 @@ class ResumeAnalysisBase(SchemaBase):
     completed_at: datetime | None = None
 
 
+class ResumeAnalysisCreate(SchemaBase):
+    """Schema used when requesting a background analysis."""
+
+    resume_upload_id: UUID
+    user_id: UUID
+    comparison_batch_id: UUID | None = None
+    analysis_type: ResumeAnalysisType = ResumeAnalysisType.SINGLE
+    job_title: str | None = None
+    job_description: str | None = None
+    text: ResumeText | None = Field(
+        default=None,
+        description=(
+            "Plaintext contents of the resume. Defaults to the text extracted "
+            "from the referenced upload."
+        ),
+    )
+
+
+class ResumeAnalysisBatchCreate(SchemaBase):
+    """Schema used when requesting many background analyses at once."""
+
+    analyses: List[ResumeAnalysisCreate] = Field(..., min_length=1, max_length=500)
+
+
+class ResumeAnalysisSummary(SchemaBase):
+    """Listing projection of an analysis without job text or nested rows."""
+
+    id: UUID
+    resume_upload_id: UUID
+    user_id: UUID
+    comparison_batch_id: UUID | None = None
+    analysis_type: ResumeAnalysisType
+    status: ResumeAnalysisStatus
+    model_version: str | None = None
+    overall_score: float | None = None
+    job_title: str | None = None
+    completed_at: datetime | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
 class ResumeAnalysisRead(ResumeAnalysisBase):
     """Read schema for resume analyses."""
 
@@ -92,6 +134,7 @@ class ResumeUploadBase(SchemaBase):
     storage_bucket: str | None = None
     content_type: str | None = None
     file_size_bytes: int | None = None
+    content_sha256: str | None = None
     upload_status: ResumeUploadStatus = ResumeUploadStatus.PENDING
     processed_at: datetime | None = None
     failure_reason: str | None = None
@@ -103,6 +146,15 @@ class ResumeUploadCreate(ResumeUploadBase):
     user_id: UUID
 
 
+class ResumeUploadSummary(ResumeUploadBase):
+    """Listing projection of a resume upload without related analyses."""
+
+    id: UUID
+    user_id: UUID
+    created_at: datetime
+    updated_at: datetime
+
+
 class ResumeUploadRead(ResumeUploadBase):
     """Read schema including related analyses."""
 
@@ -114,13 +166,13 @@ class ResumeUploadRead(ResumeUploadBase):
 
 
 ResumeAnalysisRead.model_rebuild(
-    update_locals={
+    _types_namespace={
         "AnalysisScoreRead": AnalysisScoreRead,
         "FeedbackItemRead": FeedbackItemRead,
     }
 )
 ResumeUploadRead.model_rebuild(
-    update_locals={
+    _types_namespace={
         "ResumeAnalysisRead": ResumeAnalysisRead,
     }
 )
@@ -0,0 +1,33 @@
+"""Schemas for searching stored resumes by job description."""
+
+from __future__ import annotations
+
+from typing import List
+from uuid import UUID
+
+from pydantic import Field
+
+from app.schemas.base import SchemaBase
+
+
+class ResumeSearchRequest(SchemaBase):
+    """Request payload for finding the resumes that best match a job."""
+
+    user_id: UUID
+    job_description: str = Field(..., min_length=1, max_length=100_000)
+    limit: int = Field(default=20, ge=1, le=100)
+
+
+class ResumeSearchHit(SchemaBase):
+    """One matching resume upload with its BM25 score."""
+
+    resume_upload_id: UUID
+    original_filename: str
+    score: float
+    matched_skills: List[str] = Field(default_factory=list)
+
+
+class ResumeSearchResponse(SchemaBase):
+    """Best matches first."""
+
+    items: List[ResumeSearchHit]
@@ -0,0 +1 @@
+"""Local storage helpers for uploaded resume files."""
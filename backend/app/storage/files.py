@@ -0,0 +1,68 @@
+"""Streaming storage of uploaded files on the local filesystem."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import AsyncIterator, Tuple
+
+import anyio
+
+from app.core.config import settings
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds ``settings.upload_max_bytes``."""
+
+
+def storage_root() -> Path:
+    """Directory holding uploaded files."""
+
+    return Path(settings.upload_storage_dir)
+
+
+def upload_path(stored_filename: str) -> Path:
+    """Absolute location of a stored upload."""
+
+    return storage_root() / stored_filename
+
+
+def file_sha256(path: Path) -> str:
+    """Return the SHA-256 hex digest of a stored file, read in chunks."""
+
+    with path.open("rb") as fh:
+        return hashlib.file_digest(fh, "sha256").hexdigest()
+
+
+async def save_stream(
+    chunks: AsyncIterator[bytes], destination: Path, max_bytes: int
+) -> Tuple[int, str]:
+    """Write ``chunks`` to ``destination`` without holding the whole file.
+
+    Returns the number of bytes written and the SHA-256 hex digest of the
+    content, computed as the chunks arrive. The partial file is removed if the
+    stream fails or grows beyond ``max_bytes``.
+    """
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    size = 0
+    digest = hashlib.sha256()
+    try:
+        async with await anyio.open_file(destination, "wb") as fh:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(
+                        f"Upload exceeds the {max_bytes} byte limit."
+                    )
+                digest.update(chunk)
+                await fh.write(chunk)
+    except BaseException:
+        # Also covers client disconnects (cancellation).
+        try:
+            os.unlink(destination)
+        except FileNotFoundError:
+            pass
+        raise
+    return size, digest.hexdigest()
@@ -0,0 +1,77 @@
+"""Content-addressed store of text extracted from uploaded resumes.
+
+Extracted text is keyed by the SHA-256 of the uploaded file's bytes and kept
+gzip-compressed under ``<root>/ab/cd/<sha256>.txt.gz``. The same file uploaded
+again, by any user, reuses the stored text instead of being parsed again, and
+analyses read the text from here rather than from the original file.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+
+SHA256_RE = re.compile(r"[0-9a-f]{64}")
+
+# Resume text compresses ~3-4x at level 6; higher levels gain little.
+COMPRESSION_LEVEL = 6
+
+
+class TextStore:
+    """Gzip-compressed extracted text addressed by content hash."""
+
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self.root = Path(root)
+
+    def path_for(self, sha256: str) -> Path:
+        """Return the file holding the text for ``sha256``."""
+
+        if not SHA256_RE.fullmatch(sha256):
+            raise ValueError(f"Invalid SHA-256 digest: {sha256!r}")
+        return self.root / sha256[:2] / sha256[2:4] / f"{sha256}.txt.gz"
+
+    def exists(self, sha256: str) -> bool:
+        return self.path_for(sha256).is_file()
+
+    def read(self, sha256: str) -> Optional[str]:
+        """Return the stored text, or ``None`` if it was never extracted."""
+
+        try:
+            with gzip.open(self.path_for(sha256), "rt", encoding="utf-8") as fh:
+                return fh.read()
+        except FileNotFoundError:
+            return None
+
+    def write(self, sha256: str, text: str) -> Path:
+        """Store ``text`` for ``sha256``.
+
+        The file is written under a temporary name and renamed into place, so
+        concurrent writers of the same digest are harmless and readers never
+        see a partial file.
+        """
+
+        destination = self.path_for(sha256)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=destination.parent, suffix=".tmp")
+        try:
+            with (
+                os.fdopen(fd, "wb") as raw,
+                gzip.GzipFile(
+                    fileobj=raw, mode="wb", compresslevel=COMPRESSION_LEVEL, mtime=0
+                ) as fh,
+            ):
+                fh.write(text.encode("utf-8"))
+            os.replace(tmp_name, destination)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return destination
+
+
+text_store = TextStore(settings.extracted_text_dir)
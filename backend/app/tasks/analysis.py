@@ -0,0 +1,200 @@
+"""Celery tasks running resume analyses in the background."""
+
+from __future__ import annotations
+
+import uuid
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+from sqlalchemy import select, update
+from sqlalchemy.orm import joinedload
+
+from app.analysis.cache import analyze_text_cached, analyze_texts_cached
+from app.analysis.persistence import (
+    bulk_record_analysis_results,
+    record_analysis_result,
+)
+from app.core.celery_app import celery_app
+from app.db.models import ResumeAnalysis, ResumeAnalysisStatus
+from app.db.session import SessionLocal
+from app.schemas.analysis import ResumeAnalyzeResponse
+from app.storage.text_store import text_store
+from app.tasks.search import index_resume_uploads
+
+TERMINAL_STATUSES = frozenset(
+    {ResumeAnalysisStatus.COMPLETED, ResumeAnalysisStatus.FAILED}
+)
+
+
+def _stored_text(upload_id: uuid.UUID, digest: Optional[str]) -> str:
+    text = text_store.read(digest) if digest else None
+    if text is None:
+        raise LookupError(f"No extracted text for upload {upload_id}")
+    return text
+
+
+@celery_app.task(name="tasks.run_resume_analysis", acks_late=True)
+def run_resume_analysis(analysis_id: str, text: Optional[str] = None) -> str:
+    """Analyse ``text`` and store the results on the given analysis row.
+
+    Without ``text`` the upload's extracted text is read from the text store,
+    keeping large resumes out of the broker. The row moves ``PENDING`` ->
+    ``RUNNING`` -> ``COMPLETED``/``FAILED``. Redelivered tasks for rows that
+    already finished are ignored.
+    """
+
+    with SessionLocal() as db:
+        analysis = db.get(ResumeAnalysis, uuid.UUID(analysis_id))
+        if analysis is None:
+            logger.warning("Resume analysis {} no longer exists", analysis_id)
+            return "missing"
+        if analysis.status in TERMINAL_STATUSES:
+            return analysis.status.value
+
+        upload_id = analysis.resume_upload_id
+        analysis.status = ResumeAnalysisStatus.RUNNING
+        db.commit()
+
+        try:
+            if text is None:
+                text = _stored_text(upload_id, analysis.resume_upload.content_sha256)
+            result = analyze_text_cached(text, analysis.job_description)
+            record_analysis_result(db, analysis, result)
+            db.commit()
+        except Exception:
+            db.rollback()
+            analysis.status = ResumeAnalysisStatus.FAILED
+            db.commit()
+            logger.exception("Resume analysis {} failed", analysis_id)
+            raise
+
+        index_resume_uploads.delay([str(upload_id)])
+
+        return analysis.status.value
+
+
+def _analyze_loaded(
+    loaded: Sequence[Tuple[uuid.UUID, uuid.UUID, str, Optional[str]]],
+) -> List[Optional[ResumeAnalyzeResponse]]:
+    """Analyse ``(analysis id, upload id, text, job description)`` items.
+
+    One call first, so the optional entity stage runs over the batch at once.
+    If that fails, items are analysed one by one so that a single bad resume
+    only fails itself; its result is ``None``.
+    """
+
+    try:
+        return list(
+            analyze_texts_cached(
+                [(text, job_description) for _, _, text, job_description in loaded]
+            )
+        )
+    except Exception:
+        logger.exception(
+            "Analysing a batch of {} resumes failed; retrying one by one",
+            len(loaded),
+        )
+
+    results: List[Optional[ResumeAnalyzeResponse]] = []
+    for analysis_id, _, text, job_description in loaded:
+        try:
+            results.append(analyze_text_cached(text, job_description))
+        except Exception:
+            logger.exception("Resume analysis {} failed", analysis_id)
+            results.append(None)
+    return results
+
+
+@celery_app.task(name="tasks.run_resume_analysis_batch", acks_late=True)
+def run_resume_analysis_batch(
+    analysis_ids: List[str], texts: Optional[Dict[str, str]] = None
+) -> Dict[str, int]:
+    """Analyse many rows and persist every result with one bulk write.
+
+    ``texts`` maps analysis ids to inline resume text; other analyses use the
+    text extracted from their upload. The number of database round-trips does
+    not grow with the batch: one read, one status update, the bulk write and
+    one update for failed items. Items that fail are marked ``FAILED`` without
+    affecting the rest of the batch.
+    """
+
+    texts = texts or {}
+    with SessionLocal() as db:
+        analyses = db.scalars(
+            select(ResumeAnalysis)
+            .where(
+                ResumeAnalysis.id.in_([uuid.UUID(value) for value in analysis_ids]),
+                ResumeAnalysis.status.not_in(TERMINAL_STATUSES),
+            )
+            .options(joinedload(ResumeAnalysis.resume_upload))
+        ).all()
+        if not analyses:
+            return {"completed": 0, "failed": 0}
+
+        # Everything needed later, read before commits expire the objects.
+        work = [
+            (
+                analysis.id,
+                analysis.job_description,
+                texts.get(str(analysis.id)),
+                analysis.resume_upload_id,
+                analysis.resume_upload.content_sha256,
+            )
+            for analysis in analyses
+        ]
+        db.execute(
+            update(ResumeAnalysis)
+            .where(ResumeAnalysis.id.in_([item[0] for item in work]))
+            .values(status=ResumeAnalysisStatus.RUNNING)
+        )
+        db.commit()
+
+        loaded: List[Tuple[uuid.UUID, uuid.UUID, str, Optional[str]]] = []
+        failed: List[uuid.UUID] = []
+        for analysis_id, job_description, inline_text, upload_id, digest in work:
+            try:
+                text = (
+                    inline_text
+                    if inline_text is not None
+                    else _stored_text(upload_id, digest)
+                )
+            except Exception:
+                logger.exception("Resume analysis {} failed", analysis_id)
+                failed.append(analysis_id)
+            else:
+                loaded.append((analysis_id, upload_id, text, job_description))
+
+        results: List[Tuple[uuid.UUID, ResumeAnalyzeResponse]] = []
+        indexed_uploads: List[uuid.UUID] = []
+        for (analysis_id, upload_id, _, _), result in zip(
+            loaded, _analyze_loaded(loaded), strict=True
+        ):
+            if result is None:
+                failed.append(analysis_id)
+            else:
+                results.append((analysis_id, result))
+                indexed_uploads.append(upload_id)
+
+        try:
+            bulk_record_analysis_results(db, results)
+            if failed:
+                db.execute(
+                    update(ResumeAnalysis)
+                    .where(ResumeAnalysis.id.in_(failed))
+                    .values(status=ResumeAnalysisStatus.FAILED)
+                )
+            db.commit()
+        except Exception:
+            db.rollback()
+            db.execute(
+                update(ResumeAnalysis)
+                .where(ResumeAnalysis.id.in_([item[0] for item in work]))
+                .values(status=ResumeAnalysisStatus.FAILED)
+            )
+            db.commit()
+            logger.exception("Persisting a batch of {} analyses failed", len(work))
+            raise
+
+        if indexed_uploads:
+            index_resume_uploads.delay([str(value) for value in indexed_uploads])
+        return {"completed": len(results), "failed": len(failed)}
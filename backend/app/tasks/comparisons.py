@@ -0,0 +1,174 @@
+"""Celery tasks ranking the members of comparison batches."""
+
+from __future__ import annotations
+
+import uuid
+from typing import Any, Dict, List, Sequence, Tuple
+
+from loguru import logger
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session, joinedload
+
+from app.analysis.persistence import bulk_record_analysis_results
+from app.analysis.ranking import RankedResume, rank_resumes
+from app.core.celery_app import celery_app
+from app.db.models import (
+    BatchMember,
+    ComparisonBatch,
+    ComparisonBatchStatus,
+    ResumeAnalysis,
+    ResumeAnalysisStatus,
+    ResumeAnalysisType,
+)
+from app.db.session import SessionLocal
+from app.schemas.analysis import ResumeAnalyzeResponse
+from app.storage.text_store import text_store
+from app.tasks.search import index_resume_uploads
+
+# (member id, upload id, reusable analysis id, extracted text)
+MemberWork = Tuple[uuid.UUID, uuid.UUID, uuid.UUID | None, str]
+
+
+def _reusable_analysis_id(member: BatchMember) -> uuid.UUID | None:
+    """The member's earlier comparison analysis, overwritten when re-ranking."""
+
+    analysis = member.resume_analysis
+    if (
+        analysis is not None
+        and analysis.analysis_type is ResumeAnalysisType.COMPARISON
+        and analysis.comparison_batch_id == member.batch_id
+    ):
+        return analysis.id
+    return None
+
+
+def _member_work(
+    db: Session, batch_id: uuid.UUID
+) -> Tuple[List[MemberWork], List[uuid.UUID]]:
+    """Members to rank with their text, and the ids of members without text."""
+
+    members = db.scalars(
+        select(BatchMember)
+        .where(BatchMember.batch_id == batch_id)
+        .options(
+            joinedload(BatchMember.resume_upload),
+            joinedload(BatchMember.resume_analysis),
+        )
+        .order_by(BatchMember.created_at, BatchMember.id)
+    ).all()
+    work: List[MemberWork] = []
+    skipped: List[uuid.UUID] = []
+    for member in members:
+        digest = member.resume_upload.content_sha256
+        text = text_store.read(digest) if digest else None
+        if text is None:
+            skipped.append(member.id)
+            continue
+        work.append(
+            (member.id, member.resume_upload_id, _reusable_analysis_id(member), text)
+        )
+    return work, skipped
+
+
+def _write_ranking(
+    db: Session,
+    work: Sequence[MemberWork],
+    ranking: Sequence[RankedResume],
+    skipped: Sequence[uuid.UUID],
+    owner: Dict[str, Any],
+) -> None:
+    """Store each member's analysis and rank in a fixed number of statements.
+
+    ``owner`` holds the batch's ``user_id``, ``comparison_batch_id``,
+    ``job_title`` and ``job_description`` for the analyses.
+    """
+
+    new_analyses: List[Dict] = []
+    rerun_analyses: List[Dict] = []
+    results: List[Tuple[uuid.UUID, ResumeAnalyzeResponse]] = []
+    positions: List[Dict] = [
+        {"id": member_id, "position": None} for member_id in skipped
+    ]
+    for (member_id, upload_id, reused_id, _), ranked in zip(work, ranking, strict=True):
+        values = {
+            "job_title": owner["job_title"],
+            "job_description": owner["job_description"],
+            "summary": f"Ranked {ranked.rank} of {len(work)}",
+        }
+        analysis_id = reused_id or uuid.uuid4()
+        if reused_id is None:
+            new_analyses.append(
+                {
+                    **owner,
+                    **values,
+                    "id": analysis_id,
+                    "resume_upload_id": upload_id,
+                    "analysis_type": ResumeAnalysisType.COMPARISON,
+                    "status": ResumeAnalysisStatus.RUNNING,
+                }
+            )
+        else:
+            rerun_analyses.append({"id": analysis_id, **values})
+        results.append((analysis_id, ranked.analysis))
+        positions.append(
+            {
+                "id": member_id,
+                "position": ranked.rank,
+                "resume_analysis_id": analysis_id,
+            }
+        )
+
+    if new_analyses:
+        db.execute(insert(ResumeAnalysis), new_analyses)
+    if rerun_analyses:
+        db.execute(update(ResumeAnalysis), rerun_analyses)
+    bulk_record_analysis_results(db, results)
+    if positions:
+        db.execute(update(BatchMember), positions)
+
+
+@celery_app.task(name="tasks.rank_comparison_batch", acks_late=True)
+def rank_comparison_batch(batch_id: str, job_description: str) -> Dict[str, int]:
+    """Rank every member of a batch against ``job_description``.
+
+    Members are scored in one pass by :func:`app.analysis.ranking.rank_resumes`
+    using the text extracted from their uploads. Each member gets a
+    ``COMPARISON`` analysis, reused when the batch is ranked again, and its
+    rank (1 = best match) in ``BatchMember.position``. Members whose upload
+    has no extracted text are skipped and lose their position. The batch
+    moves ``PROCESSING`` -> ``COMPLETED``/``FAILED``; the database work is a
+    constant number of statements whatever the batch size.
+    """
+
+    with SessionLocal() as db:
+        batch = db.get(ComparisonBatch, uuid.UUID(batch_id))
+        if batch is None:
+            logger.warning("Comparison batch {} no longer exists", batch_id)
+            return {"ranked": 0, "skipped": 0}
+
+        # Everything needed later, read before commits expire the objects.
+        owner = {
+            "user_id": batch.user_id,
+            "comparison_batch_id": batch.id,
+            "job_title": batch.job_title,
+            "job_description": job_description,
+        }
+        work, skipped = _member_work(db, batch.id)
+        batch.status = ComparisonBatchStatus.PROCESSING
+        db.commit()
+
+        try:
+            ranking = rank_resumes([item[3] for item in work], job_description)
+            _write_ranking(db, work, ranking, skipped, owner)
+            batch.status = ComparisonBatchStatus.COMPLETED
+            db.commit()
+        except Exception:
+            db.rollback()
+            batch.status = ComparisonBatchStatus.FAILED
+            db.commit()
+            logger.exception("Ranking comparison batch {} failed", batch_id)
+            raise
+
+        if work:
+            index_resume_uploads.delay([str(item[1]) for item in work])
+        return {"ranked": len(work), "skipped": len(skipped)}
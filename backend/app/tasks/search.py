@@ -0,0 +1,82 @@
+"""Celery tasks maintaining the resume search index."""
+
+from __future__ import annotations
+
+import uuid
+from typing import List, Optional
+
+from sqlalchemy import select
+
+from app.analysis.search_index import index_uploads, stale_taxonomy_uploads
+from app.analysis.taxonomy import get_taxonomy
+from app.core.celery_app import celery_app
+from app.db.models import ResumeUpload
+from app.db.session import SessionLocal
+
+# Uploads indexed per transaction when rebuilding.
+REBUILD_CHUNK_UPLOADS = 500
+
+
+@celery_app.task(name="tasks.index_resume_uploads", acks_late=True)
+def index_resume_uploads(upload_ids: List[str]) -> int:
+    """Index uploads whose analyses completed; unchanged uploads are skipped."""
+
+    with SessionLocal() as db:
+        indexed = index_uploads(db, [uuid.UUID(value) for value in upload_ids])
+        db.commit()
+    return indexed
+
+
+@celery_app.task(name="tasks.rebuild_search_index", acks_late=True)
+def rebuild_search_index(user_id: Optional[str] = None) -> int:
+    """Index every upload with extracted text, optionally for one user.
+
+    Used to backfill the index once after it is introduced; uploads already
+    indexed at their current content are skipped.
+    """
+
+    indexed = 0
+    last_id: Optional[uuid.UUID] = None
+    with SessionLocal() as db:
+        while True:
+            statement = (
+                select(ResumeUpload.id)
+                .where(ResumeUpload.content_sha256.is_not(None))
+                .order_by(ResumeUpload.id)
+                .limit(REBUILD_CHUNK_UPLOADS)
+            )
+            if user_id is not None:
+                statement = statement.where(ResumeUpload.user_id == uuid.UUID(user_id))
+            if last_id is not None:
+                statement = statement.where(ResumeUpload.id > last_id)
+            upload_ids = db.scalars(statement).all()
+            if not upload_ids:
+                return indexed
+            indexed += index_uploads(db, upload_ids)
+            db.commit()
+            last_id = upload_ids[-1]
+
+
+@celery_app.task(name="tasks.reindex_search_taxonomy", acks_late=True)
+def reindex_search_taxonomy() -> int:
+    """Re-index uploads indexed under a taxonomy other than this worker's.
+
+    Queued when a worker starts and whenever it reloads a changed taxonomy,
+    so skill pseudo-terms follow taxonomy edits. Documents are locked a chunk
+    at a time and locked ones are skipped, so the copies queued by several
+    workers split the work between them.
+    """
+
+    fingerprint = get_taxonomy().fingerprint
+    indexed = 0
+    last_id: Optional[uuid.UUID] = None
+    with SessionLocal() as db:
+        while True:
+            upload_ids = stale_taxonomy_uploads(
+                db, fingerprint, last_id, REBUILD_CHUNK_UPLOADS
+            )
+            if not upload_ids:
+                return indexed
+            indexed += index_uploads(db, upload_ids)
+            db.commit()
+            last_id = upload_ids[-1]
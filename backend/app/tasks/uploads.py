@@ -0,0 +1,64 @@
+"""Celery tasks turning uploaded resume files into analysable text."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+
+from loguru import logger
+
+from app.analysis.extraction import extract_text
+from app.core.celery_app import celery_app
+from app.db.models import ResumeUpload, ResumeUploadStatus
+from app.db.session import SessionLocal
+from app.storage.files import file_sha256, upload_path
+from app.storage.text_store import text_store
+
+UPLOAD_TERMINAL_STATUSES = frozenset(
+    {ResumeUploadStatus.COMPLETED, ResumeUploadStatus.FAILED}
+)
+
+
+@celery_app.task(name="tasks.extract_resume_text", acks_late=True)
+def extract_resume_text(upload_id: str) -> str:
+    """Extract the text of a stored upload into the content-addressed store.
+
+    The row moves ``PENDING`` -> ``PROCESSING`` -> ``COMPLETED``/``FAILED``;
+    failures are recorded in ``failure_reason`` rather than retried, since a
+    file that cannot be parsed once will not parse on the next attempt. Files
+    whose content hash is already in the text store are not parsed again.
+    """
+
+    with SessionLocal() as db:
+        upload = db.get(ResumeUpload, uuid.UUID(upload_id))
+        if upload is None:
+            logger.warning("Resume upload {} no longer exists", upload_id)
+            return "missing"
+        if upload.upload_status in UPLOAD_TERMINAL_STATUSES:
+            return upload.upload_status.value
+
+        upload.upload_status = ResumeUploadStatus.PROCESSING
+        db.commit()
+
+        try:
+            path = upload_path(upload.stored_filename)
+            if upload.content_sha256 is None:
+                # Uploads stored before content hashing was introduced.
+                upload.content_sha256 = file_sha256(path)
+            if text_store.exists(upload.content_sha256):
+                logger.info("Upload {} reuses stored text", upload_id)
+            else:
+                text, truncated = extract_text(path, upload.content_type or "")
+                if truncated:
+                    logger.info("Upload {} text truncated for analysis", upload_id)
+                text_store.write(upload.content_sha256, text)
+        except Exception as exc:
+            logger.exception("Text extraction for upload {} failed", upload_id)
+            upload.upload_status = ResumeUploadStatus.FAILED
+            upload.failure_reason = str(exc) or exc.__class__.__name__
+        else:
+            upload.upload_status = ResumeUploadStatus.COMPLETED
+            upload.failure_reason = None
+        upload.processed_at = datetime.now(timezone.utc)
+        db.commit()
+        return upload.upload_status.value
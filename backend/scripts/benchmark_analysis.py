@@ -0,0 +1,471 @@
+"""Benchmark resume analysis across input sizes, job descriptions and taxonomies.
+
+Every case is measured twice: calling :func:`analyze_text` directly, and
+posting to ``/api/v1/analyze/resume`` through FastAPI's test client. The
+route timing includes request validation, the executor and JSON
+serialisation. Resumes are
+synthetic and seeded, from 1 KB up to the 100k-character cap, with and
+without a job description; taxonomies range from the bundled 30 skills to
+50k generated ones. Example::
+
+    python scripts/benchmark_analysis.py --output bench/before.json
+    # ... change the code ...
+    python scripts/benchmark_analysis.py --compare bench/before.json
+
+For each case the script reports p50/p99 latency, throughput and the peak of
+Python allocations during one extra call (traced with :mod:`tracemalloc`,
+which would distort the timings). ``--output`` writes the results with the
+commit and machine they came from; ``--compare`` prints the p50 change per
+case against such a file and exits non-zero when any case slowed down by
+more than ``--max-regression``.
+
+``function-edit`` calls :func:`analyze_text` on the same resume with one
+line changed each time. Only the changed chunk misses the chunk cache of
+:mod:`app.analysis.incremental`. The other targets clear that cache before
+every call, so they scan the whole text as for a new resume.
+
+For the bundled taxonomy, three more targets run per resume:
+
+* ``encode-validated``: FastAPI's encoding of the analysis returned by a
+  route with ``response_model``;
+* ``encode-direct``: :class:`~app.api.responses.ModelJSONResponse`, the
+  ``FAST_JSON_RESPONSES`` path;
+* ``batch``: ``/analyze/resumes:batch`` with 10 copies of the resume.
+
+The result cache is disabled and analysis runs inline by default, so the
+numbers are those of the pipeline itself; pass ``--backend process`` to
+include the executor round-trip. Worker processes keep their own chunk
+caches, so with that backend ``route`` measures unchanged resumes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.testclient import TestClient
+from loguru import logger
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+RESUME_SIZES = (1_000, 4_000, 16_000, 100_000)
+TAXONOMY_SIZES = (30, 1_000, 50_000)
+QUICK_RESUME_SIZES = (1_000, 16_000)
+QUICK_TAXONOMY_SIZES = (30, 50_000)
+
+SECTION_HEADINGS = (
+    "Summary",
+    "Experience",
+    "Education",
+    "Projects",
+    "Skills",
+    "Certifications",
+)
+FILLER_WORDS = (
+    "built designed led improved reduced delivered owned scaled migrated "
+    "automated tested reviewed mentored launched platform service customers "
+    "latency revenue pipeline reliability costs team features data internal "
+    "users across multiple regions weekly releases production incidents"
+).split()
+SYLLABLES = "ka lo mi ne ru sa te vo xi za bre cla dro fli gra plo sta tri".split()
+# Share of resume words drawn from the taxonomy.
+SKILL_WORD_RATE = 0.08
+# Shares of generated skills with two words and with an alias.
+MULTIWORD_SKILL_RATE = 0.3
+ALIASED_SKILL_RATE = 0.2
+# Copies of the case's resume posted per batch request.
+BATCH_SIZE = 10
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def synthetic_taxonomy(size: int, base: Dict[str, Any]) -> Dict[str, Any]:
+    """The bundled taxonomy padded with generated skills up to ``size``."""
+
+    skills: List[Any] = list(base["skills"])[:size]
+    rng = random.Random(size)
+    seen = {(entry["name"] if isinstance(entry, dict) else entry) for entry in skills}
+    while len(skills) < size:
+        name = "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+        if rng.random() < MULTIWORD_SKILL_RATE:
+            name += " " + "".join(rng.choices(SYLLABLES, k=2))
+        if name in seen:
+            continue
+        seen.add(name)
+        entry: Dict[str, Any] = {"name": name}
+        if rng.random() < ALIASED_SKILL_RATE:
+            entry["aliases"] = [name.replace(" ", "-") + "js"]
+        skills.append(entry)
+    return {"version": f"bench-{size}", "skills": skills}
+
+
+def skill_names(taxonomy: Dict[str, Any]) -> List[str]:
+    return [
+        entry["name"] if isinstance(entry, dict) else entry
+        for entry in taxonomy["skills"]
+    ]
+
+
+def synthetic_resume(size: int, skills: Sequence[str], seed: int) -> str:
+    """A plausible resume of exactly ``size`` characters."""
+
+    rng = random.Random(seed)
+    lines = ["Jane Doe", "jane.doe@example.com | +1 555 123 4567", ""]
+    length = sum(len(line) + 1 for line in lines)
+    for heading in itertools.cycle(SECTION_HEADINGS):
+        if length >= size:
+            break
+        lines.append(heading)
+        for _ in range(rng.randint(2, 5)):
+            words = [
+                (
+                    rng.choice(skills)
+                    if rng.random() < SKILL_WORD_RATE
+                    else rng.choice(FILLER_WORDS)
+                )
+                for _ in range(rng.randint(8, 18))
+            ]
+            lines.append("- " + " ".join(words).capitalize() + ".")
+        lines.append("")
+        length = sum(len(line) + 1 for line in lines)
+    return "\n".join(lines)[:size]
+
+
+def edited_resumes(text: str) -> Callable[[], str]:
+    """Variants of ``text``, each with a different word added to one line."""
+
+    middle = text.rfind("\n", 0, len(text) // 2) + 1
+    counter = itertools.count()
+    return lambda: f"{text[:middle]}edit{next(counter)} {text[middle:]}"
+
+
+def synthetic_job_description(skills: Sequence[str], seed: int) -> str:
+    rng = random.Random(seed)
+    wanted = ", ".join(rng.sample(list(skills), k=min(12, len(skills))))
+    return (
+        "We are hiring a senior engineer to own our core platform services. "
+        f"You will work with {wanted}. " + " ".join(rng.choices(FILLER_WORDS, k=150))
+    )
+
+
+def run_to_completion(coroutine: Coroutine[Any, Any, Any]) -> Any:
+    """Result of a coroutine that never suspends, without an event loop."""
+
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("coroutine suspended")
+
+
+def measure(
+    call: Callable[[], Any], min_time: float, min_runs: int, max_runs: int
+) -> Dict[str, float]:
+    """Time ``call`` repeatedly, then trace one more call for peak memory."""
+
+    call()  # warm-up: lazy imports, caches, first-request paths
+    samples: List[float] = []
+    started = time.perf_counter()
+    while len(samples) < max_runs and (
+        len(samples) < min_runs or time.perf_counter() - started < min_time
+    ):
+        before = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - before)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = np.asarray(samples)
+    return {
+        "runs": len(samples),
+        "p50_ms": float(np.percentile(timings, 50) * 1000),
+        "p99_ms": float(np.percentile(timings, 99) * 1000),
+        "mean_ms": float(timings.mean() * 1000),
+        "throughput_per_s": len(samples) / elapsed,
+        "peak_alloc_bytes": peak,
+    }
+
+
+def response_targets(
+    client: Any, result: Any, payload: Dict[str, Any]
+) -> List[Tuple[str, Callable[[], Any]]]:
+    """Encoding ``result`` as FastAPI would and directly, and a batch request."""
+
+    # App modules read settings on import; run_benchmarks sets them first.
+    from app.api.responses import ModelJSONResponse  # noqa: PLC0415
+    from app.main import app  # noqa: PLC0415
+
+    resume_route = next(
+        route
+        for route in app.routes
+        if getattr(route, "path", None) == "/api/v1/analyze/resume"
+    )
+
+    def encode_validated() -> bytes:
+        # What FastAPI does with a model returned by a route.
+        content = run_to_completion(
+            serialize_response(
+                field=resume_route.response_field, response_content=result
+            )
+        )
+        return JSONResponse(content).body
+
+    def encode_direct() -> bytes:
+        return ModelJSONResponse(result).body
+
+    def call_batch() -> bytes:
+        response = client.post(
+            "/api/v1/analyze/resumes:batch",
+            json={
+                "resumes": [{"text": payload["text"]}] * BATCH_SIZE,
+                "job_description": payload["job_description"],
+            },
+        )
+        response.raise_for_status()
+        return response.content
+
+    return [
+        ("encode-validated", encode_validated),
+        ("encode-direct", encode_direct),
+        ("batch", call_batch),
+    ]
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    # Settings are read at import time, so configure them before importing.
+    work_dir = Path(tempfile.mkdtemp(prefix="pathwise-bench-"))
+    os.environ["ANALYSIS_BACKEND"] = args.backend
+    os.environ["ANALYSIS_CACHE_ENABLED"] = "false"
+    os.environ["ANALYSIS_WARM_UP"] = "true"
+    os.environ["SKILL_TAXONOMY_INDEX_DIR"] = str(work_dir / "index")
+    os.environ["SKILL_TAXONOMY_RELOAD_SECONDS"] = "0"
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from app.analysis.incremental import chunk_cache  # noqa: PLC0415
+    from app.analysis.pipeline import analyze_text  # noqa: PLC0415
+    from app.analysis.taxonomy import (  # noqa: PLC0415
+        DEFAULT_TAXONOMY_PATH,
+        SkillTaxonomy,
+        load_taxonomy,
+        taxonomy_registry,
+    )
+    from app.core.config import settings  # noqa: PLC0415
+    from app.main import app  # noqa: PLC0415
+
+    logger.remove()
+    base = json.loads(DEFAULT_TAXONOMY_PATH.read_text())
+    resume_sizes = QUICK_RESUME_SIZES if args.quick else RESUME_SIZES
+    taxonomy_sizes = QUICK_TAXONOMY_SIZES if args.quick else TAXONOMY_SIZES
+
+    results: List[Dict[str, Any]] = []
+    taxonomies: List[Dict[str, Any]] = []
+    with TestClient(app) as client:
+        for taxonomy_size in taxonomy_sizes:
+            data = synthetic_taxonomy(taxonomy_size, base)
+            source = work_dir / f"skills-{taxonomy_size}.json"
+            source.write_text(json.dumps(data))
+            started = time.perf_counter()
+            taxonomy = load_taxonomy(source, work_dir / "cold")
+            compile_seconds = time.perf_counter() - started
+            taxonomy_registry.source = source
+            taxonomy_registry.reload(force=True)
+            taxonomies.append(
+                {"skills": taxonomy_size, "compile_seconds": compile_seconds}
+            )
+
+            skills = skill_names(data)
+            job_description = synthetic_job_description(skills, taxonomy_size)
+            for size, with_job in itertools.product(resume_sizes, (False, True)):
+                text = synthetic_resume(size, skills, seed=size)
+                job = job_description if with_job else None
+                payload = {"text": text, "job_description": job}
+
+                def call_function(
+                    text: str = text,
+                    job: Optional[str] = job,
+                    taxonomy: SkillTaxonomy = taxonomy,
+                ) -> Any:
+                    chunk_cache.clear()
+                    return analyze_text(text, job, taxonomy=taxonomy)
+
+                def call_edited(
+                    edited: Callable[[], str] = edited_resumes(text),
+                    job: Optional[str] = job,
+                    taxonomy: SkillTaxonomy = taxonomy,
+                ) -> Any:
+                    return analyze_text(edited(), job, taxonomy=taxonomy)
+
+                def call_route(payload: Dict[str, Any] = payload) -> Any:
+                    chunk_cache.clear()
+                    response = client.post("/api/v1/analyze/resume", json=payload)
+                    response.raise_for_status()
+                    return response
+
+                targets: List[Tuple[str, Callable[[], Any]]] = [
+                    ("function", call_function),
+                    ("function-edit", call_edited),
+                    ("route", call_route),
+                ]
+                # Response encoding and batches do not depend on the taxonomy.
+                if taxonomy_size == taxonomy_sizes[0]:
+                    targets += response_targets(client, call_function(), payload)
+
+                for target, call in targets:
+                    case = {
+                        "target": target,
+                        "resume_chars": size,
+                        "job_description": with_job,
+                        "taxonomy_skills": taxonomy_size,
+                    }
+                    stats = measure(call, args.min_time, args.min_runs, args.max_runs)
+                    results.append({"case": case_id(case), **case, **stats})
+                    print(format_row(results[-1]), flush=True)
+
+    return {
+        "commit": _commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "backend": settings.analysis_backend,
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "taxonomies": taxonomies,
+        "results": results,
+    }
+
+
+def case_id(case: Dict[str, Any]) -> str:
+    job = "jd" if case["job_description"] else "nojd"
+    return (
+        f"{case['target']}/{case['resume_chars']}c/{job}/"
+        f"{case['taxonomy_skills']}skills"
+    )
+
+
+HEADER = (
+    f"{'case':<38} {'runs':>6} {'p50 ms':>9} {'p99 ms':>9} "
+    f"{'ops/s':>9} {'peak KiB':>9}"
+)
+
+
+def format_row(result: Dict[str, Any]) -> str:
+    return (
+        f"{result['case']:<38} {result['runs']:>6} {result['p50_ms']:>9.3f} "
+        f"{result['p99_ms']:>9.3f} {result['throughput_per_s']:>9.1f} "
+        f"{result['peak_alloc_bytes'] / 1024:>9.0f}"
+    )
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], limit: float) -> int:
+    """Print p50 changes against ``baseline``; return the number of regressions."""
+
+    previous = {result["case"]: result for result in baseline["results"]}
+    print(
+        f"\nAgainst {baseline.get('commit') or 'baseline'} "
+        f"({baseline.get('created_at', '?')}):"
+    )
+    regressions = 0
+    for result in current["results"]:
+        before = previous.get(result["case"])
+        if before is None:
+            continue
+        change = result["p50_ms"] / before["p50_ms"] - 1
+        flag = ""
+        if change > limit:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(
+            f"{result['case']:<38} {before['p50_ms']:>9.3f} -> "
+            f"{result['p50_ms']:>9.3f} ms ({change:+.1%}){flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--backend",
+        choices=("inline", "thread", "process"),
+        default="inline",
+        help="ANALYSIS_BACKEND used by the route (default: inline).",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Run a reduced matrix of cases."
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.5,
+        help="Seconds to keep timing each case (default: 0.5).",
+    )
+    parser.add_argument("--min-runs", type=int, default=5)
+    parser.add_argument("--max-runs", type=int, default=2_000)
+    parser.add_argument("--output", type=Path, help="Write results as JSON here.")
+    parser.add_argument(
+        "--compare", type=Path, help="Compare against results written earlier."
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.15,
+        help="Allowed p50 slowdown per case with --compare (default: 0.15).",
+    )
+    args = parser.parse_args()
+
+    print(HEADER)
+    results = run_benchmarks(args)
+    print(
+        "\nTaxonomy compile: "
+        + ", ".join(
+            f"{item['skills']} skills {item['compile_seconds']:.2f}s"
+            for item in results["taxonomies"]
+        )
+    )
+    print(f"Peak RSS: {results['max_rss_bytes'] / 2**20:.0f} MiB")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Wrote {args.output}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print(f"\n{regressions} case(s) slower than allowed.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
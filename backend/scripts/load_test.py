@@ -0,0 +1,736 @@
+"""Drive a realistic traffic mix against the API under uvicorn until it saturates.
+
+The script runs ``app.main:app`` under uvicorn, with a Celery worker by
+default. Postgres and Redis can be ephemeral instances it starts itself, or
+scratch servers named by ``DATABASE_URL`` and ``REDIS_URL``. It migrates and
+seeds the database, then sends a mix of requests at rising concurrency:
+
+* resume analyses;
+* uploads;
+* queued analyses;
+* status polls;
+* listing pages.
+
+Example::
+
+    python scripts/load_test.py --start-postgres --start-redis \\
+        --concurrency 1,2,4,8,16,32,64 --step-seconds 20 --output load.json
+
+For each concurrency step the script reports:
+
+* throughput, and latency percentiles for each route;
+* the API processes' CPU use;
+* samples of ``/api/v1/health/threadpool``, ``/api/v1/health/db-pool`` and
+  ``/api/v1/analyze/executor``.
+
+A step is flagged when callers queued for a threadpool thread, a database
+connection or an analysis worker. The saturation point is the first step
+where more concurrency no longer buys more throughput.
+
+``--start-postgres`` runs ``initdb`` and ``pg_ctl`` from ``PATH`` or
+``--pg-bin``. ``--start-redis`` runs ``redis-server``. Without
+``redis-server`` it falls back to the ``fakeredis`` package's TCP server,
+which is slower than a real Redis. Other settings, such as
+``DB_POOL_SIZE`` or ``ANALYSIS_BACKEND``, are passed through from the
+environment.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import httpx
+import numpy as np
+from benchmark_analysis import (
+    skill_names,
+    synthetic_job_description,
+    synthetic_resume,
+)
+from benchmark_indexes import alembic_config, seed
+from sqlalchemy import create_engine
+
+from alembic import command
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+API_PREFIX = "/api/v1"
+
+DEFAULT_MIX = "analyze=40,upload=10,queue=5,poll=25,list=20"
+# Sizes of the generated resumes, in characters.
+RESUME_SIZES = (2_000, 4_000, 8_000, 16_000)
+# Distinct resumes sent to /analyze/resume; repeats hit the result cache.
+RESUME_POOL = 200
+# More concurrency must buy at least this much throughput to not count as
+# saturated.
+SATURATION_GAIN = 0.1
+# Share of analyze calls sent with a job description, and of polls that
+# target rows created during the run rather than seeded ones.
+JOB_DESCRIPTION_SHARE = 0.5
+POLL_CREATED_SHARE = 0.5
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+FAKEREDIS_SERVER = (
+    "import sys; from fakeredis import TcpFakeServer; "
+    "TcpFakeServer(('127.0.0.1', int(sys.argv[1]))).serve_forever()"
+)
+
+
+def seeded_id(kind: str, index: int) -> str:
+    """The id ``benchmark_indexes`` gives row ``index`` (``md5(kind || i)``)."""
+
+    return str(uuid.UUID(hashlib.md5(f"{kind}{index}".encode()).hexdigest()))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    sys.exit(f"Nothing is listening on port {port} after {timeout:.0f}s.")
+
+
+class Stack:
+    """Processes started for the run; stopped in reverse order on exit."""
+
+    def __init__(self, work_dir: Path) -> None:
+        self.work_dir = work_dir
+        self.processes: List[subprocess.Popen] = []
+        self.cleanups: List[Callable[[], None]] = []
+
+    def spawn(self, name: str, args: Sequence[str], env: Dict[str, str]) -> int:
+        # The child gets its own copy of the descriptor, so ours can close.
+        with open(self.work_dir / f"{name}.log", "wb") as log:
+            process = subprocess.Popen(
+                args, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT
+            )
+        self.processes.append(process)
+        return process.pid
+
+    def start_postgres(self, pg_bin: Optional[str]) -> str:
+        def tool(name: str) -> str:
+            found = shutil.which(name, path=pg_bin) if pg_bin else shutil.which(name)
+            if found is None:
+                sys.exit(f"{name} not found; put it on PATH or pass --pg-bin.")
+            return found
+
+        data_dir = self.work_dir / "pgdata"
+        initdb = subprocess.run(
+            [tool("initdb"), "-D", str(data_dir), "-U", "postgres", "--auth=trust"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if initdb.returncode:
+            # Typically "cannot be run as root".
+            sys.exit(f"initdb failed:\n{initdb.stderr}")
+        # Unix socket only, so the run cannot clash with a local Postgres.
+        options = f"-k {self.work_dir} -c listen_addresses=''"
+        pg_ctl = tool("pg_ctl")
+        subprocess.run(
+            [pg_ctl, "-D", str(data_dir), "-o", options, "-w", "start"],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        self.cleanups.append(
+            lambda: subprocess.run(
+                [pg_ctl, "-D", str(data_dir), "-m", "fast", "stop"],
+                check=False,
+                stdout=subprocess.DEVNULL,
+            )
+        )
+        return f"postgresql+psycopg://postgres@/postgres?host={self.work_dir}"
+
+    def start_redis(self) -> str:
+        port = free_port()
+        server = shutil.which("redis-server")
+        if server is not None:
+            args = [server, "--port", str(port), "--save", "", "--appendonly", "no"]
+        else:
+            # Celery's Redis transport runs Lua scripts.
+            if find_spec("fakeredis") is None or find_spec("lupa") is None:
+                sys.exit("--start-redis needs redis-server on PATH or fakeredis[lua].")
+            args = [sys.executable, "-c", FAKEREDIS_SERVER, str(port)]
+        self.spawn("redis", args, dict(os.environ))
+        wait_for_port(port)
+        return f"redis://127.0.0.1:{port}"
+
+    def stop(self) -> None:
+        for process in reversed(self.processes):
+            process.send_signal(signal.SIGINT)
+        for process in reversed(self.processes):
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        for cleanup in reversed(self.cleanups):
+            cleanup()
+
+
+def process_cpu_seconds(pid: int) -> float:
+    """CPU time used by ``pid`` and its live children (uvicorn workers)."""
+
+    pids = [pid]
+    try:
+        children = Path(f"/proc/{pid}/task/{pid}/children").read_text().split()
+        pids.extend(int(child) for child in children)
+    except OSError:
+        pass
+    total = 0
+    for current in pids:
+        try:
+            fields = Path(f"/proc/{current}/stat").read_text().rsplit(")", 1)[1]
+        except OSError:
+            continue
+        utime, stime = fields.split()[11:13]
+        total += int(utime) + int(stime)
+    return total / CLK_TCK
+
+
+@dataclass
+class Traffic:
+    """Inputs and ids the scenarios draw from; grows as the run creates rows."""
+
+    users: int
+    seeded_rows: int
+    resumes: List[str]
+    job_descriptions: List[str]
+    rng: random.Random = field(default_factory=lambda: random.Random(0))
+    uploads: List[str] = field(default_factory=list)
+    analyses: List[str] = field(default_factory=list)
+
+    def user_index(self) -> int:
+        return self.rng.randint(1, self.users)
+
+    def seeded_upload(self) -> tuple[int, str]:
+        """A seeded upload row and the index of the user owning it."""
+
+        row = self.rng.randint(1, self.seeded_rows)
+        return row % self.users + 1, seeded_id("upload", row)
+
+
+@dataclass
+class StepStats:
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    statuses: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def record(self, route: str, seconds: float, status: str) -> None:
+        self.latencies.setdefault(route, []).append(seconds)
+        counts = self.statuses.setdefault(route, {})
+        counts[status] = counts.get(status, 0) + 1
+
+
+Scenario = Callable[[httpx.AsyncClient, Traffic, StepStats], Awaitable[None]]
+
+
+async def timed(
+    stats: StepStats,
+    route: str,
+    request: Awaitable[httpx.Response],
+) -> Optional[httpx.Response]:
+    started = time.perf_counter()
+    try:
+        response = await request
+    except httpx.HTTPError as exc:
+        stats.record(route, time.perf_counter() - started, type(exc).__name__)
+        return None
+    stats.record(route, time.perf_counter() - started, str(response.status_code))
+    return response
+
+
+async def analyze(client: httpx.AsyncClient, traffic: Traffic, stats: StepStats):
+    payload: Dict[str, Any] = {"text": traffic.rng.choice(traffic.resumes)}
+    if traffic.rng.random() < JOB_DESCRIPTION_SHARE:
+        payload["job_description"] = traffic.rng.choice(traffic.job_descriptions)
+    await timed(
+        stats,
+        "POST /analyze/resume",
+        client.post(f"{API_PREFIX}/analyze/resume", json=payload),
+    )
+
+
+async def upload(client: httpx.AsyncClient, traffic: Traffic, stats: StepStats):
+    response = await timed(
+        stats,
+        "POST /uploads",
+        client.post(
+            f"{API_PREFIX}/uploads",
+            params={
+                "user_id": seeded_id("user", traffic.user_index()),
+                "filename": "resume.txt",
+            },
+            content=traffic.rng.choice(traffic.resumes).encode(),
+            headers={"content-type": "text/plain"},
+        ),
+    )
+    if response is not None and response.status_code == httpx.codes.ACCEPTED:
+        traffic.uploads.append(response.json()["id"])
+
+
+async def queue(client: httpx.AsyncClient, traffic: Traffic, stats: StepStats):
+    user, upload_id = traffic.seeded_upload()
+    response = await timed(
+        stats,
+        "POST /analyses",
+        client.post(
+            f"{API_PREFIX}/analyses",
+            json={
+                "resume_upload_id": upload_id,
+                "user_id": seeded_id("user", user),
+                "job_description": traffic.rng.choice(traffic.job_descriptions),
+                "text": traffic.rng.choice(traffic.resumes),
+            },
+        ),
+    )
+    if response is not None and response.status_code == httpx.codes.ACCEPTED:
+        traffic.analyses.append(response.json()["id"])
+
+
+async def poll(client: httpx.AsyncClient, traffic: Traffic, stats: StepStats):
+    if traffic.rng.random() < POLL_CREATED_SHARE:
+        recent = traffic.analyses[-50:]
+        analysis_id = (
+            traffic.rng.choice(recent)
+            if recent
+            else seeded_id("analysis", traffic.rng.randint(1, traffic.seeded_rows))
+        )
+        await timed(
+            stats,
+            "GET /analyses/{id}",
+            client.get(f"{API_PREFIX}/analyses/{analysis_id}"),
+        )
+    else:
+        recent = traffic.uploads[-50:]
+        upload_id = traffic.rng.choice(recent) if recent else traffic.seeded_upload()[1]
+        await timed(
+            stats,
+            "GET /uploads/{id}",
+            client.get(f"{API_PREFIX}/uploads/{upload_id}"),
+        )
+
+
+async def listing(client: httpx.AsyncClient, traffic: Traffic, stats: StepStats):
+    resource = traffic.rng.choice(("analyses", "uploads", "comparison-batches"))
+    await timed(
+        stats,
+        f"GET /{resource}",
+        client.get(
+            f"{API_PREFIX}/{resource}",
+            params={"user_id": seeded_id("user", traffic.user_index()), "limit": 20},
+        ),
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "analyze": analyze,
+    "upload": upload,
+    "queue": queue,
+    "poll": poll,
+    "list": listing,
+}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(
+                f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}"
+            )
+        mix[name] = float(weight)
+    return mix
+
+
+class Sampler:
+    """Polls the API's own pool and queue statistics during a step."""
+
+    def __init__(self, client: httpx.AsyncClient, interval: float) -> None:
+        self.client = client
+        self.interval = interval
+        self.samples: List[Dict[str, Any]] = []
+
+    async def sample(self) -> Dict[str, Any]:
+        threadpool, db_pool, executor = await asyncio.gather(
+            self.client.get(f"{API_PREFIX}/health/threadpool"),
+            self.client.get(f"{API_PREFIX}/health/db-pool"),
+            self.client.get(f"{API_PREFIX}/analyze/executor"),
+        )
+        return {
+            "threadpool": threadpool.json(),
+            "db_pool": db_pool.json(),
+            "executor": executor.json(),
+        }
+
+    async def run(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                self.samples.append(await self.sample())
+            except httpx.HTTPError:
+                pass
+            try:
+                await asyncio.wait_for(stop.wait(), self.interval)
+            except TimeoutError:
+                pass
+
+
+def pressure(
+    first: Dict[str, Any], last: Dict[str, Any], samples: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Peak occupancy and counter deltas for one step, plus bottleneck flags."""
+
+    threadpool = {
+        "size": last["threadpool"]["size"],
+        "busy_max": max(sample["threadpool"]["busy"] for sample in samples),
+        "waiting_max": max(sample["threadpool"]["waiting"] for sample in samples),
+    }
+    db_pool: Dict[str, Dict[str, Any]] = {}
+    for name, pool in last["db_pool"].items():
+        before = first["db_pool"][name]
+        db_pool[name] = {
+            "capacity": pool["size"] + pool["max_overflow"],
+            "checked_out_max": max(
+                sample["db_pool"][name]["checked_out"] for sample in samples
+            ),
+            "checkouts": pool["checkouts"] - before["checkouts"],
+            "waits": pool["waits"] - before["waits"],
+            "timeouts": pool["timeouts"] - before["timeouts"],
+            "checkout_ms_max": pool["checkout_ms_max"],
+        }
+    executor = last["executor"]
+    executor_stats = {
+        "backend": executor["backend"],
+        "workers": executor["workers"],
+        "pending_max": max(sample["executor"]["pending"] for sample in samples),
+        **{
+            counter: executor[counter] - first["executor"][counter]
+            for counter in ("completed", "rejected", "timeouts", "failures")
+        },
+    }
+
+    flags = []
+    if threadpool["waiting_max"]:
+        flags.append("threadpool")
+    for name, pool in db_pool.items():
+        if pool["waits"] or pool["timeouts"]:
+            flags.append(f"db-pool:{name}")
+    if executor_stats["rejected"] or (
+        executor_stats["backend"] != "inline"
+        and executor_stats["pending_max"] > executor_stats["workers"]
+    ):
+        flags.append("executor")
+    return {
+        "threadpool": threadpool,
+        "db_pool": db_pool,
+        "executor": executor_stats,
+        "flags": flags,
+    }
+
+
+def summarise(stats: StepStats, seconds: float) -> Dict[str, Dict[str, Any]]:
+    routes: Dict[str, Dict[str, Any]] = {}
+    for route in sorted(stats.latencies):
+        latencies = np.array(stats.latencies[route])
+        statuses = stats.statuses[route]
+        errors = sum(
+            count
+            for status, count in statuses.items()
+            if not status.isdigit() or int(status) >= httpx.codes.BAD_REQUEST
+        )
+        routes[route] = {
+            "requests": len(latencies),
+            "errors": errors,
+            "statuses": statuses,
+            "throughput": len(latencies) / seconds,
+            "p50_ms": float(np.percentile(latencies, 50) * 1000),
+            "p90_ms": float(np.percentile(latencies, 90) * 1000),
+            "p99_ms": float(np.percentile(latencies, 99) * 1000),
+            "max_ms": float(latencies.max() * 1000),
+        }
+    return routes
+
+
+@dataclass
+class Driver:
+    """Runs concurrency steps against one API process with a shared client."""
+
+    client: httpx.AsyncClient
+    traffic: Traffic
+    mix: Dict[str, float]
+    sample_interval: float
+    api_pid: int
+
+    async def step(self, concurrency: int, seconds: float) -> Dict[str, Any]:
+        stats = StepStats()
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        sampler = Sampler(self.client, self.sample_interval)
+        first = await sampler.sample()
+        cpu_before = process_cpu_seconds(self.api_pid)
+        started = time.perf_counter()
+        deadline = time.monotonic() + seconds
+
+        async def virtual_user() -> None:
+            while time.monotonic() < deadline:
+                scenario = self.traffic.rng.choices(names, weights)[0]
+                await SCENARIOS[scenario](self.client, self.traffic, stats)
+
+        stop = asyncio.Event()
+        sampling = asyncio.create_task(sampler.run(stop))
+        await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+        stop.set()
+        await sampling
+        elapsed = time.perf_counter() - started
+        cpu = (process_cpu_seconds(self.api_pid) - cpu_before) / elapsed
+        last = await sampler.sample()
+
+        routes = summarise(stats, elapsed)
+        everything = np.concatenate([np.array(v) for v in stats.latencies.values()])
+        return {
+            "concurrency": concurrency,
+            "seconds": elapsed,
+            "requests": len(everything),
+            "errors": sum(route["errors"] for route in routes.values()),
+            "throughput": len(everything) / elapsed,
+            "p50_ms": float(np.percentile(everything, 50) * 1000),
+            "p99_ms": float(np.percentile(everything, 99) * 1000),
+            "api_cpu": cpu,
+            "routes": routes,
+            **pressure(first, last, [first, *sampler.samples, last]),
+        }
+
+
+def saturation(steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The first step where concurrency stopped buying throughput."""
+
+    best = max(steps, key=lambda step: step["throughput"])
+    knee = best
+    for previous, step in itertools.pairwise(steps):
+        if step["throughput"] < previous["throughput"] * (1 + SATURATION_GAIN):
+            knee = previous
+            break
+    first_flagged: Dict[str, int] = {}
+    for step in steps:
+        for flag in step["flags"]:
+            first_flagged.setdefault(flag, step["concurrency"])
+    return {
+        "max_throughput": best["throughput"],
+        "max_throughput_concurrency": best["concurrency"],
+        "knee_concurrency": knee["concurrency"],
+        "first_flagged": first_flagged,
+    }
+
+
+def print_step(step: Dict[str, Any]) -> None:
+    db_waits = sum(pool["waits"] for pool in step["db_pool"].values())
+    print(
+        f"{step['concurrency']:>5} {step['throughput']:>9.1f} "
+        f"{step['errors']:>7} {step['p50_ms']:>9.1f} {step['p99_ms']:>9.1f} "
+        f"{step['api_cpu']:>6.0%} "
+        f"{step['threadpool']['busy_max']:>3}/{step['threadpool']['size']:<3} "
+        f"{step['threadpool']['waiting_max']:>5} {db_waits:>8} "
+        f"{step['executor']['pending_max']:>7}  {','.join(step['flags']) or '-'}"
+    )
+
+
+def print_routes(step: Dict[str, Any]) -> None:
+    print(f"\nPer route at concurrency {step['concurrency']}:")
+    print(
+        f"{'route':<26} {'req/s':>8} {'errors':>7} "
+        f"{'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}"
+    )
+    for route, stats in step["routes"].items():
+        print(
+            f"{route:<26} {stats['throughput']:>8.1f} {stats['errors']:>7} "
+            f"{stats['p50_ms']:>9.1f} {stats['p90_ms']:>9.1f} {stats['p99_ms']:>9.1f}"
+        )
+
+
+async def drive(args: argparse.Namespace, base_url: str, api_pid: int) -> List[Any]:
+    taxonomy = json.loads(
+        (BACKEND_DIR / "app" / "analysis" / "data" / "skills.json").read_text()
+    )
+    skills = skill_names(taxonomy)
+    traffic = Traffic(
+        users=args.users,
+        seeded_rows=args.rows,
+        resumes=[
+            synthetic_resume(RESUME_SIZES[seed % len(RESUME_SIZES)], skills, seed)
+            for seed in range(RESUME_POOL)
+        ],
+        job_descriptions=[
+            synthetic_job_description(skills, seed) for seed in range(20)
+        ],
+    )
+    limits = httpx.Limits(max_connections=max(args.concurrency) + 8)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=args.request_timeout
+    ) as client:
+        driver = Driver(client, traffic, args.mix, args.sample_interval, api_pid)
+        if args.warmup_seconds:
+            print(f"Warming up for {args.warmup_seconds:.0f}s")
+            await driver.step(args.concurrency[0], args.warmup_seconds)
+        print(
+            f"\n{'conc':>5} {'req/s':>9} {'errors':>7} {'p50 ms':>9} {'p99 ms':>9} "
+            f"{'cpu':>6} {'threads':>7} {'queued':>5} {'db waits':>8} "
+            f"{'exec q':>7}  bottleneck"
+        )
+        steps = []
+        for concurrency in args.concurrency:
+            step = await driver.step(concurrency, args.step_seconds)
+            print_step(step)
+            steps.append(step)
+        return steps
+
+
+def start_stack(args: argparse.Namespace, stack: Stack) -> tuple[int, int]:
+    """Start the services, migrate and seed; return the API's port and pid."""
+
+    env = dict(os.environ)
+    if args.start_postgres:
+        env["DATABASE_URL"] = stack.start_postgres(args.pg_bin)
+    if args.start_redis:
+        redis_url = stack.start_redis()
+        env["REDIS_URL"] = f"{redis_url}/0"
+        env["CELERY_BROKER_URL"] = f"{redis_url}/1"
+        env["CELERY_RESULT_BACKEND"] = f"{redis_url}/2"
+    env.setdefault("UPLOAD_STORAGE_DIR", str(stack.work_dir / "uploads"))
+    env.setdefault("EXTRACTED_TEXT_DIR", str(stack.work_dir / "text"))
+    env["PYTHONPATH"] = str(BACKEND_DIR)
+    database_url = env.get("DATABASE_URL")
+    if database_url is None:
+        sys.exit("Set DATABASE_URL to a scratch database or pass --start-postgres.")
+
+    print(f"Migrating and seeding {args.rows:,} rows for {args.users} users")
+    # env.py reads the URL from the application settings.
+    os.environ.update(env)
+    command.upgrade(alembic_config(database_url), "head")
+    seed(create_engine(database_url), args.rows, args.users)
+
+    port = free_port()
+    api_pid = stack.spawn(
+        "api",
+        [
+            *(sys.executable, "-m", "uvicorn", "app.main:app"),
+            *("--port", str(port), "--workers", str(args.api_workers)),
+            *("--no-access-log", "--log-level", "warning"),
+        ],
+        env,
+    )
+    if args.celery_workers:
+        stack.spawn(
+            "worker",
+            [
+                *(sys.executable, "-m", "celery"),
+                *("-A", "app.core.celery_app.celery_app", "worker"),
+                *("--concurrency", str(args.celery_workers), "--loglevel", "warning"),
+            ],
+            env,
+        )
+    wait_for_port(port, timeout=120)
+    return port, api_pid
+
+
+def report(args: argparse.Namespace, steps: List[Dict[str, Any]]) -> None:
+    result = saturation(steps)
+    print_routes(
+        next(s for s in steps if s["concurrency"] == result["knee_concurrency"])
+    )
+    print(
+        f"\nSaturation: {result['max_throughput']:.1f} req/s at concurrency "
+        f"{result['max_throughput_concurrency']}; throughput stopped scaling "
+        f"after concurrency {result['knee_concurrency']}."
+    )
+    for flag, concurrency in result["first_flagged"].items():
+        print(f"  {flag} queued callers from concurrency {concurrency}")
+    if not result["first_flagged"]:
+        print("  No pool or queue was exhausted; look at api cpu and Postgres.")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        settings = {
+            name: getattr(args, name)
+            for name in (
+                "concurrency",
+                "step_seconds",
+                "mix",
+                "api_workers",
+                "celery_workers",
+                "users",
+                "rows",
+            )
+        }
+        args.output.write_text(
+            json.dumps(
+                {"args": settings, "saturation": result, "steps": steps}, indent=2
+            )
+        )
+        print(f"Wrote {args.output}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--start-postgres", action="store_true")
+    parser.add_argument("--pg-bin", help="Directory holding initdb and pg_ctl.")
+    parser.add_argument("--start-redis", action="store_true")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[1, 2, 4, 8, 16, 32, 64],
+        help="Comma-separated concurrent clients per step.",
+    )
+    parser.add_argument("--step-seconds", type=float, default=15.0)
+    parser.add_argument("--warmup-seconds", type=float, default=5.0)
+    parser.add_argument("--sample-interval", type=float, default=0.25)
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--api-workers", type=int, default=1)
+    parser.add_argument(
+        "--celery-workers",
+        type=int,
+        default=1,
+        help="Worker processes for queued tasks; 0 runs no Celery worker.",
+    )
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    stack = Stack(Path(tempfile.mkdtemp(prefix="pathwise-load-")))
+    try:
+        port, api_pid = start_stack(args, stack)
+        if args.api_workers > 1:
+            print("Pool statistics are sampled from whichever API worker answers.")
+        steps = asyncio.run(drive(args, f"http://127.0.0.1:{port}", api_pid))
+    finally:
+        stack.stop()
+    report(args, steps)
+    print(f"Logs are in {stack.work_dir}")
+
+
+if __name__ == "__main__":
+    main()
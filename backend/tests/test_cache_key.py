@@ -0,0 +1,95 @@
+import pytest
+
+from app.analysis import cache
+from app.analysis.cache import cache_key, normalize_job_description, normalize_text
+from app.analysis.pipeline import MAX_RESUME_CHARS, analyze_text
+from app.analysis.taxonomy import compile_taxonomy
+
+TAXONOMY = compile_taxonomy(
+    {"skills": [{"name": "kubernetes", "aliases": ["k8s"]}, "python", "sql"]},
+    fingerprint="test",
+)
+
+RESUME = (
+    "Jane Doe\n"
+    "jane@example.com (555) 123-4567\n"
+    "\n"
+    "Experience\n"
+    "Built Python services on Kubernetes. Tuned SQL.\n"
+    "\n"
+    "Skills\n"
+    "Python, k8s"
+)
+SPACING_VARIANTS = [
+    RESUME.replace("\n", "\r\n"),
+    RESUME.replace("\n", "\r"),
+    "\n\n" + RESUME.replace("\n\n", "\n \n\n\t\n") + "\n\n\n",
+    RESUME.replace(" ", "  \t ").replace("\n", "   \n  "),
+]
+
+
+def test_normalize_text():
+    assert normalize_text("  a \t b \r\n\r\n\r\n\r\n c  \n") == "a b\n\nc"
+    assert normalize_text("a\rb\u2028c") == "a\nb\nc"
+    assert normalize_text(RESUME) == RESUME
+
+
+@pytest.mark.parametrize("variant", SPACING_VARIANTS)
+def test_normalize_text_is_canonical(variant):
+    assert normalize_text(variant) == RESUME
+    assert normalize_text(normalize_text(variant)) == normalize_text(variant)
+
+
+def test_normalize_job_description_keeps_missing_values():
+    assert normalize_job_description(None) is None
+    assert normalize_job_description("") == ""
+    assert normalize_job_description(" python \r\n sql ") == "python\nsql"
+
+
+@pytest.mark.parametrize("variant", SPACING_VARIANTS)
+def test_spacing_variants_share_a_key_and_a_result(variant):
+    job = "Python and\nKubernetes"
+    assert cache_key(variant, " Python  and \r\nKubernetes", "t") == cache_key(
+        RESUME, job, "t"
+    )
+    assert analyze_text(
+        normalize_text(variant), job, taxonomy=TAXONOMY
+    ) == analyze_text(RESUME, job, taxonomy=TAXONOMY)
+
+
+def test_key_depends_on_every_input():
+    key = cache_key(RESUME, "python", "t")
+    assert cache_key(RESUME + " sql", "python", "t") != key
+    assert cache_key(RESUME, "python sql", "t") != key
+    assert cache_key(RESUME, None, "t") != key
+    assert cache_key(RESUME, "python", "other") != key
+    # A job description can not shift into the resume part of the key.
+    assert cache_key("a", "b c", "t") != cache_key("a b", "c", "t")
+
+
+def test_missing_and_empty_job_descriptions_share_a_key():
+    assert cache_key(RESUME, None, "t") == cache_key(RESUME, "", "t")
+
+
+def test_only_the_analysed_prefix_and_truncation_matter():
+    prefix = "word " * (MAX_RESUME_CHARS // 5)
+    exact = prefix[:MAX_RESUME_CHARS]
+    assert cache_key(exact + "tail one", None, "t") == cache_key(
+        exact + "tail two", None, "t"
+    )
+    assert cache_key(exact + "x", None, "t") != cache_key(exact, None, "t")
+
+
+def test_case_matters_only_when_scoring_is_case_sensitive(monkeypatch):
+    monkeypatch.setattr(cache, "CASE_INSENSITIVE", True)
+    assert cache_key(RESUME.upper(), "PYTHON", "t") == cache_key(RESUME, "python", "t")
+    monkeypatch.setattr(cache, "CASE_INSENSITIVE", False)
+    assert cache_key(RESUME.upper(), "PYTHON", "t") != cache_key(RESUME, "python", "t")
+
+
+def test_case_insensitive_keys_match_case_insensitive_scoring():
+    if not cache.CASE_INSENSITIVE:
+        pytest.skip("a model stage is enabled, so scoring reads case")
+    assert analyze_text(RESUME.upper(), "PYTHON", taxonomy=TAXONOMY) == analyze_text(
+        RESUME, "python", taxonomy=TAXONOMY
+    )
@@ -0,0 +1,109 @@
+import random
+
+import pytest
+
+from app.analysis import incremental
+from app.analysis.features import extract_features
+from app.analysis.incremental import (
+    ChunkCache,
+    extract_features_incremental,
+    split_chunks,
+)
+from app.analysis.taxonomy import compile_taxonomy
+
+TAXONOMY = compile_taxonomy(
+    {
+        "skills": [
+            {"name": "machine learning", "aliases": ["ml"]},
+            {"name": "google cloud platform", "aliases": ["gcp"]},
+            "python",
+            "c++",
+            "node.js",
+            "sql",
+        ]
+    },
+    fingerprint="test",
+)
+
+PIECES = [
+    "machine",
+    "learning",
+    "google",
+    "cloud",
+    "platform",
+    "python",
+    "c++",
+    "node.js",
+    "(555)",
+    "123",
+    "4567",
+    "+1",
+    "555-1234",
+    "a.b@c.io",
+    "Hello.",
+    "...",
+    "!?",
+    "(",
+    ")",
+    "-",
+    ".",
+    "Skills",
+    "Experience",
+    "Education",
+    "x",
+]
+SEPARATORS = [" ", "\n", "", "\n\n", "\n \n"]
+
+
+def random_text(rng: random.Random) -> str:
+    return "".join(
+        rng.choice(PIECES) + rng.choice(SEPARATORS) for _ in range(rng.randint(1, 60))
+    )
+
+
+@pytest.fixture(params=[incremental.MAX_PARAGRAPH_CHARS, 40])
+def max_paragraph_chars(request, monkeypatch):
+    # A small limit also exercises cutting paragraphs at line CRCs.
+    monkeypatch.setattr(incremental, "MAX_PARAGRAPH_CHARS", request.param)
+    return request.param
+
+
+def test_chunks_reassemble_the_text(max_paragraph_chars):
+    rng = random.Random(0)
+    for _ in range(500):
+        text = random_text(rng)
+        assert "".join(split_chunks(text)) == text
+
+
+def test_matches_full_scan(max_paragraph_chars):
+    rng = random.Random(1)
+    for _ in range(2000):
+        text = random_text(rng)
+        expected = extract_features(text, TAXONOMY.matcher)
+        assert extract_features_incremental(text, TAXONOMY, ChunkCache(100)) == expected
+
+
+def test_matches_full_scan_after_edits_with_a_warm_cache(max_paragraph_chars):
+    rng = random.Random(2)
+    cache = ChunkCache(1000)
+    text = "\n\n".join(random_text(rng) for _ in range(20))
+    for _ in range(300):
+        position = rng.randrange(len(text) + 1)
+        text = text[:position] + rng.choice(PIECES + SEPARATORS) + text[position:]
+        expected = extract_features(text, TAXONOMY.matcher)
+        assert extract_features_incremental(text, TAXONOMY, cache) == expected
+
+
+def test_multi_word_skill_across_a_paragraph_break():
+    text = "intro\n\nmachine\n\nlearning"
+    assert len(split_chunks(text)) > 1
+    features = extract_features_incremental(text, TAXONOMY, ChunkCache(10))
+    assert features == extract_features(text, TAXONOMY.matcher)
+    assert "machine learning" in features.skills
+
+
+def test_phone_number_across_a_newline_stays_in_one_chunk():
+    text = "call (555)\n\n123 4567 now"
+    assert extract_features_incremental(
+        text, TAXONOMY, ChunkCache(10)
+    ) == extract_features(text, TAXONOMY.matcher)
@@ -0,0 +1,100 @@
+import marshal
+
+import pytest
+
+from app.analysis.matcher import KeywordMatcher, tokenize
+
+
+@pytest.fixture(scope="module")
+def matcher() -> KeywordMatcher:
+    return KeywordMatcher(
+        {
+            "go": "go",
+            "golang": "go",
+            "ml": "machine learning",
+            "machine learning": "machine learning",
+            "learning": "learning",
+            "c": "c",
+            "c++": "c++",
+            "c#": "c#",
+            "node js": "node.js",
+            "google cloud platform": "gcp",
+        }
+    )
+
+
+def test_tokenize_keeps_plus_and_hash_suffixes():
+    assert tokenize("C++, C# and C.") == ["c++", "c#", "and", "c"]
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Good at HTML", set()),
+        ("Go and ML", {"go", "machine learning"}),
+        ("golang, going, ago", {"go"}),
+        ("ml-ops", {"machine learning"}),
+        ("C++ and c#", {"c++", "c#"}),
+        ("Plain C", {"c"}),
+        ("cplusplus", set()),
+    ],
+)
+def test_matches_only_whole_tokens(matcher, text, expected):
+    assert matcher.find_all(text) == expected
+
+
+def test_multi_word_keywords_and_their_suffixes(matcher):
+    assert matcher.find_all("Machine\nLearning") == {"machine learning", "learning"}
+    assert matcher.find_all("machine-learning") == {"machine learning", "learning"}
+    assert matcher.find_all("machine vision, deep learning") == {"learning"}
+    assert matcher.find_all("Node.js on Google Cloud Platform") == {"node.js", "gcp"}
+    assert matcher.find_all("google cloud") == set()
+
+
+def test_partial_multi_word_match_falls_back(matcher):
+    # "google cloud" is a dead end for "google cloud platform"; the automaton
+    # must still find keywords starting inside it.
+    assert matcher.find_all("google cloud go") == {"go"}
+
+
+def test_find_tokens_matches_find_all(matcher):
+    text = "Golang and machine learning on Google Cloud Platform, C++"
+    assert matcher.find_tokens(tokenize(text)) == matcher.find_all(text)
+
+
+def test_iterable_keywords_are_their_own_labels():
+    matcher = KeywordMatcher(["rust", "rest api", ""])
+    assert matcher.labels == ("rust", "rest api")
+    assert matcher.max_tokens == len(tokenize("rest api"))
+    assert matcher.find_all("Rust REST API") == {"rust", "rest api"}
+
+
+def test_round_trip_through_to_dict(matcher):
+    restored = KeywordMatcher.from_dict(matcher.to_dict())
+    text = "Go, ML, C#, html, node js and google cloud platform, machine learning"
+    assert restored.labels == matcher.labels
+    assert restored.max_tokens == matcher.max_tokens
+    assert restored.find_all(text) == matcher.find_all(text)
+
+
+def test_round_trip_through_marshal(matcher):
+    # The taxonomy index stores to_dict() output with marshal.
+    restored = KeywordMatcher.from_dict(marshal.loads(marshal.dumps(matcher.to_dict())))
+    text = "golang c++ machine learning"
+    assert (
+        restored.find_all(text)
+        == matcher.find_all(text)
+        == {
+            "go",
+            "c++",
+            "machine learning",
+            "learning",
+        }
+    )
+
+
+def test_from_dict_rejects_mismatched_tables(matcher):
+    data = dict(matcher.to_dict())
+    data["fail"] = data["fail"][:-1]
+    with pytest.raises(ValueError):
+        KeywordMatcher.from_dict(data)
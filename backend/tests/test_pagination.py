@@ -0,0 +1,101 @@
+import uuid
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import DateTime, Uuid, create_engine, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.db.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    keyset_paginate,
+    split_page,
+)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Row(Base):
+    __tablename__ = "rows"
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+@pytest.mark.parametrize(
+    "created_at",
+    [
+        datetime(2024, 10, 17, 12, 30, 5, 123456, tzinfo=UTC),
+        datetime(2024, 10, 17, 12, 30, tzinfo=UTC),
+        datetime(2024, 10, 17, 14, 30, tzinfo=timezone(timedelta(hours=2))),
+        datetime(2024, 10, 17, 12, 30, 5),
+    ],
+)
+def test_cursor_round_trip(created_at):
+    row_id = uuid.uuid4()
+    cursor = encode_cursor(created_at, row_id)
+    assert "=" not in cursor
+    decoded_at, decoded_id = decode_cursor(cursor)
+    assert decoded_id == row_id
+    assert decoded_at == created_at
+    assert decoded_at.utcoffset() == created_at.utcoffset()
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["", "not a cursor", "!!!!", encode_cursor(datetime.now(UTC), uuid.uuid4())[:-4]],
+)
+def test_foreign_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def pages(session, limit):
+    cursor = None
+    while True:
+        statement = keyset_paginate(select(Row), Row.created_at, Row.id, cursor, limit)
+        rows = session.scalars(statement).all()
+        items, cursor = split_page(rows, limit, lambda row: (row.created_at, row.id))
+        yield items
+        if cursor is None:
+            return
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 50])
+def test_pages_cover_every_row_once_in_order_despite_ties(session, limit):
+    start = datetime(2024, 10, 17, 12, 0)
+    # Five timestamps shared by six rows each, so pages end inside ties.
+    session.add_all(
+        Row(id=uuid.uuid4(), created_at=start + timedelta(seconds=index % 5))
+        for index in range(30)
+    )
+    session.commit()
+    expected = sorted(
+        ((row.created_at, row.id) for row in session.scalars(select(Row))),
+        reverse=True,
+    )
+
+    seen = [item for page in pages(session, limit) for item in page]
+
+    assert seen == expected
+    assert all(0 < len(page) <= limit for page in pages(session, limit))
+
+
+def test_last_page_has_no_cursor(session):
+    session.add_all(
+        Row(id=uuid.uuid4(), created_at=datetime(2024, 10, 17)) for _ in range(4)
+    )
+    session.commit()
+    assert [len(page) for page in pages(session, 2)] == [2, 2]
+    assert [len(page) for page in pages(session, 4)] == [4]